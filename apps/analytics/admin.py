@@ -1,6 +1,16 @@
 from django.contrib import admin
+from .models import CategorySpendingProfile
 
-# Register your models here.
+@admin.register(CategorySpendingProfile)
+class CategorySpendingProfileAdmin(admin.ModelAdmin):
+    """
+    Admin interface for per-category spending statistics
+    """
+    list_display = ['user', 'category', 'count', 'median', 'mad', 'updated_at']
+    search_fields = ['user__username', 'category__name']
+    readonly_fields = ['count', 'median', 'mad', 'warmup_samples', 'updated_at']
+    raw_id_fields = ['user', 'category']
+    list_select_related = ['user', 'category']
 
 
-# apps/analytics/admin.py
\ No newline at end of file
+# apps/analytics/admin.py
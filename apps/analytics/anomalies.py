@@ -0,0 +1,196 @@
+"""
+Outlier detection for new expenses.
+
+Each (user, category, currency) keeps a `CategorySpendingProfile` holding
+a running median and MAD (median absolute deviation); amounts in different
+currencies never share a baseline. A new expense is
+scored with the modified z-score
+
+    0.6745 * (amount - median) / MAD
+
+and flagged above `ANOMALY_THRESHOLD`. Scoring reads only the profile row,
+never the user's history: the first few amounts seed an exact median/MAD,
+after which both move by a bounded step towards each new amount (a
+stochastic median update), so one huge expense can't drag the baseline
+with it.
+
+Scoring runs in an outbox handler; a batch of events loads and saves all
+of its profiles with one query each. Events may arrive out of id order
+and more than once, so every expense folded into a profile is recorded
+as a `ScoredExpense` and skipped when it comes again.
+"""
+import statistics
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.categories.models import Category
+from apps.notifications.delivery import create_notifications
+from apps.notifications.models import Notification, NotificationPreference
+from apps.transactions.models import Transaction
+from .models import CategorySpendingProfile, ScoredExpense
+
+ANOMALY_THRESHOLD = getattr(settings, 'ANOMALY_THRESHOLD', 3.5)
+WARMUP_SAMPLES = getattr(settings, 'ANOMALY_WARMUP_SAMPLES', 8)
+
+# Steps shrink as 1/count until this many samples, then stay constant so
+# the baseline keeps following gradual changes in spending
+ADAPTATION_WINDOW = 50
+
+# Lower bound on the MAD relative to the median, so categories with
+# identical amounts don't flag every small change
+MAD_FLOOR_RATIO = 0.05
+MIN_SCALE = 0.01
+
+def _sign(value):
+    return (value > 0) - (value < 0)
+
+def _scale(profile):
+    return max(profile.mad, profile.median * MAD_FLOOR_RATIO, MIN_SCALE)
+
+def score(profile, amount):
+    """Modified z-score of `amount`, or None while the profile is warming up"""
+    if profile.count < WARMUP_SAMPLES:
+        return None
+    return 0.6745 * (amount - profile.median) / _scale(profile)
+
+def update(profile, amount):
+    """Fold `amount` into the profile's median and MAD in constant time"""
+    profile.count += 1
+    if profile.count <= WARMUP_SAMPLES:
+        profile.warmup_samples = profile.warmup_samples + [amount]
+        if profile.count == WARMUP_SAMPLES:
+            profile.median = statistics.median(profile.warmup_samples)
+            profile.mad = statistics.median(abs(sample - profile.median) for sample in profile.warmup_samples)
+            profile.warmup_samples = []
+        return
+
+    step = _scale(profile) / min(profile.count, ADAPTATION_WINDOW)
+    profile.median += step * _sign(amount - profile.median)
+    profile.mad = max(profile.mad + step * _sign(abs(amount - profile.median) - profile.mad), 0)
+
+def _load_profiles(keys):
+    """Lock (creating if needed) the profiles for (user_id, category_id, currency) keys"""
+    lookup = Q()
+    for user_id, category_id, currency in keys:
+        lookup |= Q(user_id=user_id, category_id=category_id, currency=currency)
+
+    def fetch():
+        return {
+            (profile.user_id, profile.category_id, profile.currency): profile
+            for profile in CategorySpendingProfile.objects.select_for_update().filter(lookup)
+        }
+
+    profiles = fetch()
+    missing = set(keys) - set(profiles)
+    if missing:
+        # Categories deleted before the event was relayed get no profile
+        existing = set(Category.objects.filter(id__in={key[1] for key in missing}).values_list('id', flat=True))
+        CategorySpendingProfile.objects.bulk_create(
+            [
+                CategorySpendingProfile(user_id=user_id, category_id=category_id, currency=currency)
+                for user_id, category_id, currency in missing if category_id in existing
+            ],
+            ignore_conflicts=True,
+        )
+        profiles = fetch()
+    return profiles
+
+def _anomaly_notification(event, typical_amount, value):
+    return Notification(
+        user_id=event['user_id'],
+        title="Unusual Expense Detected",
+        message=(
+            f"Your {event['category']} expense of {event['amount']} {event['currency']} ('{event['title']}') "
+            f"is much higher than usual. You typically spend around {typical_amount:.2f} {event['currency']} "
+            f"in this category."
+        ),
+        type='transaction',
+        priority='high',
+        dedupe_key=f"anomaly:{event['transaction_id']}",
+        metadata={
+            'anomaly': True,
+            'transaction_id': event['transaction_id'],
+            'amount': event['amount'],
+            'currency': event['currency'],
+            'category': event['category'],
+            'typical_amount': round(typical_amount, 2),
+            'score': round(value, 2),
+        }
+    )
+
+def score_expenses(events):
+    """
+    Score new expenses against their category profiles, update the
+    profiles and notify users of outliers. Returns the notifications
+    created.
+    """
+    events = sorted(
+        (event for event in events if event.get('type') == 'expense' and event.get('category_id')),
+        key=lambda event: event['transaction_id'],
+    )
+    if not events:
+        return []
+
+    # Events published before payloads carried the currency
+    without_currency = [event for event in events if 'currency' not in event]
+    if without_currency:
+        currencies = dict(
+            Transaction.objects.filter(id__in=[event['transaction_id'] for event in without_currency])
+            .values_list('id', 'currency')
+        )
+        events = [
+            {**event, 'currency': currencies[event['transaction_id']]} if 'currency' not in event else event
+            for event in events
+            # Transactions deleted since can't be placed in a profile
+            if 'currency' in event or event['transaction_id'] in currencies
+        ]
+
+    flagged = []
+    with transaction.atomic():
+        profiles = _load_profiles({
+            (event['user_id'], event['category_id'], event['currency']) for event in events
+        })
+        # Checked under the profile locks, so concurrent redeliveries can't both pass
+        seen = set(
+            ScoredExpense.objects.filter(transaction_id__in=[event['transaction_id'] for event in events])
+            .values_list('transaction_id', flat=True)
+        )
+        touched = {}
+        scored = []
+        for event in events:
+            profile = profiles.get((event['user_id'], event['category_id'], event['currency']))
+            if profile is None or event['transaction_id'] in seen:
+                continue
+            seen.add(event['transaction_id'])
+            scored.append(ScoredExpense(profile=profile, transaction_id=event['transaction_id']))
+            amount = float(event['amount'])
+            value = score(profile, amount)
+            if value is not None and value > ANOMALY_THRESHOLD:
+                flagged.append((event, profile.median, value))
+            update(profile, amount)
+            profile.updated_at = timezone.now()
+            touched[profile.pk] = profile
+
+        CategorySpendingProfile.objects.bulk_update(
+            touched.values(),
+            ['count', 'median', 'mad', 'warmup_samples', 'updated_at'],
+        )
+        ScoredExpense.objects.bulk_create(scored)
+
+        if not flagged:
+            return []
+        prefs_by_user = {
+            prefs.user_id: prefs
+            for prefs in NotificationPreference.objects.filter(user_id__in={event['user_id'] for event, _, _ in flagged})
+        }
+        notifications = [
+            _anomaly_notification(event, typical_amount, value)
+            for event, typical_amount, value in flagged
+            if prefs_by_user.get(event['user_id']) is None or prefs_by_user[event['user_id']].in_app_transaction
+        ]
+        return create_notifications(notifications, prefs_by_user)
+
+# apps/analytics/anomalies.py
@@ -5,5 +5,14 @@ class AnalyticsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.analytics'
     verbose_name = 'Analytics'
+    
+    def ready(self):
+        """
+        Subscribe to transaction events from the outbox
+        """
+        from apps.outbox.events import register_handler
+        from . import tasks
+        
+        register_handler('transaction.created', tasks.detect_expense_anomalies)
 
-# apps/analytics/apps.py
\ No newline at end of file
+# apps/analytics/apps.py
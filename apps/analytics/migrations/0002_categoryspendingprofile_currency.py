@@ -0,0 +1,42 @@
+# Generated by Django 5.0.1 on 2026-10-19 09:17
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+from django.db.models.functions import Upper
+
+
+def copy_profile_currency(apps, schema_editor):
+    """Existing profiles were built from amounts in their owner's profile currency"""
+    UserProfile = apps.get_model('authentication', 'UserProfile')
+    CategorySpendingProfile = apps.get_model('analytics', 'CategorySpendingProfile')
+    CategorySpendingProfile.objects.filter(user__profile__isnull=False).update(currency=Upper(Subquery(
+        UserProfile.objects.filter(user_id=OuterRef('user_id')).values('currency')[:1]
+    )))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0001_initial'),
+        ('authentication', '0002_alter_userprofile_currency'),
+        ('categories', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='categoryspendingprofile',
+            unique_together=set(),
+        ),
+        migrations.AddField(
+            model_name='categoryspendingprofile',
+            name='currency',
+            field=models.CharField(default='USD', help_text='Currency the amounts are in', max_length=3),
+        ),
+        migrations.RunPython(copy_profile_currency, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name='categoryspendingprofile',
+            unique_together={('user', 'category', 'currency')},
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 5.0.1 on 2026-10-19 09:34
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+BATCH_SIZE = 5000
+
+
+def mark_scored_expenses(apps, schema_editor):
+    """Record the expenses each profile already counted, up to its old last_transaction_id"""
+    CategorySpendingProfile = apps.get_model('analytics', 'CategorySpendingProfile')
+    ScoredExpense = apps.get_model('analytics', 'ScoredExpense')
+    Transaction = apps.get_model('transactions', 'Transaction')
+
+    for profile in CategorySpendingProfile.objects.filter(last_transaction_id__gt=0).iterator():
+        transaction_ids = (
+            Transaction.objects.filter(
+                user_id=profile.user_id, category_id=profile.category_id, currency=profile.currency,
+                type='expense', id__lte=profile.last_transaction_id,
+            )
+            .order_by()
+            .values_list('id', flat=True)
+        )
+        batch = []
+        for transaction_id in transaction_ids.iterator():
+            batch.append(ScoredExpense(profile_id=profile.pk, transaction_id=transaction_id))
+            if len(batch) >= BATCH_SIZE:
+                ScoredExpense.objects.bulk_create(batch, ignore_conflicts=True)
+                batch = []
+        ScoredExpense.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0002_categoryspendingprofile_currency'),
+        ('transactions', '0004_ledgersummary_currency_recurringtransaction_currency_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScoredExpense',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('transaction_id', models.BigIntegerField(unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('profile', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='scored_expenses', to='analytics.categoryspendingprofile')),
+            ],
+            options={
+                'verbose_name': 'Scored Expense',
+                'verbose_name_plural': 'Scored Expenses',
+            },
+        ),
+        migrations.RunPython(mark_scored_expenses, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='categoryspendingprofile',
+            name='last_transaction_id',
+        ),
+    ]
@@ -1,5 +1,46 @@
 from django.db import models
+from django.contrib.auth.models import User
+from apps.categories.models import Category
 
-# Create your models here.
+class CategorySpendingProfile(models.Model):
+    """
+    Running robust statistics of a user's expenses in one category and
+    currency.
 
-# apps/analytics/models.py
\ No newline at end of file
+    The first few amounts are kept verbatim to seed an exact median and
+    MAD; after that both are updated incrementally per transaction.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='spending_profiles')
+    category = models.ForeignKey(Category, on_delete=models.CASCADE, related_name='spending_profiles')
+    currency = models.CharField(max_length=3, default='USD', help_text='Currency the amounts are in')
+    count = models.IntegerField(default=0)
+    median = models.FloatField(default=0)
+    mad = models.FloatField(default=0)
+    warmup_samples = models.JSONField(default=list, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        unique_together = ['user', 'category', 'currency']
+        verbose_name = 'Category Spending Profile'
+        verbose_name_plural = 'Category Spending Profiles'
+    
+    def __str__(self):
+        return f"{self.user.username} - {self.category.name} (median {self.median:.2f} {self.currency})"
+
+class ScoredExpense(models.Model):
+    """
+    Marks an expense as folded into a spending profile, so a redelivered
+    event is never counted twice, whatever order events arrive in
+    """
+    profile = models.ForeignKey(CategorySpendingProfile, on_delete=models.CASCADE, related_name='scored_expenses')
+    transaction_id = models.BigIntegerField(unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        verbose_name = 'Scored Expense'
+        verbose_name_plural = 'Scored Expenses'
+    
+    def __str__(self):
+        return f"Transaction {self.transaction_id} in profile {self.profile_id}"
+
+# apps/analytics/models.py
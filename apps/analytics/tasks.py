@@ -0,0 +1,12 @@
+from celery import shared_task
+
+from .anomalies import score_expenses
+
+@shared_task
+def detect_expense_anomalies(events):
+    """
+    Score new expenses against the user's spending in each category
+    """
+    return len(score_expenses(events))
+
+# apps/analytics/tasks.py
@@ -1,5 +1,212 @@
+import datetime
+import math
+from decimal import Decimal
+
+import numpy as np
+from django.contrib.auth.models import User
 from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.categories.models import Category
+from apps.notifications.models import Notification
+from apps.transactions.models import Transaction
+from .anomalies import WARMUP_SAMPLES, score_expenses
+from .models import CategorySpendingProfile, ScoredExpense
+from .timeseries import MAX_BUCKETS, resolve_period, running_balance
+from .trends import category_trends, compute_trends, linear_trend, month_over_month, moving_average
+
+def nan_to_none(values):
+    return [None if math.isnan(value) else round(value, 6) for value in values]
+
+class TransactionDataMixin:
+    """
+    A user with an income category and two expense categories
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user('alice', 'alice@example.com', 'password')
+        self.salary = Category.objects.create(name='Test salary', type='income', user=self.user)
+        self.food = Category.objects.create(name='Test food', type='expense', user=self.user)
+        self.rent = Category.objects.create(name='Test rent', type='expense', user=self.user)
+
+    def add(self, amount, date, type='expense', category=None):
+        category = category or (self.salary if type == 'income' else self.food)
+        return Transaction.objects.create(
+            user=self.user, category=category, title='Test', amount=Decimal(amount), type=type, date=date,
+        )
+
+class RunningBalanceTests(TransactionDataMixin, TestCase):
+    """
+    Bucketed running balance
+    """
+
+    def test_opening_balance_and_gap_filling(self):
+        self.add('1000.00', datetime.date(2024, 1, 15), type='income')
+        self.add('200.00', datetime.date(2024, 3, 10))
+        self.add('500.00', datetime.date(2024, 3, 20), type='income')
+        self.add('100.00', datetime.date(2024, 5, 5))
+
+        result = running_balance(self.user, 'month', datetime.date(2024, 3, 1), datetime.date(2024, 5, 31))
+
+        self.assertEqual(result['opening_balance'], Decimal('1000.00'))
+        self.assertEqual(
+            [(point['period'], point['income'], point['expenses'], point['net'], point['balance']) for point in result['series']],
+            [
+                (datetime.date(2024, 3, 1), Decimal('500'), Decimal('200'), Decimal('300'), Decimal('1300')),
+                # No transactions in April: the balance carries forward
+                (datetime.date(2024, 4, 1), Decimal('0'), Decimal('0'), Decimal('0'), Decimal('1300')),
+                (datetime.date(2024, 5, 1), Decimal('0'), Decimal('100'), Decimal('-100'), Decimal('1200')),
+            ],
+        )
+
+    def test_weekly_buckets_start_on_monday(self):
+        self.add('50.00', datetime.date(2024, 3, 6))  # Wednesday
+        self.add('25.00', datetime.date(2024, 3, 10))  # Sunday, same week
+
+        result = running_balance(self.user, 'week', datetime.date(2024, 3, 6), datetime.date(2024, 3, 12))
+
+        self.assertEqual([point['period'] for point in result['series']], [datetime.date(2024, 3, 4), datetime.date(2024, 3, 11)])
+        self.assertEqual(result['series'][0]['expenses'], Decimal('75'))
+        self.assertEqual(result['series'][1]['balance'], Decimal('-75'))
+
+    def test_period_validation(self):
+        end = datetime.date(2024, 6, 15)
+        self.assertEqual(len(resolve_period('month', end=end)), 12)
+        self.assertEqual(resolve_period('month', end=end)[0], datetime.date(2023, 7, 1))
+        self.assertEqual(len(resolve_period('day', end - datetime.timedelta(days=MAX_BUCKETS - 1), end)), MAX_BUCKETS)
+
+        with self.assertRaisesMessage(ValueError, 'the maximum is'):
+            resolve_period('day', end - datetime.timedelta(days=MAX_BUCKETS), end)
+        with self.assertRaisesMessage(ValueError, 'start_date must be before end_date'):
+            resolve_period('day', end, end - datetime.timedelta(days=1))
+        with self.assertRaisesMessage(ValueError, "Invalid interval 'year'"):
+            resolve_period('year', end=end)
+
+    def test_endpoint(self):
+        self.add('1000.00', datetime.date(2024, 1, 15), type='income')
+        self.add('200.00', datetime.date(2024, 2, 10))
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        response = client.get('/api/analytics/balance/', {
+            'interval': 'month', 'start_date': '2024-01-01', 'end_date': '2024-02-29',
+        })
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['closing_balance'], 800.0)
+        self.assertEqual([point['balance'] for point in response.data['series']], [1000.0, 800.0])
+        self.assertEqual(
+            client.get('/api/analytics/balance/', {'interval': 'day', 'start_date': '2020-01-01', 'end_date': '2024-01-01'}).status_code,
+            400,
+        )
+
+class TrendTests(TransactionDataMixin, TestCase):
+    """
+    Moving averages, month-over-month changes and linear fits
+    """
+
+    def test_moving_average(self):
+        result = moving_average(np.array([[1.0, 2.0, 3.0, 4.0]]), 2)
+        self.assertEqual(nan_to_none(result[0]), [None, 1.5, 2.5, 3.5])
+        # A window longer than the series yields no averages
+        self.assertEqual(nan_to_none(moving_average(np.array([[1.0, 2.0]]), 3)[0]), [None, None])
+
+    def test_month_over_month(self):
+        delta, pct = month_over_month(np.array([[100.0, 150.0, 0.0, 50.0]]))
+        self.assertEqual(nan_to_none(delta[0]), [None, 50.0, -150.0, 50.0])
+        # No percentage change from an empty month
+        self.assertEqual(nan_to_none(pct[0]), [None, 50.0, -100.0, None])
+
+    def test_linear_trend(self):
+        slope, intercept = linear_trend(np.array([[1.0, 3.0, 5.0, 7.0], [4.0, 4.0, 4.0, 4.0]]))
+        self.assertEqual(nan_to_none(slope), [2.0, 0.0])
+        self.assertEqual(nan_to_none(intercept), [1.0, 4.0])
+
+    def test_forecast_is_clamped_at_zero(self):
+        forecast = compute_trends(np.array([[1.0, 3.0, 5.0, 7.0], [20.0, 10.0, 5.0, 0.0]]))['forecast']
+        self.assertEqual(nan_to_none(forecast), [9.0, 0.0])
+
+    def test_category_trends(self):
+        self.add('100.00', datetime.date(2024, 1, 10))
+        self.add('150.00', datetime.date(2024, 2, 10))
+        self.add('200.00', datetime.date(2024, 3, 10))
+        self.add('800.00', datetime.date(2024, 2, 1), category=self.rent)
+        self.add('800.00', datetime.date(2024, 3, 1), category=self.rent)
+        self.add('3000.00', datetime.date(2024, 3, 1), type='income')
+
+        trends = category_trends(self.user, 'expense', months=3, window=2, end=datetime.date(2024, 3, 31))
+
+        self.assertEqual(trends['months'], [datetime.date(2024, 1, 1), datetime.date(2024, 2, 1), datetime.date(2024, 3, 1)])
+        by_name = {category['category']: category for category in trends['categories']}
+        self.assertEqual(set(by_name), {'Test food', 'Test rent'})
+        food = by_name['Test food']
+        self.assertEqual(food['totals'], [100.0, 150.0, 200.0])
+        self.assertEqual(food['moving_average'], [None, 125.0, 175.0])
+        self.assertEqual(food['change'], [None, 50.0, 50.0])
+        self.assertEqual(food['change_percentage'], [None, 50.0, 33.33])
+        self.assertEqual((food['slope'], food['forecast']), (50.0, 250.0))
+        self.assertEqual(by_name['Test rent']['change_percentage'], [None, None, 0.0])
+        self.assertEqual(trends['total']['totals'], [100.0, 950.0, 1000.0])
+
+class AnomalyScoringTests(TestCase):
+    """
+    Spending profiles fed by transaction.created events
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user('alice', 'alice@example.com', 'password')
+        self.category = Category.objects.create(name='Test groceries', type='expense', user=self.user)
+
+    def event(self, transaction_id, amount='10.00', currency='USD'):
+        return {
+            'transaction_id': transaction_id,
+            'user_id': self.user.pk,
+            'title': f'Expense {transaction_id}',
+            'type': 'expense',
+            'amount': amount,
+            'currency': currency,
+            'category_id': self.category.pk,
+            'category': self.category.name,
+        }
+
+    def profile(self, currency='USD'):
+        return CategorySpendingProfile.objects.get(user=self.user, category=self.category, currency=currency)
+
+    def test_out_of_order_events_are_all_counted(self):
+        score_expenses([self.event(transaction_id) for transaction_id in (14, 15, 16, 17)])
+        # Lower ids committed later, e.g. by a slower request or a retried relay
+        score_expenses([self.event(transaction_id) for transaction_id in (13, 12, 11, 10)])
+
+        self.assertEqual(self.profile().count, 8)
+        self.assertEqual(ScoredExpense.objects.count(), 8)
+
+    def test_redelivered_events_are_skipped(self):
+        score_expenses([self.event(1), self.event(2), self.event(3)])
+
+        score_expenses([self.event(2), self.event(4), self.event(4)])
+
+        self.assertEqual(self.profile().count, 4)
+        self.assertEqual(
+            sorted(ScoredExpense.objects.values_list('transaction_id', flat=True)), [1, 2, 3, 4]
+        )
+
+    def test_outlier_is_flagged_once(self):
+        amounts = ['9.00', '10.00', '11.00', '10.50', '9.50', '10.00', '12.00', '8.00']
+        self.assertEqual(len(amounts), WARMUP_SAMPLES)
+        score_expenses([self.event(index + 1, amount) for index, amount in enumerate(amounts)])
+
+        notifications = score_expenses([self.event(100, '250.00'), self.event(50, '10.00')])
+        score_expenses([self.event(100, '250.00')])
+
+        self.assertEqual(len(notifications), 1)
+        notification = Notification.objects.get(dedupe_key='anomaly:100')
+        self.assertEqual(notification.metadata['transaction_id'], 100)
+        self.assertEqual(self.profile().count, WARMUP_SAMPLES + 2)
+
+    def test_currencies_keep_separate_profiles(self):
+        score_expenses([self.event(1, '10.00'), self.event(2, '1500.00', currency='JPY')])
 
-# Create your tests here.
+        self.assertEqual(self.profile('USD').count, 1)
+        self.assertEqual(self.profile('JPY').count, 1)
 
-# apps/analytics/tests.py
\ No newline at end of file
+# apps/analytics/tests.py
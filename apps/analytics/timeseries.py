@@ -0,0 +1,209 @@
+"""
+Bucketed time series over a user's transactions.
+
+Transactions are grouped into day/week/month buckets in SQL, and the
+running balance is a window function evaluated over those grouped rows,
+so the database returns at most one row per bucket no matter how many
+transactions fall inside it. Buckets without transactions are filled in
+here, carrying the balance forward.
+"""
+import datetime
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import models
+from django.db.models import Case, F, Func, Q, Sum, Value, When, Window
+from django.db.models.functions import Coalesce, TruncDay, TruncMonth, TruncWeek
+
+from apps.currencies.conversion import converted_sums, user_currency
+from apps.transactions.ledger import get_summaries
+from apps.transactions.models import Transaction
+
+INTERVALS = {
+    'day': TruncDay,
+    'week': TruncWeek,
+    'month': TruncMonth,
+}
+
+# Number of buckets returned when no start date is given
+DEFAULT_BUCKETS = {'day': 30, 'week': 12, 'month': 12}
+
+MAX_BUCKETS = getattr(settings, 'ANALYTICS_MAX_BUCKETS', 366)
+
+AMOUNT_FIELD = models.DecimalField(max_digits=16, decimal_places=2)
+
+class WindowSum(Func):
+    """
+    SUM() usable as a window over an already aggregated expression
+    """
+    function = 'SUM'
+    window_compatible = True
+
+class RunningTotal(Window):
+    """
+    SUM(<aggregate>) OVER (ORDER BY ...) over grouped rows.
+
+    Django adds non-aggregate window expressions to GROUP BY; this one is
+    evaluated after grouping, so it must not contribute grouping columns.
+    """
+    def __init__(self, aggregate, order_by):
+        super().__init__(WindowSum(aggregate, output_field=AMOUNT_FIELD), order_by=order_by)
+
+    def get_group_by_cols(self):
+        return []
+
+def signed_amount():
+    """Transaction amount with expenses negated"""
+    return Case(
+        When(type='expense', then=-F('amount')),
+        default=F('amount'),
+        output_field=AMOUNT_FIELD,
+    )
+
+def bucket_start(date, interval):
+    """First day of the bucket containing `date`"""
+    if interval == 'week':
+        return date - datetime.timedelta(days=date.weekday())
+    if interval == 'month':
+        return date.replace(day=1)
+    return date
+
+def next_bucket(date, interval):
+    """First day of the bucket after the one starting on `date`"""
+    if interval == 'week':
+        return date + datetime.timedelta(weeks=1)
+    if interval == 'month':
+        return (date.replace(day=28) + datetime.timedelta(days=4)).replace(day=1)
+    return date + datetime.timedelta(days=1)
+
+def previous_buckets(date, interval, count):
+    """First day of the bucket `count` buckets before the one starting on `date`"""
+    if interval == 'month':
+        months = date.year * 12 + date.month - 1 - count
+        return datetime.date(months // 12, months % 12 + 1, 1)
+    if interval == 'week':
+        return date - datetime.timedelta(weeks=count)
+    return date - datetime.timedelta(days=count)
+
+def bucket_range(start, end, interval):
+    """Bucket start dates covering `start` to `end` inclusive"""
+    buckets = []
+    current = bucket_start(start, interval)
+    while current <= end:
+        buckets.append(current)
+        current = next_bucket(current, interval)
+    return buckets
+
+def resolve_period(interval, start=None, end=None, max_buckets=MAX_BUCKETS):
+    """
+    Validate a requested period and return its bucket start dates.
+    Raises ValueError for unknown intervals, inverted ranges or ranges
+    spanning more than `max_buckets` buckets.
+    """
+    if interval not in INTERVALS:
+        raise ValueError(f"Invalid interval '{interval}'. Choose from: {', '.join(INTERVALS)}")
+    end = end or datetime.date.today()
+    if start is None:
+        start = previous_buckets(bucket_start(end, interval), interval, DEFAULT_BUCKETS[interval] - 1)
+    if start > end:
+        raise ValueError('start_date must be before end_date')
+
+    # Count buckets arithmetically before building the list
+    first = bucket_start(start, interval)
+    if interval == 'month':
+        count = (end.year - first.year) * 12 + end.month - first.month + 1
+    else:
+        count = (end - first).days // (7 if interval == 'week' else 1) + 1
+    if count > max_buckets:
+        raise ValueError(f'Requested period spans {count} {interval}s; the maximum is {max_buckets}')
+    return bucket_range(start, end, interval)
+
+def _windowed_buckets(transactions, interval, first, end):
+    """
+    Opening balance and per-bucket rows with a running sum computed by the
+    database, for transactions all in one currency
+    """
+    opening = transactions.filter(date__lt=first).aggregate(
+        balance=Coalesce(Sum(signed_amount()), Value(Decimal('0')), output_field=AMOUNT_FIELD)
+    )['balance']
+
+    trunc = INTERVALS[interval]('date', output_field=models.DateField())
+    rows = (
+        transactions.filter(date__gte=first, date__lte=end)
+        .annotate(bucket=trunc)
+        .values('bucket')
+        .annotate(
+            income=Coalesce(Sum('amount', filter=Q(type='income')), Value(Decimal('0')), output_field=AMOUNT_FIELD),
+            expenses=Coalesce(Sum('amount', filter=Q(type='expense')), Value(Decimal('0')), output_field=AMOUNT_FIELD),
+            running=RunningTotal(Sum(signed_amount()), order_by=F('bucket').asc()),
+        )
+        .order_by('bucket')
+    )
+    return opening, {row['bucket']: row for row in rows}, set()
+
+def _converted_buckets(transactions, interval, first, end, target):
+    """
+    Same as `_windowed_buckets` for transactions in several currencies:
+    bucket totals are converted into `target` and accumulated here
+    """
+    before, missing = converted_sums(transactions.filter(date__lt=first), target, ['type'])
+    opening = before.get(('income',), Decimal('0')) - before.get(('expense',), Decimal('0'))
+
+    trunc = INTERVALS[interval]('date', output_field=models.DateField())
+    totals, period_missing = converted_sums(
+        transactions.filter(date__gte=first, date__lte=end).annotate(bucket=trunc), target, ['bucket', 'type']
+    )
+    by_bucket = {}
+    for bucket in sorted({bucket for bucket, _ in totals}):
+        by_bucket[bucket] = {
+            'income': totals.get((bucket, 'income'), Decimal('0')),
+            'expenses': totals.get((bucket, 'expense'), Decimal('0')),
+        }
+    running = Decimal('0')
+    for row in by_bucket.values():
+        running += row['income'] - row['expenses']
+        row['running'] = running
+    return opening, by_bucket, missing | period_missing
+
+def running_balance(user, interval='day', start=None, end=None):
+    """
+    Income, expenses and closing balance for each bucket in the period, in
+    the user's currency. Single-currency users take two queries: the
+    opening balance before the first bucket and the grouped buckets with a
+    windowed running sum.
+    """
+    buckets = resolve_period(interval, start, end)
+    first, end = buckets[0], end or datetime.date.today()
+    transactions = Transaction.objects.filter(user=user).order_by()
+    currency = user_currency(user)
+
+    if any(summary.currency != currency for summary in get_summaries(user)):
+        opening, by_bucket, missing = _converted_buckets(transactions, interval, first, end, currency)
+    else:
+        opening, by_bucket, missing = _windowed_buckets(transactions, interval, first, end)
+
+    series = []
+    balance = opening
+    for bucket in buckets:
+        row = by_bucket.get(bucket)
+        income = expenses = Decimal('0')
+        if row:
+            income, expenses = row['income'], row['expenses']
+            balance = opening + row['running']
+        series.append({
+            'period': bucket,
+            'income': income,
+            'expenses': expenses,
+            'net': income - expenses,
+            'balance': balance,
+        })
+    return {
+        'opening_balance': opening,
+        'series': series,
+        'start_date': first,
+        'end_date': end,
+        'currency': currency,
+        'unconverted_currencies': sorted(missing),
+    }
+
+# apps/analytics/timeseries.py
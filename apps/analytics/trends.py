@@ -0,0 +1,135 @@
+"""
+Per-category monthly trends and forecasts.
+
+A single grouped query returns one row per (category, month); the rows are
+scattered into a categories x months NumPy matrix and every statistic is
+computed on whole matrices at once, so the cost grows with the number of
+buckets, not with the number of transactions or a Python loop per
+category.
+"""
+import datetime
+
+import numpy as np
+from django.db import models
+from django.db.models.functions import TruncMonth
+
+from apps.currencies.conversion import converted_sums, user_currency
+from apps.transactions.models import Transaction
+from .timeseries import bucket_range, previous_buckets
+
+DEFAULT_MONTHS = 12
+MAX_MONTHS = 60
+DEFAULT_WINDOW = 3
+
+def monthly_category_matrix(user, transaction_type='expense', months=DEFAULT_MONTHS, end=None):
+    """
+    Load monthly totals per category, in the user's currency, as a matrix.
+    Returns (categories, month_starts, matrix, unconverted currencies) where
+    categories is a list of (id, name) tuples matching the matrix rows.
+    """
+    end = end or datetime.date.today()
+    month_starts = bucket_range(previous_buckets(end.replace(day=1), 'month', months - 1), end, 'month')
+    totals, missing = converted_sums(
+        Transaction.objects
+        .filter(user=user, type=transaction_type, date__gte=month_starts[0], date__lte=end)
+        .annotate(month=TruncMonth('date', output_field=models.DateField())),
+        user_currency(user),
+        ['category_id', 'category__name', 'month'],
+    )
+
+    categories = {}
+    cells = []
+    month_index = {month: index for index, month in enumerate(month_starts)}
+    for (category_id, name, month), total in sorted(totals.items()):
+        row = categories.setdefault((category_id, name), len(categories))
+        cells.append((row, month_index[month], total))
+
+    matrix = np.zeros((len(categories), len(month_starts)))
+    if cells:
+        row_idx, col_idx, totals = zip(*cells)
+        matrix[list(row_idx), list(col_idx)] = np.asarray(totals, dtype=float)
+    return list(categories), month_starts, matrix, missing
+
+def moving_average(matrix, window):
+    """Trailing moving average along each row; NaN until `window` months exist"""
+    result = np.full(matrix.shape, np.nan)
+    if window <= matrix.shape[1]:
+        cumulative = np.cumsum(np.pad(matrix, ((0, 0), (1, 0))), axis=1)
+        result[:, window - 1:] = (cumulative[:, window:] - cumulative[:, :-window]) / window
+    return result
+
+def month_over_month(matrix):
+    """Absolute and relative change from the previous month; NaN for the first"""
+    delta = np.full(matrix.shape, np.nan)
+    pct = np.full(matrix.shape, np.nan)
+    delta[:, 1:] = np.diff(matrix, axis=1)
+    previous = matrix[:, :-1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        pct[:, 1:] = np.where(previous > 0, delta[:, 1:] / previous * 100, np.nan)
+    return delta, pct
+
+def linear_trend(matrix):
+    """
+    Least-squares slope and intercept of each row against month number,
+    solved in closed form for all rows at once
+    """
+    months = matrix.shape[1]
+    x = np.arange(months, dtype=float)
+    x_centered = x - x.mean()
+    denominator = x_centered @ x_centered
+    if denominator == 0:
+        return np.zeros(matrix.shape[0]), matrix[:, 0].copy()
+    slope = (matrix - matrix.mean(axis=1, keepdims=True)) @ x_centered / denominator
+    intercept = matrix.mean(axis=1) - slope * x.mean()
+    return slope, intercept
+
+def compute_trends(matrix, window=DEFAULT_WINDOW):
+    """All trend statistics for a categories x months matrix"""
+    slope, intercept = linear_trend(matrix)
+    delta, pct = month_over_month(matrix)
+    # Spending can't go negative, so clamp the extrapolated month
+    forecast = np.clip(intercept + slope * matrix.shape[1], 0, None)
+    return {
+        'moving_average': moving_average(matrix, window),
+        'change': delta,
+        'change_percentage': pct,
+        'slope': slope,
+        'forecast': forecast,
+    }
+
+def _rounded(values):
+    """Round an array to cents and convert NaN to None for JSON"""
+    values = np.asarray(values, dtype=float)
+    rounded = np.round(values, 2).astype(object)
+    rounded[np.isnan(values)] = None
+    return rounded.tolist()
+
+def category_trends(user, transaction_type='expense', months=DEFAULT_MONTHS, window=DEFAULT_WINDOW, end=None):
+    """Trend report for each category plus the combined total"""
+    categories, month_starts, matrix, missing = monthly_category_matrix(user, transaction_type, months, end)
+    # The combined series is the last row, so it goes through the same computations
+    combined = np.vstack([matrix, matrix.sum(axis=0)])
+    stats = compute_trends(combined, window)
+
+    def report(row):
+        return {
+            'totals': _rounded(combined[row]),
+            'moving_average': _rounded(stats['moving_average'][row]),
+            'change': _rounded(stats['change'][row]),
+            'change_percentage': _rounded(stats['change_percentage'][row]),
+            'slope': _rounded([stats['slope'][row]])[0],
+            'forecast': _rounded([stats['forecast'][row]])[0],
+        }
+
+    return {
+        'months': month_starts,
+        'categories': [
+            {'category_id': category_id, 'category': name, **report(row)}
+            for row, (category_id, name) in enumerate(categories)
+        ],
+        'total': report(len(categories)),
+        'currency': user_currency(user),
+        'unconverted_currencies': sorted(missing),
+    }
+
+# apps/analytics/trends.py
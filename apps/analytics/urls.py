@@ -5,11 +5,12 @@ app_name = 'analytics'
 
 urlpatterns = [
     path('', views.test_analytics_view, name='test'),
+    path('balance/', views.RunningBalanceView.as_view(), name='balance'),
+    path('trends/', views.TrendsView.as_view(), name='trends'),
     # Future analytics URLs will be added here
     # path('summary/', views.SummaryView.as_view(), name='summary'),
     # path('monthly/', views.MonthlySummaryView.as_view(), name='monthly'),
     # path('charts/', views.ChartsView.as_view(), name='charts'),
-    # path('trends/', views.TrendsView.as_view(), name='trends'),
     # path('categories/', views.CategoryAnalyticsView.as_view(), name='categories'),
 ]
 
@@ -1,8 +1,106 @@
 from django.shortcuts import render
+from django.utils.dateparse import parse_date
+from rest_framework import generics, status
 from rest_framework.decorators import api_view
+from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
-# Analytics views will be implemented here
+from .timeseries import running_balance
+from .trends import DEFAULT_MONTHS, DEFAULT_WINDOW, MAX_MONTHS, category_trends
+
+def _int_param(request, name, default, minimum, maximum):
+    """Parse an optional bounded integer query parameter"""
+    value = request.query_params.get(name)
+    if value in (None, ''):
+        return default
+    try:
+        value = int(value)
+    except ValueError:
+        raise ValueError(f'{name} must be an integer')
+    if not minimum <= value <= maximum:
+        raise ValueError(f'{name} must be between {minimum} and {maximum}')
+    return value
+
+def _date_param(request, name):
+    """Parse an optional YYYY-MM-DD query parameter"""
+    value = request.query_params.get(name)
+    if not value:
+        return None
+    parsed = parse_date(value)
+    if parsed is None:
+        raise ValueError(f'{name} must be a valid date (YYYY-MM-DD)')
+    return parsed
+
+class RunningBalanceView(generics.GenericAPIView):
+    """
+    Balance over time, bucketed by day, week or month
+    """
+    permission_classes = [IsAuthenticated]
+    throttle_scope = 'expensive'
+    
+    def get(self, request):
+        """
+        Get income, expenses and closing balance for each period
+        """
+        interval = request.query_params.get('interval', 'day')
+        try:
+            start_date = _date_param(request, 'start_date')
+            end_date = _date_param(request, 'end_date')
+            result = running_balance(request.user, interval, start_date, end_date)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        series = result['series']
+        return Response({
+            'interval': interval,
+            'opening_balance': float(result['opening_balance']),
+            'closing_balance': float(series[-1]['balance']),
+            'series': [
+                {
+                    'period': point['period'],
+                    'income': float(point['income']),
+                    'expenses': float(point['expenses']),
+                    'net': float(point['net']),
+                    'balance': float(point['balance']),
+                }
+                for point in series
+            ],
+            'date_range': {
+                'start_date': result['start_date'],
+                'end_date': result['end_date'],
+            },
+            'currency': result['currency'],
+            'unconverted_currencies': result['unconverted_currencies'],
+        })
+
+class TrendsView(generics.GenericAPIView):
+    """
+    Monthly per-category trends with next-month forecasts
+    """
+    permission_classes = [IsAuthenticated]
+    throttle_scope = 'expensive'
+    
+    def get(self, request):
+        """
+        Get moving averages, month-over-month changes, linear trend and
+        forecast for each category
+        """
+        transaction_type = request.query_params.get('type', 'expense')
+        if transaction_type not in ('income', 'expense'):
+            return Response({'error': "type must be 'income' or 'expense'"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            months = _int_param(request, 'months', DEFAULT_MONTHS, 2, MAX_MONTHS)
+            window = _int_param(request, 'window', DEFAULT_WINDOW, 1, months)
+            end_date = _date_param(request, 'end_date')
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        trends = category_trends(request.user, transaction_type, months, window, end_date)
+        return Response({
+            'type': transaction_type,
+            'window': window,
+            **trends,
+        })
 
 @api_view(['GET'])
 def test_analytics_view(request):
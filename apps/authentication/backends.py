@@ -0,0 +1,35 @@
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.models import User
+from django.db.models import Case, Q, Value, When
+
+class UsernameOrEmailBackend(ModelBackend):
+    """
+    Authenticate by username or case-insensitive email with one indexed
+    lookup and at most one password hash
+    """
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(User.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+
+        lookup = Q(username=username)
+        if '@' in username:
+            # Served by the partial unique UPPER(email) index, which leaves out blank emails
+            lookup |= Q(email__iexact=username) & ~Q(email='')
+        user = (
+            User.objects.filter(lookup)
+            # An exact username match wins over another account's email
+            .order_by(Case(When(username=username, then=Value(0)), default=Value(1)), 'id')
+            .first()
+        )
+
+        if user is None:
+            # Run the hasher anyway so response time doesn't reveal whether the account exists
+            User().set_password(password)
+            return None
+        if user.check_password(password) and self.user_can_authenticate(user):
+            return user
+        return None
+
+# apps/authentication/backends.py
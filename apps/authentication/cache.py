@@ -0,0 +1,40 @@
+"""
+Per-user cache of the serialized user and profile for the profile
+endpoint. Entries are dropped when the user or profile is saved; the
+ledger part of the response changes with every transaction and is
+maintained with queryset.update(), so it is read fresh instead.
+"""
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import AuthenticationFailed
+
+from .serializers import UserSerializer
+
+CACHE_TIMEOUT = getattr(settings, 'PROFILE_CACHE_TIMEOUT', 60 * 60)
+
+def _cache_key(user_id):
+    return f'profile:user:{user_id}'
+
+def get_user_data(user_id):
+    """Serialized user with profile, loading both in one query on a miss"""
+    key = _cache_key(user_id)
+    data = cache.get(key)
+    if data is None:
+        try:
+            user = User.objects.select_related('profile').get(pk=user_id)
+        except User.DoesNotExist:
+            # Deleted after their access token was issued
+            raise AuthenticationFailed(_('User not found'), code='user_not_found')
+        data = dict(UserSerializer(user).data)
+        cache.set(key, data, CACHE_TIMEOUT)
+    return data
+
+def invalidate_user_data(user_id):
+    """Drop a user's cached data once the current transaction commits"""
+    key = _cache_key(user_id)
+    transaction.on_commit(lambda: cache.delete(key))
+
+# apps/authentication/cache.py
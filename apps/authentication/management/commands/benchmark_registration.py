@@ -0,0 +1,83 @@
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from apps.authentication.serializers import UserRegistrationSerializer
+
+class Command(BaseCommand):
+    help = 'Measure registration throughput and latency, as during a sign-up spike'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--count',
+            type=int,
+            default=200,
+            help='Number of registrations (default: 200)',
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=8,
+            help='Registrations running in parallel, each with its own connection (default: 8)',
+        )
+        parser.add_argument(
+            '--keep',
+            action='store_true',
+            help='Keep the benchmark users instead of deleting them afterwards',
+        )
+
+    def register(self, prefix, index):
+        password = f'Bench-{uuid.uuid4().hex}'
+        serializer = UserRegistrationSerializer(data={
+            'username': f'{prefix}-{index}',
+            'email': f'{prefix}-{index}@benchmark.invalid',
+            'password': password,
+            'password_confirm': password,
+            'first_name': 'Benchmark',
+            'last_name': str(index),
+        })
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+
+    def timed_register(self, prefix, index):
+        started = time.perf_counter()
+        try:
+            self.register(prefix, index)
+        finally:
+            # Worker threads open their own connections; don't leak them
+            connection.close()
+        return time.perf_counter() - started
+
+    def handle(self, *args, **options):
+        prefix = f'bench-{uuid.uuid4().hex[:8]}'
+        count = max(options['count'], 1)
+
+        # One registration on the main connection to count its queries
+        with CaptureQueriesContext(connection) as queries:
+            self.register(prefix, 0)
+        self.stdout.write(f'Queries per registration: {len(queries)}')
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as pool:
+            latencies = sorted(pool.map(lambda index: self.timed_register(prefix, index), range(1, count)))
+        elapsed = max(time.perf_counter() - started, 1e-6)
+
+        if latencies:
+            p50 = latencies[len(latencies) // 2] * 1000
+            p95 = latencies[min(int(len(latencies) * 0.95), len(latencies) - 1)] * 1000
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f'Benchmark completed! Registrations: {len(latencies)}, '
+                    f'{len(latencies) / elapsed:,.1f} users/sec, p50 {p50:.1f} ms, p95 {p95:.1f} ms'
+                )
+            )
+
+        if not options['keep']:
+            deleted = User.objects.filter(username__startswith=prefix).delete()[1].get('auth.User', 0)
+            self.stdout.write(f'Removed {deleted} benchmark users')
+
+# apps/authentication/management/commands/benchmark_registration.py
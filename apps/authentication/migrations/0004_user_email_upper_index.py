@@ -0,0 +1,17 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('authentication', '0003_tokenuser'),
+    ]
+
+    operations = [
+        # Case-insensitive email lookups (email__iexact compiles to UPPER(email) = UPPER(%s))
+        migrations.RunSQL(
+            sql='CREATE INDEX auth_user_email_upper_idx ON auth_user (UPPER(email));',
+            reverse_sql='DROP INDEX auth_user_email_upper_idx;',
+        ),
+    ]
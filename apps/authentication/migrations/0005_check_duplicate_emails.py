@@ -0,0 +1,45 @@
+from django.db import migrations
+from django.db.models import Count
+from django.db.models.functions import Upper
+
+
+def check_duplicate_emails(apps, schema_editor):
+    """
+    Refuse to continue while emails collide case-insensitively; the unique
+    index in 0006 would fail halfway through the deploy otherwise
+    """
+    User = apps.get_model('auth', 'User')
+    duplicates = (
+        User.objects.exclude(email='')
+        .annotate(email_upper=Upper('email'))
+        .values('email_upper')
+        .annotate(count=Count('id'))
+        .filter(count__gt=1)
+        .values_list('email_upper', flat=True)
+    )
+    conflicts = []
+    for email in duplicates:
+        ids = list(
+            User.objects.annotate(email_upper=Upper('email'))
+            .filter(email_upper=email)
+            .order_by('id')
+            .values_list('id', flat=True)
+        )
+        conflicts.append(f"{email}: user ids {', '.join(map(str, ids))}")
+    if conflicts:
+        raise RuntimeError(
+            'Accounts share an email address ignoring case. Change or clear the '
+            'email of all but one account in each group, then migrate again:\n'
+            + '\n'.join(conflicts)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0004_user_email_upper_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_duplicate_emails, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,45 @@
+from django.db import migrations
+
+
+def create_unique_index(apps, schema_editor):
+    # One account per email, case-insensitively; registration relies on it
+    # instead of checking first. Accounts without an email are exempt.
+    concurrently = 'CONCURRENTLY ' if schema_editor.connection.vendor == 'postgresql' else ''
+    if concurrently:
+        # A concurrent build that failed earlier leaves an invalid index behind
+        with schema_editor.connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT 1 FROM pg_index JOIN pg_class ON pg_class.oid = pg_index.indexrelid "
+                "WHERE pg_class.relname = 'auth_user_email_upper_uniq' AND NOT pg_index.indisvalid"
+            )
+            if cursor.fetchone():
+                schema_editor.execute('DROP INDEX CONCURRENTLY auth_user_email_upper_uniq')
+    schema_editor.execute(
+        f"CREATE UNIQUE INDEX {concurrently}IF NOT EXISTS auth_user_email_upper_uniq "
+        f"ON auth_user (UPPER(email)) WHERE email <> ''"
+    )
+    # Email lookups exclude blank emails so they are served by the partial index
+    schema_editor.execute(f'DROP INDEX {concurrently}IF EXISTS auth_user_email_upper_idx')
+
+
+def drop_unique_index(apps, schema_editor):
+    concurrently = 'CONCURRENTLY ' if schema_editor.connection.vendor == 'postgresql' else ''
+    schema_editor.execute(
+        f'CREATE INDEX {concurrently}IF NOT EXISTS auth_user_email_upper_idx ON auth_user (UPPER(email))'
+    )
+    schema_editor.execute(f'DROP INDEX {concurrently}IF EXISTS auth_user_email_upper_uniq')
+
+
+class Migration(migrations.Migration):
+
+    # CREATE/DROP INDEX CONCURRENTLY can't run inside a transaction; building
+    # without it would block writes to auth_user for the whole build
+    atomic = False
+
+    dependencies = [
+        ('authentication', '0005_check_duplicate_emails'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_unique_index, drop_unique_index),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.1 on 2026-10-19 09:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0006_user_email_unique'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='userprofile',
+            name='currency',
+            field=models.CharField(default='USD', help_text='Currency code (e.g., USD, EUR, IDR)', max_length=3),
+        ),
+    ]
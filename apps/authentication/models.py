@@ -1,14 +1,20 @@
 from django.db import models
 from django.contrib.auth.models import User
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import AuthenticationFailed
 
-class UserProfile(models.Model):
+from utils.models import TrackedFieldsMixin
+
+class UserProfile(TrackedFieldsMixin, models.Model):
     """
     Extended user profile model to store additional user information
     """
+    tracked_fields = ('currency', 'monthly_budget', 'avatar', 'phone_number', 'date_of_birth')
+
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='profile')
-    currency = models.CharField(max_length=3, default='USD', help_text='Currency code (e.g., USD, EUR, RP)')
+    currency = models.CharField(max_length=3, default='USD', help_text='Currency code (e.g., USD, EUR, IDR)')
     monthly_budget = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True)
     avatar = models.ImageField(upload_to='avatars/', null=True, blank=True)
     phone_number = models.CharField(max_length=20, blank=True)
@@ -23,20 +29,60 @@ class UserProfile(models.Model):
         verbose_name = 'User Profile'
         verbose_name_plural = 'User Profiles'
 
+class TokenUser(User):
+    """
+    User built from the id claim of an access token without a query.
+    The remaining fields are deferred and loaded together, with one query,
+    the first time any of them is read. If the user has been deleted since
+    the token was issued, that read fails authentication (401).
+    """
+    class Meta:
+        proxy = True
+
+    @classmethod
+    def from_token(cls, user_id):
+        return cls.from_db(None, ['id'], [user_id])
+
+    def refresh_from_db(self, using=None, fields=None):
+        deferred = self.get_deferred_fields()
+        if fields is not None and deferred and set(fields) <= deferred:
+            # Load every deferred field at once rather than one query per attribute
+            fields = deferred
+        try:
+            super().refresh_from_db(using=using, fields=fields)
+        except self.DoesNotExist:
+            raise AuthenticationFailed(_('User not found'), code='user_not_found')
+
 @receiver(post_save, sender=User)
-def create_user_profile(sender, instance, created, **kwargs):
+def onboard_new_user(sender, instance, created, **kwargs):
     """
-    Automatically create a UserProfile when a User is created
+    Create the profile, preferences, default categories and welcome
+    notification of a new User
     """
     if created:
-        UserProfile.objects.create(user=instance)
+        from .services import onboard_user
+        onboard_user(instance)
 
 @receiver(post_save, sender=User)
 def save_user_profile(sender, instance, **kwargs):
     """
-    Save the UserProfile when the User is saved
+    Save the UserProfile when the User is saved, if it was loaded and changed
+    """
+    # Checking the cache avoids a query for users whose profile was never touched
+    if sender.profile.related.is_cached(instance):
+        profile = instance.profile
+        if profile is not None and profile.get_changed_fields():
+            profile.save()
+
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=TokenUser)
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=User)
+def invalidate_cached_profile(sender, instance, **kwargs):
+    """
+    Drop the cached profile response of the saved or deleted user
     """
-    if hasattr(instance, 'profile'):
-        instance.profile.save()
+    from .cache import invalidate_user_data
+    invalidate_user_data(instance.user_id if isinstance(instance, UserProfile) else instance.pk)
 
-# apps/authentication/models.py
\ No newline at end of file
+# apps/authentication/models.py
@@ -1,7 +1,32 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
 from django.contrib.auth import authenticate
+from django.contrib.auth.validators import UnicodeUsernameValidator
+from django.db import IntegrityError, transaction
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from apps.currencies.serializers import validate_currency_code
 from .models import UserProfile
+from .tokens import CachedBlacklistRefreshToken
+
+# Unique indexes on auth_user: constraint names on PostgreSQL, and the
+# "UNIQUE constraint failed" targets SQLite reports instead
+DUPLICATE_USER_FIELDS = {
+    'auth_user_email_upper_uniq': 'email',
+    "index 'auth_user_email_upper_uniq'": 'email',
+    'auth_user_username_key': 'username',
+    'auth_user.username': 'username',
+}
+
+def duplicate_user_field(error):
+    """The User field whose unique index an IntegrityError violated, or None"""
+    diag = getattr(error.__cause__, 'diag', None)
+    constraint = getattr(diag, 'constraint_name', None)
+    if constraint is None:
+        message = str(error)
+        if 'UNIQUE constraint failed: ' not in message:
+            return None
+        constraint = message.split('UNIQUE constraint failed: ', 1)[1].strip()
+    return DUPLICATE_USER_FIELDS.get(constraint)
 
 class UserProfileSerializer(serializers.ModelSerializer):
     """
@@ -32,22 +57,8 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ['username', 'email', 'password', 'password_confirm', 'first_name', 'last_name']
-    
-    def validate_email(self, value):
-        """
-        Validate that email is unique
-        """
-        if User.objects.filter(email=value).exists():
-            raise serializers.ValidationError("A user with this email already exists.")
-        return value
-    
-    def validate_username(self, value):
-        """
-        Validate that username is unique
-        """
-        if User.objects.filter(username=value).exists():
-            raise serializers.ValidationError("A user with this username already exists.")
-        return value
+        # Uniqueness is enforced by the database at insert time, not by a query per field
+        extra_kwargs = {'username': {'validators': [UnicodeUsernameValidator()]}}
     
     def validate(self, attrs):
         """
@@ -59,11 +70,18 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
     
     def create(self, validated_data):
         """
-        Create a new user with encrypted password
+        Create a new user with encrypted password. The User post_save
+        receiver onboards the account in the same transaction.
         """
         validated_data.pop('password_confirm')
-        user = User.objects.create_user(**validated_data)
-        return user
+        try:
+            with transaction.atomic():
+                return User.objects.create_user(**validated_data)
+        except IntegrityError as e:
+            field = duplicate_user_field(e)
+            if field is None:
+                raise
+            raise serializers.ValidationError({field: [f"A user with this {field} already exists."]})
 
 class UserLoginSerializer(serializers.Serializer):
     """
@@ -80,16 +98,10 @@ class UserLoginSerializer(serializers.Serializer):
         password = attrs.get('password')
         
         if username_or_email and password:
-            # First try to authenticate with username
-            user = authenticate(username=username_or_email, password=password)
-            
-            # If that fails and input looks like email, try to find user by email
-            if not user and '@' in username_or_email:
-                try:
-                    user_obj = User.objects.get(email=username_or_email)
-                    user = authenticate(username=user_obj.username, password=password)
-                except User.DoesNotExist:
-                    user = None
+            # The backend resolves username or email with one lookup and one hash
+            user = authenticate(
+                self.context.get('request'), username=username_or_email, password=password
+            )
             
             if not user:
                 raise serializers.ValidationError('Invalid username/email or password.')
@@ -111,6 +123,9 @@ class UserProfileUpdateSerializer(serializers.ModelSerializer):
         model = UserProfile
         fields = ['user', 'currency', 'monthly_budget', 'avatar', 'phone_number', 'date_of_birth']
     
+    def validate_currency(self, value):
+        return validate_currency_code(value)
+    
     def get_user(self, obj):
         """
         Get basic user information
@@ -165,4 +180,10 @@ class PasswordChangeSerializer(serializers.Serializer):
         user.save()
         return user
 
-# apps/authentication/serializers.py
\ No newline at end of file
+class CachedTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Token refresh checking and rotating through the cached blacklist
+    """
+    token_class = CachedBlacklistRefreshToken
+
+# apps/authentication/serializers.py
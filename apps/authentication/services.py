@@ -0,0 +1,22 @@
+"""
+Account onboarding.
+
+Everything a new account starts with is created by `onboard_user`, called
+once from the User post_save receiver so registration, the admin and
+createsuperuser all share it. Each piece is one INSERT inside the
+caller's transaction; the welcome notification is an outbox event and is
+created off the request path by the relay.
+"""
+from apps.categories.defaults import provision_default_categories
+from apps.notifications.models import NotificationPreference
+from apps.outbox.events import publish
+from .models import UserProfile
+
+def onboard_user(user):
+    """Create the profile, notification preferences and default categories of a new user"""
+    UserProfile.objects.create(user=user)
+    NotificationPreference.objects.create(user=user)
+    provision_default_categories(user)
+    publish('user.created', {'user_id': user.pk})
+
+# apps/authentication/services.py
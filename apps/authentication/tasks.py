@@ -0,0 +1,28 @@
+from celery import shared_task
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+from .tokens import purge_expired_tokens, warm_blacklist_cache
+
+@shared_task
+def persist_blacklisted_token(jti, token, exp):
+    """Record a token blacklisted in the cache in the audit tables"""
+    outstanding, _ = OutstandingToken.objects.get_or_create(
+        jti=jti,
+        defaults={'token': token, 'expires_at': datetime_from_epoch(exp)},
+    )
+    BlacklistedToken.objects.get_or_create(token=outstanding)
+
+@shared_task
+def warm_token_blacklist():
+    """Load unexpired blacklisted tokens into the token cache"""
+    return warm_blacklist_cache()
+
+@shared_task
+def flush_expired_tokens():
+    """Purge expired tokens from the blacklist tables, then reload the cache"""
+    deleted = purge_expired_tokens()
+    warm_blacklist_cache()
+    return deleted
+
+# apps/authentication/tasks.py
@@ -1,5 +1,237 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import authenticate
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
 
-# apps/authentication/tests.py
\ No newline at end of file
+from . import throttling
+from .models import TokenUser
+
+LOCMEM_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'tests-default'},
+    'tokens': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'tests-tokens'},
+}
+
+def user_table_queries(queries):
+    return [query['sql'] for query in queries if 'FROM "auth_user"' in query['sql']]
+
+class TokenUserAuthenticationTests(TestCase):
+    """
+    Requests authenticated from the access token's user id claim
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user('alice', 'alice@example.com', 'password', first_name='Alice')
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}')
+
+    def test_request_does_not_load_the_user(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/transactions/recurring/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(user_table_queries(queries.captured_queries), [])
+
+    def test_deferred_fields_load_together(self):
+        user = TokenUser.from_token(self.user.pk)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(user.username, 'alice')
+            self.assertEqual(user.email, 'alice@example.com')
+            self.assertEqual(user.first_name, 'Alice')
+            self.assertTrue(user.is_active)
+
+    def test_deleted_user_is_unauthorized(self):
+        self.user.delete()
+
+        # The profile reads the user through its cache; the user list reads a deferred field
+        for url in ('/api/auth/profile/', '/api/auth/users/'):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 401)
+            self.assertEqual(response.data['detail'].code, 'user_not_found')
+
+    def test_deactivated_user_keeps_access_until_token_expiry(self):
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+
+        # Documented: the access token stays valid, only new logins are refused
+        self.assertEqual(self.client.get('/api/transactions/recurring/').status_code, 200)
+        self.assertFalse(TokenUser.from_token(self.user.pk).is_active)
+        response = APIClient().post('/api/auth/login/', {'username': 'alice', 'password': 'password'})
+        self.assertEqual(response.status_code, 400)
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class LoginTests(TestCase):
+    """
+    Username or email login and failed-login lockout
+    """
+
+    def setUp(self):
+        throttling.cache.clear()
+        self.user = User.objects.create_user('alice', 'Alice@Example.com', 'password')
+        self.client = APIClient()
+
+    def login(self, username, password='password', ip='10.0.0.1'):
+        return self.client.post(
+            '/api/auth/login/', {'username': username, 'password': password}, REMOTE_ADDR=ip,
+        )
+
+    def test_username_or_case_insensitive_email(self):
+        self.assertEqual(authenticate(None, username='alice', password='password'), self.user)
+        self.assertEqual(authenticate(None, username='alice@example.com', password='password'), self.user)
+        self.assertIsNone(authenticate(None, username='alice', password='wrong'))
+
+    def test_exact_username_wins_over_another_accounts_email(self):
+        other = User.objects.create_user('alice@example.com', 'other@example.com', 'password')
+
+        self.assertEqual(authenticate(None, username='alice@example.com', password='password'), other)
+
+    def test_blank_email_does_not_match(self):
+        User.objects.create_user('bob', '', 'password')
+
+        self.assertIsNone(authenticate(None, username='@', password='password'))
+
+    def test_missing_user_still_hashes_the_password(self):
+        with mock.patch.object(User, 'set_password') as set_password:
+            self.assertIsNone(authenticate(None, username='nobody@example.com', password='password'))
+
+        set_password.assert_called_once_with('password')
+
+    @mock.patch.object(throttling, 'MAX_FAILURES_PER_ACCOUNT', 3)
+    def test_account_lockout(self):
+        for attempt in range(3):
+            # Each attempt from a different client, with the email in another case
+            self.assertEqual(self.login('ALICE@example.com', 'wrong', ip=f'10.0.0.{attempt}').status_code, 400)
+
+        response = self.login('alice@example.com', ip='10.0.1.1')
+        self.assertEqual(response.status_code, 429)
+        # Another account is not affected
+        User.objects.create_user('bob', 'bob@example.com', 'password')
+        self.assertEqual(self.login('bob', ip='10.0.1.1').status_code, 200)
+
+    @mock.patch.object(throttling, 'MAX_FAILURES_PER_IP', 3)
+    def test_ip_lockout(self):
+        for attempt in range(3):
+            self.assertEqual(self.login(f'user{attempt}', 'wrong').status_code, 400)
+
+        self.assertEqual(self.login('alice').status_code, 429)
+        self.assertEqual(self.login('alice', ip='10.0.0.2').status_code, 200)
+
+    @mock.patch.object(throttling, 'MAX_FAILURES_PER_ACCOUNT', 3)
+    def test_successful_login_clears_the_account_counter(self):
+        self.login('alice', 'wrong')
+        self.login('alice', 'wrong')
+        self.assertEqual(self.login('alice').status_code, 200)
+
+        self.login('alice', 'wrong')
+        self.login('alice', 'wrong')
+        self.assertEqual(self.login('alice').status_code, 200)
+
+class RegistrationTests(TestCase):
+    """
+    Duplicate usernames and emails rejected by the unique indexes
+    """
+
+    def setUp(self):
+        # Created by a migration, which the test settings don't run
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "CREATE UNIQUE INDEX IF NOT EXISTS auth_user_email_upper_uniq ON auth_user (UPPER(email)) WHERE email <> ''"
+            )
+        User.objects.create_user('alice', 'alice@example.com', 'password')
+        self.client = APIClient()
+
+    def register(self, username, email):
+        return self.client.post('/api/auth/register/', {
+            'username': username, 'email': email, 'password': 'password123', 'password_confirm': 'password123',
+        })
+
+    def test_duplicate_username(self):
+        response = self.register('alice', 'other@example.com')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(list(response.data), ['username'])
+
+    def test_duplicate_email(self):
+        for email in ('alice@example.com', 'Alice@EXAMPLE.com'):
+            response = self.register('bob', email)
+
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(list(response.data), ['email'])
+        self.assertFalse(User.objects.filter(username='bob').exists())
+
+    def test_blank_emails_are_not_duplicates(self):
+        self.assertEqual(self.register('bob', '').status_code, 201)
+        self.assertEqual(self.register('carol', '').status_code, 201)
+
+    def test_profile_email_taken_by_another_account(self):
+        bob = User.objects.create_user('bob', 'bob@example.com', 'password')
+        self.client.force_authenticate(bob)
+
+        response = self.client.put('/api/auth/profile/', {'email': 'ALICE@example.com'}, format='json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('email', response.data['error'])
+        bob.refresh_from_db()
+        self.assertEqual(bob.email, 'bob@example.com')
+
+    def test_profile_email_taken_after_the_check(self):
+        bob = User.objects.create_user('bob', 'bob@example.com', 'password')
+        self.client.force_authenticate(bob)
+
+        # Another request takes the email between the check and the save
+        with mock.patch('django.db.models.query.QuerySet.exists', return_value=False):
+            response = self.client.put('/api/auth/profile/', {'email': 'Alice@example.com'}, format='json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('email', response.data['error'])
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ProfileCacheTests(TestCase):
+    """
+    Cached profile data and conditional GETs
+    """
+
+    def setUp(self):
+        throttling.cache.clear()
+        self.user = User.objects.create_user('alice', 'alice@example.com', 'password', first_name='Alice')
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}')
+
+    def test_second_request_is_served_from_the_cache(self):
+        self.assertEqual(self.client.get('/api/auth/profile/').status_code, 200)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/auth/profile/')
+
+        self.assertEqual(response.data['user']['first_name'], 'Alice')
+        self.assertEqual(user_table_queries(queries.captured_queries), [])
+
+    def test_update_invalidates_the_cache(self):
+        self.client.get('/api/auth/profile/')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.put('/api/auth/profile/', {'first_name': 'Alicia'}, format='json')
+        self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(self.client.get('/api/auth/profile/').data['user']['first_name'], 'Alicia')
+
+    def test_if_none_match(self):
+        response = self.client.get('/api/auth/profile/')
+        etag = response['ETag']
+        self.assertEqual(response['Cache-Control'], 'private, no-cache')
+
+        response = self.client.get('/api/auth/profile/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.put('/api/auth/profile/', {'first_name': 'Alicia'}, format='json')
+        response = self.client.get('/api/auth/profile/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+# apps/authentication/tests.py
@@ -0,0 +1,49 @@
+"""
+Failed-login counters for brute-force protection.
+
+Failures are counted per client IP and per submitted username/email in
+the cache (Redis) over a fixed window. Both counters are read with one
+round trip before the password is checked, so a throttled attempt never
+reaches the hasher. A successful login clears the account's counter.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.throttling import BaseThrottle
+
+WINDOW = getattr(settings, 'LOGIN_THROTTLE_WINDOW', 15 * 60)
+MAX_FAILURES_PER_ACCOUNT = getattr(settings, 'LOGIN_MAX_FAILURES_PER_ACCOUNT', 5)
+MAX_FAILURES_PER_IP = getattr(settings, 'LOGIN_MAX_FAILURES_PER_IP', 20)
+
+def _keys(request, identifier):
+    # DRF's ident honours NUM_PROXIES when reading X-Forwarded-For
+    ip = BaseThrottle().get_ident(request)
+    account = hashlib.sha256(identifier.strip().lower().encode()).hexdigest()
+    return f'login:failures:ip:{ip}', f'login:failures:account:{account}'
+
+def login_throttled(request, identifier):
+    """Whether the client or the account has used up its failed attempts"""
+    ip_key, account_key = _keys(request, identifier)
+    counts = cache.get_many([ip_key, account_key])
+    return (
+        counts.get(ip_key, 0) >= MAX_FAILURES_PER_IP
+        or counts.get(account_key, 0) >= MAX_FAILURES_PER_ACCOUNT
+    )
+
+def record_failed_login(request, identifier):
+    """Count a failed attempt against the client and the account"""
+    for key in _keys(request, identifier):
+        # add() only sets the expiry on the first failure of a window
+        cache.add(key, 0, WINDOW)
+        try:
+            cache.incr(key)
+        except ValueError:
+            # The key expired between add() and incr()
+            cache.set(key, 1, WINDOW)
+
+def clear_failed_logins(request, identifier):
+    """Reset the account's counter after a successful login"""
+    cache.delete(_keys(request, identifier)[1])
+
+# apps/authentication/throttling.py
@@ -0,0 +1,115 @@
+"""
+Refresh tokens whose blacklist is served from Redis.
+
+simplejwt's blacklist app checks and writes PostgreSQL on every refresh.
+Here a blacklisted token is a key in the `tokens` cache that expires with
+the token, so a refresh costs one cache round trip whatever the size of
+the tables. The token_blacklist tables are still written, by a Celery
+task after the request commits, for auditing and as the source the cache
+is rebuilt from.
+
+Until the cache has been loaded from the tables (a marker key records
+that), checks fall back to the database, so a flushed cache never lets a
+blacklisted token through. An evicted key would, so the cache must be a
+Redis instance that never evicts; without a `tokens` cache configured,
+tokens are checked and blacklisted in the database as simplejwt does.
+"""
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import aware_utcnow
+
+WARM_KEY = 'jwt:blacklist:warm'
+WARMING_KEY = 'jwt:blacklist:warming'
+BATCH_SIZE = 10000
+
+def token_cache():
+    """The blacklist cache, or None when blacklist checks use the database"""
+    return caches['tokens'] if 'tokens' in settings.CACHES else None
+
+def blacklist_key(jti):
+    return f'jwt:blacklist:{jti}'
+
+class CachedBlacklistRefreshToken(RefreshToken):
+    """
+    Refresh token checked against and blacklisted in the token cache
+    """
+    def check_blacklist(self):
+        cache = token_cache()
+        if cache is None:
+            return super().check_blacklist()
+        key = blacklist_key(self.payload[api_settings.JTI_CLAIM])
+        found = cache.get_many([key, WARM_KEY])
+        if key in found:
+            raise TokenError(_('Token is blacklisted'))
+        if WARM_KEY not in found:
+            # The cache hasn't been loaded since it was emptied; the tables are authoritative
+            from .tasks import warm_token_blacklist
+            if cache.add(WARMING_KEY, 1, 5 * 60):
+                transaction.on_commit(warm_token_blacklist.delay)
+            super().check_blacklist()
+
+    def blacklist(self):
+        cache = token_cache()
+        if cache is None:
+            return super().blacklist()
+        jti = self.payload[api_settings.JTI_CLAIM]
+        exp = self.payload['exp']
+        remaining = exp - int(aware_utcnow().timestamp())
+        cache.set(blacklist_key(jti), 1, max(remaining, 1))
+
+        from .tasks import persist_blacklisted_token
+        # Encode now: token refresh rotates this instance's claims right after
+        token = str(self)
+        transaction.on_commit(lambda: persist_blacklisted_token.delay(jti, token, exp))
+
+def warm_blacklist_cache(batch_size=BATCH_SIZE):
+    """Load every unexpired blacklisted token into the cache"""
+    cache = token_cache()
+    if cache is None:
+        return 0
+    # Expired tokens fail verification anyway, so outliving them in the cache is harmless
+    timeout = int(api_settings.REFRESH_TOKEN_LIFETIME.total_seconds())
+    jtis = (
+        BlacklistedToken.objects.filter(token__expires_at__gt=aware_utcnow())
+        .values_list('token__jti', flat=True)
+        .iterator(chunk_size=batch_size)
+    )
+    loaded = 0
+    batch = []
+    for jti in jtis:
+        batch.append(jti)
+        if len(batch) >= batch_size:
+            cache.set_many({blacklist_key(jti): 1 for jti in batch}, timeout)
+            loaded += len(batch)
+            batch = []
+    if batch:
+        cache.set_many({blacklist_key(jti): 1 for jti in batch}, timeout)
+        loaded += len(batch)
+    cache.set(WARM_KEY, 1, None)
+    cache.delete(WARMING_KEY)
+    return loaded
+
+def purge_expired_tokens(batch_size=BATCH_SIZE):
+    """
+    Delete expired outstanding tokens, and their blacklist entries, in
+    batches so no single statement locks a large part of the tables
+    """
+    now = aware_utcnow()
+    deleted = 0
+    while True:
+        ids = list(
+            OutstandingToken.objects.filter(expires_at__lte=now)
+            .values_list('id', flat=True)[:batch_size]
+        )
+        if not ids:
+            return deleted
+        OutstandingToken.objects.filter(id__in=ids).delete()
+        deleted += len(ids)
+
+# apps/authentication/tokens.py
@@ -1,21 +1,34 @@
+import hashlib
+import json
+
 from django.shortcuts import render
 from rest_framework import status, generics, permissions
 from rest_framework.decorators import api_view, permission_classes
+from rest_framework.exceptions import Throttled, ValidationError
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from django.contrib.auth.models import User
 from django.contrib.auth import authenticate
+from django.contrib.auth.models import update_last_login
+from django.db import IntegrityError, transaction
+from django.utils.http import parse_etags, quote_etag
+from .cache import get_user_data
 from .models import UserProfile
+from .tokens import CachedBlacklistRefreshToken
+from .throttling import WINDOW as LOGIN_THROTTLE_WINDOW, clear_failed_logins, login_throttled, record_failed_login
 from .serializers import (
     UserRegistrationSerializer, 
     UserLoginSerializer, 
     UserSerializer,
     UserProfileUpdateSerializer,
-    PasswordChangeSerializer
+    PasswordChangeSerializer,
+    duplicate_user_field,
 )
+from apps.transactions.ledger import get_summaries
+from apps.transactions.serializers import LedgerSummarySerializer
 
 class RegisterView(generics.CreateAPIView):
     """
@@ -31,7 +44,7 @@ class RegisterView(generics.CreateAPIView):
         user = serializer.save()
         
         # Generate tokens for the new user
-        refresh = RefreshToken.for_user(user)
+        refresh = CachedBlacklistRefreshToken.for_user(user)
         
         return Response({
             'message': 'User created successfully',
@@ -49,11 +62,24 @@ class LoginView(TokenObtainPairView):
     permission_classes = [AllowAny]
     
     def post(self, request, *args, **kwargs):
-        serializer = UserLoginSerializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
+        identifier = str(request.data.get('username', ''))
+        if login_throttled(request, identifier):
+            raise Throttled(
+                wait=LOGIN_THROTTLE_WINDOW,
+                detail='Too many failed login attempts. Please try again later.',
+            )
+        
+        serializer = UserLoginSerializer(data=request.data, context={'request': request})
+        if not serializer.is_valid():
+            record_failed_login(request, identifier)
+            raise ValidationError(serializer.errors)
+        clear_failed_logins(request, identifier)
         
         user = serializer.validated_data['user']
-        refresh = RefreshToken.for_user(user)
+        if jwt_settings.UPDATE_LAST_LOGIN:
+            # Saves only last_login; the profile isn't loaded, so it isn't written
+            update_last_login(None, user)
+        refresh = CachedBlacklistRefreshToken.for_user(user)
         
         return Response({
             'message': 'Login successful',
@@ -74,7 +100,7 @@ class LogoutView(APIView):
         try:
             refresh_token = request.data.get("refresh_token")
             if refresh_token:
-                token = RefreshToken(refresh_token)
+                token = CachedBlacklistRefreshToken(refresh_token)
                 token.blacklist()
                 return Response({
                     'message': 'Logout successful'
@@ -105,11 +131,19 @@ class ProfileView(APIView):
         Get user profile information
         """
         user = request.user
-        user_data = UserSerializer(user).data
+        data = {
+            'user': get_user_data(user.pk),
+            'ledger': LedgerSummarySerializer(get_summaries(user), many=True).data
+        }
         
-        return Response({
-            'user': user_data
-        }, status=status.HTTP_200_OK)
+        # Clients revalidate with If-None-Match and get a bodiless 304 when nothing changed
+        etag = quote_etag(hashlib.sha1(json.dumps(data, sort_keys=True, default=str).encode()).hexdigest())
+        headers = {'ETag': etag, 'Cache-Control': 'private, no-cache'}
+        if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+        if if_none_match and etag in parse_etags(if_none_match.replace('W/', '')):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        
+        return Response(data, status=status.HTTP_200_OK, headers=headers)
     
     def put(self, request):
         """
@@ -118,20 +152,29 @@ class ProfileView(APIView):
         user = request.user
         profile = user.profile
         
+        # Validate email uniqueness if changed (before the new value is set on the user)
+        if request.data.get('email') and request.data['email'] != user.email:
+            if User.objects.filter(email__iexact=request.data['email']).exclude(email='').exclude(pk=user.pk).exists():
+                return Response({
+                    'error': 'A user with this email already exists.'
+                }, status=status.HTTP_400_BAD_REQUEST)
+        
         # Update user basic information
         user_fields = ['first_name', 'last_name', 'email']
         for field in user_fields:
             if field in request.data:
                 setattr(user, field, request.data[field])
         
-        # Validate email uniqueness if changed
-        if 'email' in request.data and request.data['email'] != user.email:
-            if User.objects.filter(email=request.data['email']).exists():
-                return Response({
-                    'error': 'A user with this email already exists.'
-                }, status=status.HTTP_400_BAD_REQUEST)
-        
-        user.save()
+        # The check above can race another account taking the same email
+        try:
+            with transaction.atomic():
+                user.save()
+        except IntegrityError as e:
+            if duplicate_user_field(e) != 'email':
+                raise
+            return Response({
+                'error': 'A user with this email already exists.'
+            }, status=status.HTTP_400_BAD_REQUEST)
         
         # Update profile information
         profile_serializer = UserProfileUpdateSerializer(
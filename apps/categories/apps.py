@@ -6,4 +6,10 @@ class CategoriesConfig(AppConfig):
     name = 'apps.categories'
     verbose_name = 'Categories'
 
+    def ready(self):
+        """
+        Import signal handlers when the app is ready
+        """
+        import apps.categories.signals
+
 # apps/categories/apps.py
\ No newline at end of file
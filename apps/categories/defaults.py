@@ -0,0 +1,62 @@
+"""
+Default categories given to every user.
+
+New users are provisioned on registration; `create_default_categories`
+backfills existing users. Both insert with bulk_create(ignore_conflicts=True)
+against the (name, user, type) unique constraint, so defaults a user
+already has (or deleted and recreated) are left untouched and reruns are
+harmless.
+"""
+from .models import Category
+
+DEFAULT_CATEGORIES = [
+    # Expense categories
+    {'name': 'Food & Dining', 'type': 'expense', 'icon': '🍔', 'color': '#FF6B6B'},
+    {'name': 'Transportation', 'type': 'expense', 'icon': '🚗', 'color': '#4ECDC4'},
+    {'name': 'Shopping', 'type': 'expense', 'icon': '🛍️', 'color': '#45B7D1'},
+    {'name': 'Entertainment', 'type': 'expense', 'icon': '🎬', 'color': '#FFA07A'},
+    {'name': 'Bills & Utilities', 'type': 'expense', 'icon': '📄', 'color': '#98D8C8'},
+    {'name': 'Healthcare', 'type': 'expense', 'icon': '🏥', 'color': '#F7DC6F'},
+    {'name': 'Education', 'type': 'expense', 'icon': '📚', 'color': '#BB8FCE'},
+    {'name': 'Travel', 'type': 'expense', 'icon': '✈️', 'color': '#85C1E9'},
+
+    # Income categories
+    {'name': 'Salary', 'type': 'income', 'icon': '💰', 'color': '#58D68D'},
+    {'name': 'Freelance', 'type': 'income', 'icon': '💻', 'color': '#5DADE2'},
+    {'name': 'Investment', 'type': 'income', 'icon': '📈', 'color': '#F8C471'},
+    {'name': 'Business', 'type': 'income', 'icon': '🏢', 'color': '#AF7AC5'},
+    {'name': 'Gift', 'type': 'income', 'icon': '🎁', 'color': '#F1948A'},
+    {'name': 'Other Income', 'type': 'income', 'icon': '💡', 'color': '#82E0AA'},
+]
+
+# Rows per INSERT statement when provisioning many users at once
+INSERT_BATCH_SIZE = 5000
+
+def default_categories_for(user_ids):
+    """Unsaved default Category instances for each of `user_ids`"""
+    return [
+        Category(
+            user_id=user_id,
+            description=f"Default {category_data['type']} category",
+            **category_data,
+        )
+        for user_id in user_ids
+        for category_data in DEFAULT_CATEGORIES
+    ]
+
+def provision_default_categories(user_ids):
+    """
+    Give users the default categories they don't have yet.
+    Accepts a user, a user id, or an iterable of user ids.
+    """
+    if hasattr(user_ids, 'pk'):
+        user_ids = [user_ids.pk]
+    elif isinstance(user_ids, int):
+        user_ids = [user_ids]
+    Category.objects.bulk_create(
+        default_categories_for(user_ids),
+        batch_size=INSERT_BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+
+# apps/categories/defaults.py
@@ -1,5 +1,9 @@
+import time
+
 from django.core.management.base import BaseCommand
 from django.contrib.auth.models import User
+from django.db import transaction
+from apps.categories.defaults import DEFAULT_CATEGORIES, provision_default_categories
 from apps.categories.models import Category
 
 class Command(BaseCommand):
@@ -11,70 +15,54 @@ class Command(BaseCommand):
             type=int,
             help='Create categories for specific user ID',
         )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=1000,
+            help='Users provisioned per transaction (default: 1000)',
+        )
 
     def handle(self, *args, **options):
-        # Default categories data
-        default_categories = [
-            # Expense categories
-            {'name': 'Food & Dining', 'type': 'expense', 'icon': '🍔', 'color': '#FF6B6B'},
-            {'name': 'Transportation', 'type': 'expense', 'icon': '🚗', 'color': '#4ECDC4'},
-            {'name': 'Shopping', 'type': 'expense', 'icon': '🛍️', 'color': '#45B7D1'},
-            {'name': 'Entertainment', 'type': 'expense', 'icon': '🎬', 'color': '#FFA07A'},
-            {'name': 'Bills & Utilities', 'type': 'expense', 'icon': '📄', 'color': '#98D8C8'},
-            {'name': 'Healthcare', 'type': 'expense', 'icon': '🏥', 'color': '#F7DC6F'},
-            {'name': 'Education', 'type': 'expense', 'icon': '📚', 'color': '#BB8FCE'},
-            {'name': 'Travel', 'type': 'expense', 'icon': '✈️', 'color': '#85C1E9'},
-            
-            # Income categories
-            {'name': 'Salary', 'type': 'income', 'icon': '💰', 'color': '#58D68D'},
-            {'name': 'Freelance', 'type': 'income', 'icon': '💻', 'color': '#5DADE2'},
-            {'name': 'Investment', 'type': 'income', 'icon': '📈', 'color': '#F8C471'},
-            {'name': 'Business', 'type': 'income', 'icon': '🏢', 'color': '#AF7AC5'},
-            {'name': 'Gift', 'type': 'income', 'icon': '🎁', 'color': '#F1948A'},
-            {'name': 'Other Income', 'type': 'income', 'icon': '💡', 'color': '#82E0AA'},
-        ]
-
         # Determine which users to process
         if options['user_id']:
-            try:
-                users = [User.objects.get(id=options['user_id'])]
-                self.stdout.write(f"Processing user ID: {options['user_id']}")
-            except User.DoesNotExist:
+            if not User.objects.filter(id=options['user_id']).exists():
                 self.stdout.write(
                     self.style.ERROR(f"User with ID {options['user_id']} does not exist")
                 )
                 return
+            self.stdout.write(f"Processing user ID: {options['user_id']}")
+            users = User.objects.filter(id=options['user_id'])
         else:
             users = User.objects.all()
-            self.stdout.write(f"Processing all {users.count()} users")
+            self.stdout.write("Processing all users")
 
-        # Create categories for each user
-        created_count = 0
-        for user in users:
-            self.stdout.write(f"Creating categories for user: {user.username}")
-            
-            for category_data in default_categories:
-                category, created = Category.objects.get_or_create(
-                    user=user,
-                    name=category_data['name'],
-                    type=category_data['type'],
-                    defaults={
-                        'icon': category_data['icon'],
-                        'color': category_data['color'],
-                        'description': f"Default {category_data['type']} category",
-                    }
-                )
-                
-                if created:
-                    created_count += 1
-                    self.stdout.write(
-                        f"  ✓ Created: {category.name} ({category.type})"
-                    )
-                else:
-                    self.stdout.write(
-                        f"  - Exists: {category.name} ({category.type})"
-                    )
+        categories_before = Category.objects.count()
+        started = time.monotonic()
+        chunk_size = options['chunk_size']
+        processed = 0
+        chunks = 0
+        last_id = 0
 
+        # Walk users by primary key so each chunk is an index range scan
+        while True:
+            user_ids = list(
+                users.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)[:chunk_size]
+            )
+            if not user_ids:
+                break
+            with transaction.atomic():
+                provision_default_categories(user_ids)
+            processed += len(user_ids)
+            last_id = user_ids[-1]
+            chunks += 1
+            if chunks % 100 == 0:
+                elapsed = max(time.monotonic() - started, 1e-6)
+                self.stdout.write(f"  {processed:,} users ({processed / elapsed:,.0f} users/sec)")
+
+        created_count = Category.objects.count() - categories_before
         self.stdout.write(
-            self.style.SUCCESS(f"Successfully created {created_count} categories")
-        ) 
\ No newline at end of file
+            self.style.SUCCESS(
+                f"Successfully created {created_count} categories "
+                f"({len(DEFAULT_CATEGORIES)} defaults, {processed} users)"
+            )
+        )
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from .models import Category
+from .stats import empty_stats
 
 class CategorySerializer(serializers.ModelSerializer):
     """
@@ -48,6 +49,26 @@ class CategorySerializer(serializers.ModelSerializer):
         validated_data['user'] = self.context['request'].user
         return super().create(validated_data)
 
+class CategoryWithStatsSerializer(CategorySerializer):
+    """
+    Category with its transaction count and totals, read from the
+    `category_stats` context entry
+    """
+    stats = serializers.SerializerMethodField()
+
+    class Meta(CategorySerializer.Meta):
+        fields = CategorySerializer.Meta.fields + ['stats']
+
+    def get_stats(self, obj):
+        stats = self.context['category_stats'].get(obj.id)
+        if stats is None:
+            stats = empty_stats(self.context['request'].user)
+        return {
+            **stats,
+            'month_to_date_total': float(stats['month_to_date_total']),
+            'lifetime_total': float(stats['lifetime_total']),
+        }
+
 class CategoryCreateSerializer(serializers.ModelSerializer):
     """
     Serializer for creating categories
@@ -0,0 +1,27 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from apps.authentication.models import UserProfile
+from apps.transactions.models import Transaction
+from .stats import invalidate_category_stats
+
+@receiver(post_save, sender=Transaction)
+@receiver(post_delete, sender=Transaction)
+def transaction_changed(sender, instance, **kwargs):
+    """
+    Drop cached category stats of the transaction's owner
+    """
+    invalidate_category_stats(instance.user_id)
+    old_user_id = instance.get_loaded_value('user_id')
+    if old_user_id is not None and old_user_id != instance.user_id:
+        invalidate_category_stats(old_user_id)
+
+@receiver(post_save, sender=UserProfile)
+def profile_currency_changed(sender, instance, created, **kwargs):
+    """
+    Drop cached category stats once their totals are in the wrong currency
+    """
+    if not created and 'currency' in instance.get_changed_fields():
+        invalidate_category_stats(instance.user_id)
+
+# apps/categories/signals.py
@@ -0,0 +1,103 @@
+"""
+Per-category usage statistics for the category list.
+
+One grouped query over the user's transactions yields every category's
+transaction count, month-to-date and lifetime totals. Totals are in the
+user's currency; transactions in other currencies are converted in a
+second pass only when the user has any. The result is cached per user
+and month and dropped whenever one of the user's transactions or their
+currency changes.
+"""
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import models, transaction
+from django.db.models import Case, Count, Q, Sum, Value, When
+from django.utils import timezone
+
+from apps.currencies.conversion import converted_sums, user_currency
+from apps.transactions.models import Transaction
+
+CACHE_TIMEOUT = getattr(settings, 'CATEGORY_STATS_CACHE_TIMEOUT', 60 * 60)
+
+def _cache_key(user_id, month_start):
+    return f'categories:stats:{user_id}:{month_start:%Y-%m}'
+
+def _compute(user, month_start):
+    target = user_currency(user)
+    queryset = Transaction.objects.filter(user=user)
+    rows = (
+        queryset.order_by()
+        .values('category_id', 'currency')
+        .annotate(
+            transaction_count=Count('id'),
+            lifetime_total=Sum('amount'),
+            month_to_date_total=Sum('amount', filter=Q(date__gte=month_start)),
+        )
+    )
+
+    stats = {}
+    foreign = False
+    for row in rows:
+        entry = stats.setdefault(row['category_id'], {
+            'transaction_count': 0,
+            'month_to_date_total': Decimal('0'),
+            'lifetime_total': Decimal('0'),
+            'currency': target,
+            'unconverted_currencies': [],
+        })
+        entry['transaction_count'] += row['transaction_count']
+        if row['currency'] == target:
+            entry['lifetime_total'] += row['lifetime_total']
+            entry['month_to_date_total'] += row['month_to_date_total'] or Decimal('0')
+        else:
+            foreign = True
+
+    if foreign:
+        sums, missing = converted_sums(
+            queryset.exclude(currency=target).annotate(
+                month_to_date=Case(
+                    When(date__gte=month_start, then=Value(True)),
+                    default=Value(False),
+                    output_field=models.BooleanField(),
+                )
+            ),
+            target,
+            ['category_id', 'month_to_date'],
+        )
+        for (category_id, month_to_date), total in sums.items():
+            stats[category_id]['lifetime_total'] += total
+            if month_to_date:
+                stats[category_id]['month_to_date_total'] += total
+        for entry in stats.values():
+            entry['unconverted_currencies'] = sorted(missing)
+
+    return stats
+
+def category_stats(user):
+    """{category id: usage stats} for every category the user has transactions in"""
+    month_start = timezone.localdate().replace(day=1)
+    key = _cache_key(user.pk, month_start)
+    stats = cache.get(key)
+    if stats is None:
+        stats = _compute(user, month_start)
+        cache.set(key, stats, CACHE_TIMEOUT)
+    return stats
+
+def empty_stats(user):
+    """Stats for a category without transactions"""
+    return {
+        'transaction_count': 0,
+        'month_to_date_total': Decimal('0'),
+        'lifetime_total': Decimal('0'),
+        'currency': user_currency(user),
+        'unconverted_currencies': [],
+    }
+
+def invalidate_category_stats(user_id):
+    """Drop a user's cached stats once the current transaction commits"""
+    key = _cache_key(user_id, timezone.localdate().replace(day=1))
+    transaction.on_commit(lambda: cache.delete(key))
+
+# apps/categories/stats.py
@@ -6,7 +6,8 @@ from rest_framework.response import Response
 from django.db.models import Q
 
 from .models import Category
-from .serializers import CategorySerializer, CategoryCreateSerializer
+from .serializers import CategorySerializer, CategoryCreateSerializer, CategoryWithStatsSerializer
+from .stats import category_stats
 
 # Category views will be implemented here
 
@@ -17,7 +18,8 @@ def test_category_view(request):
 
 class CategoryListCreateView(generics.ListCreateAPIView):
     """
-    List all categories or create a new category
+    List all categories or create a new category.
+    `?with_stats=true` adds each category's transaction count and totals.
     """
     serializer_class = CategorySerializer
     permission_classes = [IsAuthenticated]
@@ -42,10 +44,21 @@ class CategoryListCreateView(generics.ListCreateAPIView):
         
         return queryset
     
+    def with_stats(self):
+        return self.request.query_params.get('with_stats', '').lower() in ('1', 'true', 'yes')
+    
     def get_serializer_class(self):
         if self.request.method == 'POST':
             return CategoryCreateSerializer
+        if self.with_stats():
+            return CategoryWithStatsSerializer
         return CategorySerializer
+    
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.request.method == 'GET' and self.with_stats():
+            context['category_stats'] = category_stats(self.request.user)
+        return context
 
 class CategoryDetailView(generics.RetrieveUpdateDestroyAPIView):
     """
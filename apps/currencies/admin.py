@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Currency
+from .models import Currency, ExchangeRate
 
 @admin.register(Currency)
 class CurrencyAdmin(admin.ModelAdmin):
@@ -17,4 +17,14 @@ class CurrencyAdmin(admin.ModelAdmin):
             'fields': ('created_at', 'updated_at'),
             'classes': ('collapse',)
         }),
-    ) 
\ No newline at end of file
+    )
+
+
+@admin.register(ExchangeRate)
+class ExchangeRateAdmin(admin.ModelAdmin):
+    list_display = ['base', 'quote', 'date', 'rate', 'updated_at']
+    list_filter = ['base', 'quote']
+    search_fields = ['base', 'quote']
+    date_hierarchy = 'date'
+    readonly_fields = ['created_at', 'updated_at']
+    show_full_result_count = False
@@ -3,4 +3,10 @@ from django.apps import AppConfig
 class CurrenciesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.currencies'
-    verbose_name = 'Currencies' 
\ No newline at end of file
+    verbose_name = 'Currencies'
+
+    def ready(self):
+        """
+        Import signal handlers when the app is ready
+        """
+        import apps.currencies.signals
@@ -0,0 +1,62 @@
+"""
+Currency conversion for aggregate queries over transactions.
+
+Amounts already in the target currency are summed in SQL as usual. Other
+currencies are summed per (group, currency, date) in the same way, and
+the rates for each currency's dates come from one vectorized lookup in
+the cached rate table, so the cost is one lookup per distinct day and
+currency, never one per transaction. Sums stay in Decimal throughout and
+are rounded to cents once, at the end.
+"""
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db.models import Sum
+
+from .rates import get_rate_table
+
+DEFAULT_CURRENCY = 'USD'
+CENTS = Decimal('0.01')
+
+def user_currency(user):
+    """The currency a user's summaries are reported in"""
+    profile = getattr(user, 'profile', None)
+    return profile.currency.upper() if profile and profile.currency else DEFAULT_CURRENCY
+
+def converted_sums(queryset, target, keys=()):
+    """
+    Sum `amount` over a transaction queryset in `target` currency, grouped
+    by the `keys` values (annotate computed keys first).
+    Returns ({key tuple: Decimal}, set of currencies without a rate).
+    """
+    keys = list(keys)
+    queryset = queryset.order_by()
+    totals = defaultdict(Decimal)
+
+    for row in queryset.filter(currency=target).values(*keys).annotate(total=Sum('amount')).values_list(*keys, 'total'):
+        totals[row[:-1]] += row[-1]
+
+    missing = set()
+    by_currency = defaultdict(list)
+    for row in (
+        queryset.exclude(currency=target)
+        .values(*keys, 'currency', 'date')
+        .annotate(total=Sum('amount'))
+        .values_list(*keys, 'currency', 'date', 'total')
+    ):
+        by_currency[row[-3]].append(row)
+    if by_currency:
+        table = get_rate_table()
+        for currency, rows in by_currency.items():
+            rates = table.rates(currency, target, [row[-2] for row in rows])
+            if rates is None:
+                # Left out of the totals and reported
+                missing.add(currency)
+                continue
+            for row, rate in zip(rows, rates.tolist()):
+                # repr() gives back the stored rate's digits rather than the float's binary expansion
+                totals[row[:-3]] += row[-1] * Decimal(repr(rate))
+
+    return {key: total.quantize(CENTS) for key, total in totals.items()}, missing
+
+# apps/currencies/conversion.py
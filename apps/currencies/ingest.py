@@ -0,0 +1,151 @@
+"""
+Streaming import of currency and FX rate files.
+
+Readers yield one record at a time, so a file is never loaded whole:
+
+* CSV with a header row (``base,quote,date,rate`` or ``code,name,symbol``)
+* JSON Lines, one object per line
+* JSON arrays of objects, optionally wrapped in a single-key object as in
+  the table dumps under ``SQL/`` (``{"currencies_currency": [...]}``),
+  decoded object by object from a fixed-size read buffer
+
+Records are upserted in batches with one INSERT ... ON CONFLICT DO UPDATE
+per batch.
+"""
+import csv
+import datetime
+import json
+from decimal import Decimal, InvalidOperation
+from pathlib import Path
+
+from django.db import transaction
+
+from .models import Currency, ExchangeRate, normalize_currency_code
+
+READ_CHUNK_SIZE = 1024 * 1024
+
+def _iter_json_array(handle):
+    """Yield the objects of the first JSON array in the stream"""
+    decoder = json.JSONDecoder()
+    buffer = ''
+    position = 0
+    started = False
+    eof = False
+
+    while True:
+        # Skip separators; refill the buffer when it runs dry
+        while True:
+            while position < len(buffer) and buffer[position] in ' \t\r\n,':
+                position += 1
+            if position < len(buffer) or eof:
+                break
+            chunk = handle.read(READ_CHUNK_SIZE)
+            eof = not chunk
+            buffer, position = buffer[position:] + chunk, 0
+
+        if position >= len(buffer):
+            return
+        if not started:
+            bracket = buffer.find('[', position)
+            if bracket == -1:
+                buffer, position = '', 0
+                if eof:
+                    return
+                continue
+            started, position = True, bracket + 1
+            continue
+        if buffer[position] == ']':
+            return
+
+        try:
+            record, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            # The object continues past the buffer; read more and retry
+            chunk = handle.read(READ_CHUNK_SIZE)
+            eof = not chunk
+            buffer, position = buffer[position:] + chunk, 0
+            continue
+        position = end
+        yield record
+
+def iter_records(path):
+    """Yield dict records from a CSV, JSON Lines or JSON file"""
+    path = Path(path)
+    # utf-8-sig strips the byte order mark the SQL dumps start with
+    with path.open(encoding='utf-8-sig', newline='') as handle:
+        if path.suffix.lower() == '.csv':
+            yield from csv.DictReader(handle)
+        elif path.suffix.lower() in ('.jsonl', '.ndjson'):
+            for line in handle:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from _iter_json_array(handle)
+
+def detect_kind(record):
+    """'rates' or 'currencies', from the fields of a record"""
+    if {'base', 'quote', 'rate'} <= set(record):
+        return 'rates'
+    if 'code' in record:
+        return 'currencies'
+    raise ValueError(f"Unrecognized record fields: {', '.join(sorted(record))}")
+
+def parse_rate(record):
+    """Validated (base, quote, date, rate) from a rate record"""
+    base = normalize_currency_code(record['base'])
+    quote = normalize_currency_code(record['quote'])
+    date = record['date']
+    if not isinstance(date, datetime.date):
+        date = datetime.date.fromisoformat(str(date).strip()[:10])
+    try:
+        rate = Decimal(str(record['rate']).strip())
+    except InvalidOperation:
+        raise ValueError(f"Invalid rate {record['rate']!r}")
+    if not rate.is_finite() or rate <= 0:
+        raise ValueError(f'Rate must be positive, got {rate}')
+    return base, quote, date, rate
+
+def upsert_rates(rows):
+    """Insert or update a batch of (base, quote, date, rate) rows"""
+    # A single INSERT ... ON CONFLICT can't touch the same key twice; last one wins
+    latest = {(base, quote, date): rate for base, quote, date, rate in rows}
+    with transaction.atomic():
+        ExchangeRate.objects.bulk_create(
+            [
+                ExchangeRate(base=base, quote=quote, date=date, rate=rate)
+                for (base, quote, date), rate in latest.items()
+            ],
+            update_conflicts=True,
+            unique_fields=['base', 'quote', 'date'],
+            update_fields=['rate', 'updated_at'],
+        )
+    return len(latest)
+
+def parse_currency(record):
+    """Validated Currency field values from a currency record"""
+    code = normalize_currency_code(record['code'])
+    is_active = record.get('is_active', True)
+    if isinstance(is_active, str):
+        is_active = is_active.strip().lower() in ('1', 'true', 't', 'yes')
+    return {
+        'code': code,
+        'name': str(record.get('name') or code).strip(),
+        'symbol': str(record.get('symbol') or code).strip(),
+        'is_active': bool(is_active),
+    }
+
+def upsert_currencies(rows):
+    """Insert or update a batch of currency field dicts, keyed by code"""
+    latest = {row['code']: row for row in rows}
+    with transaction.atomic():
+        Currency.objects.bulk_create(
+            [Currency(**row) for row in latest.values()],
+            update_conflicts=True,
+            unique_fields=['code'],
+            update_fields=['name', 'symbol', 'is_active', 'updated_at'],
+        )
+    return len(latest)
+
+# apps/currencies/ingest.py
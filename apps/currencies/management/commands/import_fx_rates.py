@@ -0,0 +1,103 @@
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from apps.currencies.ingest import (
+    detect_kind, iter_records, parse_currency, parse_rate, upsert_currencies, upsert_rates
+)
+from apps.currencies.rates import invalidate_rates
+
+
+class Command(BaseCommand):
+    help = 'Import exchange rates or currencies from CSV, JSON Lines or JSON files'
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='+', help='Files to import')
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Rows upserted per INSERT statement (default: 5000)',
+        )
+        parser.add_argument(
+            '--strict',
+            action='store_true',
+            help='Abort on the first invalid row instead of skipping it',
+        )
+        parser.add_argument(
+            '--progress-every',
+            type=int,
+            default=100000,
+            help='Report progress every N rows (default: 100000)',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        totals = {'rates': 0, 'currencies': 0}
+        skipped = 0
+        started = time.monotonic()
+
+        for path in options['paths']:
+            if not Path(path).is_file():
+                raise CommandError(f'File not found: {path}')
+            self.stdout.write(f'Importing {path}...')
+            imported, invalid = self.import_file(path, batch_size, options['strict'], options['progress_every'])
+            for kind, count in imported.items():
+                totals[kind] += count
+            skipped += invalid
+
+        if totals['rates']:
+            invalidate_rates()
+
+        elapsed = max(time.monotonic() - started, 1e-6)
+        rows = totals['rates'] + totals['currencies']
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Import completed! Rates: {totals['rates']}, Currencies: {totals['currencies']}, "
+                f'Skipped: {skipped}, {rows / elapsed:,.0f} rows/sec ({elapsed:.1f}s)'
+            )
+        )
+
+    def import_file(self, path, batch_size, strict, progress_every):
+        parsers = {'rates': (parse_rate, upsert_rates), 'currencies': (parse_currency, upsert_currencies)}
+        imported = {'rates': 0, 'currencies': 0}
+        kind = None
+        batch = []
+        invalid = 0
+        seen = 0
+        started = time.monotonic()
+
+        def flush():
+            upsert(batch)
+            imported[kind] += len(batch)
+            batch.clear()
+
+        for line_number, record in enumerate(iter_records(path), start=1):
+            if kind is None:
+                try:
+                    kind = detect_kind(record)
+                except ValueError as e:
+                    raise CommandError(f'{path}: {e}')
+                parse, upsert = parsers[kind]
+            try:
+                batch.append(parse(record))
+            except (KeyError, TypeError, ValueError) as e:
+                if strict:
+                    raise CommandError(f'{path}, record {line_number}: {e}')
+                invalid += 1
+                continue
+
+            if len(batch) >= batch_size:
+                flush()
+            seen += 1
+            if progress_every and seen % progress_every == 0:
+                elapsed = max(time.monotonic() - started, 1e-6)
+                self.stdout.write(f'  {seen:,} rows ({seen / elapsed:,.0f} rows/sec)')
+
+        if batch:
+            flush()
+        if invalid:
+            self.stdout.write(self.style.WARNING(f'  Skipped {invalid} invalid rows in {path}'))
+        return imported, invalid
+
+# apps/currencies/management/commands/import_fx_rates.py
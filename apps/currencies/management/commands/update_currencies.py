@@ -1,5 +1,6 @@
 from django.core.management.base import BaseCommand
-from apps.currencies.models import Currency
+from apps.currencies.ingest import upsert_currencies
+from apps.currencies.models import Currency, DEFAULT_CURRENCIES
 
 
 class Command(BaseCommand):
@@ -7,47 +8,21 @@ class Command(BaseCommand):
 
     def handle(self, *args, **options):
         self.stdout.write('Updating currency data...')
-        
-        # Update existing currencies with correct data
-        updated_currencies = [
-            {'code': 'USD', 'name': 'US Dollar', 'symbol': '$'},
-            {'code': 'EUR', 'name': 'Euro', 'symbol': '€'},
-            {'code': 'GBP', 'name': 'British Pound', 'symbol': '£'},
-            {'code': 'JPY', 'name': 'Japanese Yen', 'symbol': '¥'},
-            {'code': 'CAD', 'name': 'Canadian Dollar', 'symbol': 'C$'},
-            {'code': 'AUD', 'name': 'Australian Dollar', 'symbol': 'A$'},
-            {'code': 'CHF', 'name': 'Swiss Franc', 'symbol': 'CHF'},
-            {'code': 'CNY', 'name': 'Chinese Yuan', 'symbol': '¥'},
-            {'code': 'INR', 'name': 'Indian Rupee', 'symbol': '₹'},
-            {'code': 'SGD', 'name': 'Singapore Dollar', 'symbol': 'S$'},
-        ]
-        
-        updated_count = 0
-        created_count = 0
-        
-        for currency_data in updated_currencies:
-            currency, created = Currency.objects.update_or_create(
-                code=currency_data['code'],
-                defaults={
-                    'name': currency_data['name'],
-                    'symbol': currency_data['symbol'],
-                    'is_active': True,
-                }
+
+        codes = [currency_data['code'] for currency_data in DEFAULT_CURRENCIES]
+        existing = set(Currency.objects.filter(code__in=codes).values_list('code', flat=True))
+
+        # One INSERT ... ON CONFLICT DO UPDATE for the whole list
+        upsert_currencies([{**currency_data, 'is_active': True} for currency_data in DEFAULT_CURRENCIES])
+
+        for currency_data in DEFAULT_CURRENCIES:
+            action = 'Updated' if currency_data['code'] in existing else 'Created'
+            self.stdout.write(
+                self.style.SUCCESS(f"{action} currency: {currency_data['code']} - {currency_data['name']}")
             )
-            
-            if created:
-                created_count += 1
-                self.stdout.write(
-                    self.style.SUCCESS(f'Created currency: {currency.code} - {currency.name}')
-                )
-            else:
-                updated_count += 1
-                self.stdout.write(
-                    self.style.SUCCESS(f'Updated currency: {currency.code} - {currency.name}')
-                )
-        
+
         self.stdout.write(
             self.style.SUCCESS(
-                f'Currency update completed! Created: {created_count}, Updated: {updated_count}'
+                f'Currency update completed! Created: {len(codes) - len(existing)}, Updated: {len(existing)}'
             )
-        ) 
\ No newline at end of file
+        )
@@ -0,0 +1,34 @@
+# Generated by Django 5.0.1 on 2026-10-19 08:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('currencies', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExchangeRate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('base', models.CharField(help_text='Currency being converted from (e.g., USD)', max_length=3)),
+                ('quote', models.CharField(help_text='Currency being converted to (e.g., EUR)', max_length=3)),
+                ('date', models.DateField(help_text='Date the rate applies from')),
+                ('rate', models.DecimalField(decimal_places=10, help_text='Units of quote per one unit of base', max_digits=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Exchange Rate',
+                'verbose_name_plural': 'Exchange Rates',
+                'ordering': ['base', 'quote', '-date'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='exchangerate',
+            constraint=models.UniqueConstraint(fields=('base', 'quote', 'date'), name='unique_exchange_rate'),
+        ),
+    ]
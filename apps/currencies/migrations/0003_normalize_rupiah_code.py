@@ -0,0 +1,76 @@
+from django.db import migrations
+from django.db.models import Exists, OuterRef
+
+# The baseline currency data used 'RP' for the Indonesian Rupiah; the code
+# now only accepts ISO 4217 codes
+OLD_CODE = 'RP'
+NEW_CODE = 'IDR'
+
+
+def merge_ledger_summaries(LedgerSummary):
+    """Fold RP summaries into the user's IDR summary, or rename them"""
+    for old in LedgerSummary.objects.filter(currency=OLD_CODE):
+        new = LedgerSummary.objects.filter(user_id=old.user_id, currency=NEW_CODE).first()
+        if new is None:
+            old.currency = NEW_CODE
+            old.save(update_fields=['currency'])
+            continue
+        new.total_income += old.total_income
+        new.total_expenses += old.total_expenses
+        new.income_count += old.income_count
+        new.expense_count += old.expense_count
+        dates = [date for date in (old.first_transaction_date, new.first_transaction_date) if date]
+        new.first_transaction_date = min(dates) if dates else None
+        dates = [date for date in (old.last_transaction_date, new.last_transaction_date) if date]
+        new.last_transaction_date = max(dates) if dates else None
+        new.save()
+        old.delete()
+
+
+def normalize_rupiah(apps, schema_editor):
+    UserProfile = apps.get_model('authentication', 'UserProfile')
+    UserProfile.objects.filter(currency__iexact=OLD_CODE).update(currency=NEW_CODE)
+
+    for model_name in ('Transaction', 'RecurringTransaction'):
+        apps.get_model('transactions', model_name).objects.filter(currency=OLD_CODE).update(currency=NEW_CODE)
+    merge_ledger_summaries(apps.get_model('transactions', 'LedgerSummary'))
+
+    # Profiles keep separate baselines per currency; an RP baseline that
+    # collides with an IDR one is dropped and relearned
+    CategorySpendingProfile = apps.get_model('analytics', 'CategorySpendingProfile')
+    CategorySpendingProfile.objects.filter(currency=OLD_CODE).filter(Exists(
+        CategorySpendingProfile.objects.filter(
+            user_id=OuterRef('user_id'), category_id=OuterRef('category_id'), currency=NEW_CODE
+        )
+    )).delete()
+    CategorySpendingProfile.objects.filter(currency=OLD_CODE).update(currency=NEW_CODE)
+
+    ExchangeRate = apps.get_model('currencies', 'ExchangeRate')
+    for field, other in (('base', 'quote'), ('quote', 'base')):
+        # A rate already stored under IDR for the same pair and day wins
+        ExchangeRate.objects.filter(**{field: OLD_CODE}).filter(Exists(
+            ExchangeRate.objects.filter(**{
+                field: NEW_CODE, other: OuterRef(other), 'date': OuterRef('date'),
+            })
+        )).delete()
+        ExchangeRate.objects.filter(**{field: OLD_CODE}).update(**{field: NEW_CODE})
+
+    Currency = apps.get_model('currencies', 'Currency')
+    if Currency.objects.filter(code=NEW_CODE).exists():
+        Currency.objects.filter(code=OLD_CODE).delete()
+    else:
+        Currency.objects.filter(code=OLD_CODE).update(code=NEW_CODE, symbol='Rp')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('currencies', '0002_exchangerate_exchangerate_unique_exchange_rate'),
+        ('authentication', '0007_alter_userprofile_currency_help_text'),
+        ('transactions', '0004_ledgersummary_currency_recurringtransaction_currency_and_more'),
+        ('analytics', '0002_categoryspendingprofile_currency'),
+    ]
+
+    operations = [
+        migrations.RunPython(normalize_rupiah, migrations.RunPython.noop),
+    ]
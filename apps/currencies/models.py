@@ -1,5 +1,30 @@
 from django.db import models
 
+DEFAULT_CURRENCIES = [
+    {'code': 'USD', 'name': 'US Dollar', 'symbol': '$'},
+    {'code': 'EUR', 'name': 'Euro', 'symbol': '€'},
+    {'code': 'GBP', 'name': 'British Pound', 'symbol': '£'},
+    {'code': 'JPY', 'name': 'Japanese Yen', 'symbol': '¥'},
+    {'code': 'CAD', 'name': 'Canadian Dollar', 'symbol': 'C$'},
+    {'code': 'AUD', 'name': 'Australian Dollar', 'symbol': 'A$'},
+    {'code': 'CHF', 'name': 'Swiss Franc', 'symbol': 'CHF'},
+    {'code': 'CNY', 'name': 'Chinese Yuan', 'symbol': '¥'},
+    {'code': 'INR', 'name': 'Indian Rupee', 'symbol': '₹'},
+    {'code': 'SGD', 'name': 'Singapore Dollar', 'symbol': 'S$'},
+    {'code': 'IDR', 'name': 'Indonesian Rupiah', 'symbol': 'Rp'},
+]
+
+# Non-ISO codes found in older data, mapped to their ISO 4217 code
+CURRENCY_ALIASES = {'RP': 'IDR'}
+
+def normalize_currency_code(value):
+    """Upper-cased ISO 4217 code for `value`; raises ValueError if it isn't one"""
+    code = str(value).strip().upper()
+    code = CURRENCY_ALIASES.get(code, code)
+    if len(code) != 3 or not code.isalpha():
+        raise ValueError(f'Invalid currency code {code!r}')
+    return code
+
 class Currency(models.Model):
     code = models.CharField(max_length=3, unique=True, help_text="Currency code (e.g., USD, EUR)")
     name = models.CharField(max_length=100, help_text="Currency name (e.g., US Dollar)")
@@ -19,24 +44,27 @@ class Currency(models.Model):
     @classmethod
     def get_default_currencies(cls):
         """Create default currencies if they don't exist"""
-        default_currencies = [
-            {'code': 'USD', 'name': 'US Dollar', 'symbol': '$'},
-            {'code': 'EUR', 'name': 'Euro', 'symbol': '€'},
-            {'code': 'GBP', 'name': 'British Pound', 'symbol': '£'},
-            {'code': 'JPY', 'name': 'Japanese Yen', 'symbol': '¥'},
-            {'code': 'CAD', 'name': 'Canadian Dollar', 'symbol': 'C$'},
-            {'code': 'AUD', 'name': 'Australian Dollar', 'symbol': 'A$'},
-            {'code': 'CHF', 'name': 'Swiss Franc', 'symbol': 'CHF'},
-            {'code': 'CNY', 'name': 'Chinese Yuan', 'symbol': '¥'},
-            {'code': 'INR', 'name': 'Indian Rupee', 'symbol': '₹'},
-            {'code': 'SGD', 'name': 'Singapore Dollar', 'symbol': 'S$'},
+        cls.objects.bulk_create(
+            [cls(**currency_data) for currency_data in DEFAULT_CURRENCIES],
+            ignore_conflicts=True,
+        )
+
+
+class ExchangeRate(models.Model):
+    base = models.CharField(max_length=3, help_text="Currency being converted from (e.g., USD)")
+    quote = models.CharField(max_length=3, help_text="Currency being converted to (e.g., EUR)")
+    date = models.DateField(help_text="Date the rate applies from")
+    rate = models.DecimalField(max_digits=20, decimal_places=10, help_text="Units of quote per one unit of base")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Exchange Rate"
+        verbose_name_plural = "Exchange Rates"
+        ordering = ['base', 'quote', '-date']
+        constraints = [
+            models.UniqueConstraint(fields=['base', 'quote', 'date'], name='unique_exchange_rate'),
         ]
-        
-        for currency_data in default_currencies:
-            cls.objects.get_or_create(
-                code=currency_data['code'],
-                defaults={
-                    'name': currency_data['name'],
-                    'symbol': currency_data['symbol'],
-                }
-            ) 
\ No newline at end of file
+
+    def __str__(self):
+        return f"{self.base}/{self.quote} {self.rate} on {self.date}"
@@ -0,0 +1,169 @@
+"""
+In-process FX rate table.
+
+Each process keeps the rates of the currency pairs it has converted so
+far, as per-pair NumPy arrays sorted by date. A conversion that needs a
+pair the process hasn't seen loads every pair it could use (direct,
+inverse and the legs through `FX_BASE_CURRENCY`) with one indexed query,
+so a process never holds, or waits on, the whole `ExchangeRate` table.
+`FX_RATES_FILE` (tests and local setups) is read whole instead.
+
+Writers call `invalidate_rates()`, which bumps a version number in the
+cache; processes compare versions at most every `FX_RATES_CHECK_INTERVAL`
+seconds and then drop their pairs, which reload on next use.
+
+A rate applies from its date until the next one for the same pair. Dates
+before a pair's first rate use that first rate. Pairs without a stored
+rate are derived from the inverse pair or crossed through
+`FX_BASE_CURRENCY`.
+"""
+import csv
+import json
+import time
+import uuid
+from pathlib import Path
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+
+BASE_CURRENCY = getattr(settings, 'FX_BASE_CURRENCY', 'USD')
+CHECK_INTERVAL = getattr(settings, 'FX_RATES_CHECK_INTERVAL', 60)
+VERSION_CACHE_KEY = 'fx:rates:version'
+
+class RateTable:
+    """
+    Dated rates per (base, quote) pair with vectorized lookups. Pairs are
+    fetched through `loader` on first use; without one, `rows` is the
+    complete set of rates.
+    """
+    def __init__(self, rows=(), loader=None):
+        self.pairs = {}
+        self.loader = loader
+        self._add(rows)
+
+    def _add(self, rows):
+        series = {}
+        for base, quote, date, rate in rows:
+            series.setdefault((base, quote), []).append((np.datetime64(date, 'D'), float(rate)))
+        for pair, points in series.items():
+            points.sort()
+            dates, rates = zip(*points)
+            self.pairs[pair] = (np.array(dates, dtype='datetime64[D]'), np.array(rates))
+
+    def _ensure(self, pairs):
+        """Load the pairs not looked up yet; pairs without rates are remembered as None"""
+        missing = [pair for pair in pairs if pair not in self.pairs]
+        if not missing:
+            return
+        if self.loader is not None:
+            self._add(self.loader(missing))
+        for pair in missing:
+            self.pairs.setdefault(pair, None)
+
+    def _lookup(self, base, quote, dates):
+        points = self.pairs.get((base, quote))
+        if points is None:
+            return None
+        pair_dates, pair_rates = points
+        index = np.searchsorted(pair_dates, dates, side='right') - 1
+        return pair_rates[np.clip(index, 0, None)]
+
+    def rates(self, source, target, dates):
+        """
+        Rates converting `source` into `target` on each of `dates`, or None
+        if the pair can't be derived
+        """
+        dates = np.asarray(dates, dtype='datetime64[D]')
+        if source == target:
+            return np.ones(dates.shape)
+        pairs = [(source, target), (target, source)]
+        if BASE_CURRENCY not in (source, target):
+            pairs += [(source, BASE_CURRENCY), (BASE_CURRENCY, source), (BASE_CURRENCY, target), (target, BASE_CURRENCY)]
+        self._ensure(pairs)
+        direct = self._lookup(source, target, dates)
+        if direct is not None:
+            return direct
+        inverse = self._lookup(target, source, dates)
+        if inverse is not None:
+            return 1 / inverse
+        if BASE_CURRENCY not in (source, target):
+            to_base = self.rates(source, BASE_CURRENCY, dates)
+            from_base = self.rates(BASE_CURRENCY, target, dates)
+            if to_base is not None and from_base is not None:
+                return to_base * from_base
+        return None
+
+    def convert(self, amounts, currencies, dates, target):
+        """
+        Convert parallel arrays of amounts into `target`. Returns the
+        converted amounts (NaN where no rate exists) and the set of
+        currencies that could not be converted.
+        """
+        amounts = np.asarray(amounts, dtype=float)
+        currencies = np.asarray(currencies)
+        dates = np.asarray(dates, dtype='datetime64[D]')
+        converted = np.full(amounts.shape, np.nan)
+        missing = set()
+        # One vectorized lookup per distinct currency
+        for currency in np.unique(currencies):
+            mask = currencies == currency
+            rates = self.rates(str(currency), target, dates[mask])
+            if rates is None:
+                missing.add(str(currency))
+                continue
+            converted[mask] = amounts[mask] * rates
+        return converted, missing
+
+def _read_file(path):
+    """Yield (base, quote, date, rate) rows from a CSV or JSON rates file"""
+    path = Path(path)
+    with path.open(encoding='utf-8-sig') as handle:
+        if path.suffix == '.json':
+            data = json.load(handle)
+            records = data.get('exchange_rates', []) if isinstance(data, dict) else data
+        else:
+            records = csv.DictReader(handle)
+        for record in records:
+            yield record['base'].upper(), record['quote'].upper(), record['date'], record['rate']
+
+def _load_pairs(pairs):
+    """(base, quote, date, rate) rows of the given pairs, served by the unique (base, quote, date) index"""
+    from .models import ExchangeRate
+    lookup = Q()
+    for base, quote in pairs:
+        lookup |= Q(base=base, quote=quote)
+    return ExchangeRate.objects.filter(lookup).values_list('base', 'quote', 'date', 'rate').order_by()
+
+def _load():
+    rates_file = getattr(settings, 'FX_RATES_FILE', None)
+    if rates_file:
+        return RateTable(_read_file(rates_file))
+    return RateTable(loader=_load_pairs)
+
+_table = None
+_version = None
+_checked_at = 0.0
+
+def get_rate_table():
+    """The process-wide rate table, reloaded when another process changed rates"""
+    global _table, _version, _checked_at
+    now = time.monotonic()
+    if _table is not None and now - _checked_at < CHECK_INTERVAL:
+        return _table
+
+    version = cache.get(VERSION_CACHE_KEY)
+    if _table is None or version != _version:
+        _table = _load()
+        _version = version
+    _checked_at = now
+    return _table
+
+def invalidate_rates():
+    """Make every process reload the pairs it uses on its next lookup"""
+    global _table
+    cache.set(VERSION_CACHE_KEY, uuid.uuid4().hex, None)
+    _table = None
+
+# apps/currencies/rates.py
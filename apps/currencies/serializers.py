@@ -1,5 +1,14 @@
 from rest_framework import serializers
-from .models import Currency
+from .models import Currency, normalize_currency_code
+
+def validate_currency_code(value):
+    """
+    Normalize a currency code to its upper-case ISO 4217 form
+    """
+    try:
+        return normalize_currency_code(value)
+    except ValueError:
+        raise serializers.ValidationError("Currency must be a 3-letter code (e.g., USD).")
 
 class CurrencySerializer(serializers.ModelSerializer):
     class Meta:
@@ -0,0 +1,16 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import ExchangeRate
+from .rates import invalidate_rates
+
+@receiver(post_save, sender=ExchangeRate)
+@receiver(post_delete, sender=ExchangeRate)
+def exchange_rate_changed(sender, **kwargs):
+    """
+    Reload cached rate tables once the change is committed
+    """
+    transaction.on_commit(invalidate_rates)
+
+# apps/currencies/signals.py
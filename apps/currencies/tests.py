@@ -0,0 +1,123 @@
+import datetime
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+
+from apps.categories.models import Category
+from apps.transactions.models import Transaction
+from . import rates
+from .conversion import converted_sums
+from .models import ExchangeRate
+from .rates import RateTable
+
+class RateTableTests(TestCase):
+    """
+    Rate lookups on an in-memory table
+    """
+
+    def setUp(self):
+        self.table = RateTable([
+            ('USD', 'EUR', '2024-01-01', '0.9'),
+            ('USD', 'EUR', '2024-02-01', '0.8'),
+            ('GBP', 'USD', '2024-01-01', '1.25'),
+        ])
+
+    def lookup(self, source, target, *dates):
+        result = self.table.rates(source, target, list(dates))
+        return None if result is None else [round(rate, 6) for rate in result.tolist()]
+
+    def test_rate_applies_until_the_next_one(self):
+        self.assertEqual(
+            self.lookup('USD', 'EUR', '2024-01-01', '2024-01-31', '2024-02-01', '2024-06-01'),
+            [0.9, 0.9, 0.8, 0.8],
+        )
+
+    def test_dates_before_the_first_rate_use_it(self):
+        self.assertEqual(self.lookup('USD', 'EUR', '2023-06-01'), [0.9])
+
+    def test_inverse_and_cross_rates(self):
+        self.assertEqual(self.lookup('EUR', 'USD', '2024-02-10'), [1.25])
+        # GBP -> USD -> EUR
+        self.assertEqual(self.lookup('GBP', 'EUR', '2024-01-10', '2024-02-10'), [1.125, 1.0])
+
+    def test_same_currency_and_unknown_pairs(self):
+        self.assertEqual(self.lookup('EUR', 'EUR', '2024-01-01'), [1.0])
+        self.assertIsNone(self.lookup('JPY', 'EUR', '2024-01-01'))
+
+@override_settings(FX_RATES_FILE=None)
+class ConversionTests(TestCase):
+    """
+    Converted sums over transactions, with rates loaded from the database
+    """
+
+    def setUp(self):
+        ExchangeRate.objects.bulk_create([
+            ExchangeRate(base='USD', quote='EUR', date=datetime.date(2024, 1, 1), rate=Decimal('0.9')),
+            ExchangeRate(base='USD', quote='EUR', date=datetime.date(2024, 2, 1), rate=Decimal('0.8')),
+            ExchangeRate(base='USD', quote='JPY', date=datetime.date(2024, 1, 1), rate=Decimal('150')),
+            ExchangeRate(base='CHF', quote='SEK', date=datetime.date(2024, 1, 1), rate=Decimal('12')),
+        ])
+        # Rates written by bulk_create don't fire the invalidation signal
+        rates.invalidate_rates()
+        self.user = User.objects.create_user('alice', 'alice@example.com', 'password')
+        self.food = Category.objects.create(name='Test food', type='expense', user=self.user)
+        self.salary = Category.objects.create(name='Test salary', type='income', user=self.user)
+
+    def add(self, amount, currency, date, type='expense'):
+        Transaction.objects.create(
+            user=self.user, category=self.salary if type == 'income' else self.food, title='Test',
+            amount=Decimal(amount), currency=currency, type=type, date=date,
+        )
+
+    def test_converted_sums(self):
+        self.add('10.00', 'USD', datetime.date(2024, 1, 5))
+        self.add('9.00', 'EUR', datetime.date(2024, 1, 5))
+        self.add('8.00', 'EUR', datetime.date(2024, 2, 5))
+        self.add('1500', 'JPY', datetime.date(2024, 1, 5), type='income')
+
+        sums, missing = converted_sums(Transaction.objects.filter(user=self.user), 'USD', ['type'])
+
+        self.assertEqual(sums, {('expense',): Decimal('30.00'), ('income',): Decimal('10.00')})
+        self.assertEqual(missing, set())
+
+    def test_sums_stay_exact_in_decimal(self):
+        for _ in range(3):
+            self.add('0.10', 'EUR', datetime.date(2024, 2, 5))
+
+        sums, _ = converted_sums(Transaction.objects.filter(user=self.user), 'EUR')
+
+        self.assertEqual(sums, {(): Decimal('0.30')})
+
+    def test_currencies_without_rates_are_reported(self):
+        self.add('10.00', 'USD', datetime.date(2024, 1, 5))
+        self.add('5.00', 'SEK', datetime.date(2024, 1, 5))
+
+        sums, missing = converted_sums(Transaction.objects.filter(user=self.user), 'USD')
+
+        self.assertEqual(sums, {(): Decimal('10.00')})
+        self.assertEqual(missing, {'SEK'})
+
+    def test_only_the_needed_pairs_are_loaded(self):
+        table = rates.get_rate_table()
+
+        with self.assertNumQueries(1):
+            table.rates('EUR', 'USD', ['2024-01-05'])
+        with self.assertNumQueries(0):
+            table.rates('USD', 'EUR', ['2024-03-05'])
+
+        self.assertEqual(
+            {pair for pair, points in table.pairs.items() if points is not None}, {('USD', 'EUR')}
+        )
+
+    def test_invalidation_reloads_changed_rates(self):
+        self.add('9.00', 'EUR', datetime.date(2024, 3, 5))
+        queryset = Transaction.objects.filter(user=self.user)
+        self.assertEqual(converted_sums(queryset, 'USD')[0], {(): Decimal('11.25')})
+
+        ExchangeRate.objects.create(base='USD', quote='EUR', date=datetime.date(2024, 3, 1), rate=Decimal('0.75'))
+        rates.invalidate_rates()
+
+        self.assertEqual(converted_sums(queryset, 'USD')[0], {(): Decimal('12.00')})
+
+# apps/currencies/tests.py
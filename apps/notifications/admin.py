@@ -1,7 +1,9 @@
 from django.contrib import admin
 from django.utils.html import format_html
 from django.utils import timezone
-from .models import Notification, NotificationPreference
+from utils.db import chunked_update
+from utils.pagination import EstimatedCountPaginator
+from .models import Notification, NotificationPreference, PushDevice, PushOutbox
 
 @admin.register(Notification)
 class NotificationAdmin(admin.ModelAdmin):
@@ -18,6 +20,12 @@ class NotificationAdmin(admin.ModelAdmin):
     search_fields = ['title', 'message', 'user__username', 'user__email']
     readonly_fields = ['created_at', 'updated_at', 'read_at', 'time_since_created', 'is_expired']
     ordering = ['-created_at']
+    list_select_related = ['user']
+    raw_id_fields = ['user']
+    
+    # Avoid exact COUNT(*) scans on the changelist
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     
     fieldsets = (
         ('Basic Information', {
@@ -67,47 +75,28 @@ class NotificationAdmin(admin.ModelAdmin):
     
     actions = ['mark_as_read', 'mark_as_unread', 'archive_notifications', 'unarchive_notifications']
     
+    # Actions run as chunked set-based UPDATEs rather than one save() per row
     def mark_as_read(self, request, queryset):
         """Mark selected notifications as read"""
-        updated = 0
-        for notification in queryset:
-            if not notification.is_read:
-                notification.mark_as_read()
-                updated += 1
-        
+        updated = chunked_update(queryset.filter(is_read=False), is_read=True, read_at=timezone.now())
         self.message_user(request, f'{updated} notifications marked as read.')
     mark_as_read.short_description = "Mark selected notifications as read"
     
     def mark_as_unread(self, request, queryset):
         """Mark selected notifications as unread"""
-        updated = 0
-        for notification in queryset:
-            if notification.is_read:
-                notification.mark_as_unread()
-                updated += 1
-        
+        updated = chunked_update(queryset.filter(is_read=True), is_read=False, read_at=None)
         self.message_user(request, f'{updated} notifications marked as unread.')
     mark_as_unread.short_description = "Mark selected notifications as unread"
     
     def archive_notifications(self, request, queryset):
         """Archive selected notifications"""
-        updated = 0
-        for notification in queryset:
-            if not notification.is_archived:
-                notification.archive()
-                updated += 1
-        
+        updated = chunked_update(queryset.filter(is_archived=False), is_archived=True)
         self.message_user(request, f'{updated} notifications archived.')
     archive_notifications.short_description = "Archive selected notifications"
     
     def unarchive_notifications(self, request, queryset):
         """Unarchive selected notifications"""
-        updated = 0
-        for notification in queryset:
-            if notification.is_archived:
-                notification.unarchive()
-                updated += 1
-        
+        updated = chunked_update(queryset.filter(is_archived=True), is_archived=False)
         self.message_user(request, f'{updated} notifications unarchived.')
     unarchive_notifications.short_description = "Unarchive selected notifications"
 
@@ -149,7 +138,7 @@ class NotificationPreferenceAdmin(admin.ModelAdmin):
             )
         }),
         ('Timing Settings', {
-            'fields': ('quiet_hours_enabled', 'quiet_hours_start', 'quiet_hours_end')
+            'fields': ('quiet_hours_enabled', 'quiet_hours_start', 'quiet_hours_end', 'time_zone')
         }),
         ('Timestamps', {
             'fields': ('created_at', 'updated_at'),
@@ -157,6 +146,28 @@ class NotificationPreferenceAdmin(admin.ModelAdmin):
         }),
     )
 
+@admin.register(PushDevice)
+class PushDeviceAdmin(admin.ModelAdmin):
+    """
+    Admin interface for PushDevice model
+    """
+    list_display = ['user', 'platform', 'is_active', 'created_at', 'last_seen_at']
+    list_filter = ['platform', 'is_active']
+    search_fields = ['user__username', 'user__email', 'token']
+    readonly_fields = ['created_at', 'last_seen_at']
+    list_select_related = ['user']
+
+@admin.register(PushOutbox)
+class PushOutboxAdmin(admin.ModelAdmin):
+    """
+    Admin interface for the push outbox
+    """
+    list_display = ['notification', 'status', 'attempts', 'created_at', 'sent_at']
+    list_filter = ['status']
+    readonly_fields = ['created_at', 'claimed_at', 'sent_at']
+    raw_id_fields = ['notification']
+    list_select_related = ['notification__user']
+
 # Custom admin site configurations
 admin.site.site_header = "Expense Tracker Notifications"
 admin.site.site_title = "Notifications Admin"
@@ -14,3 +14,19 @@ class NotificationsConfig(AppConfig):
             import apps.notifications.signals
         except ImportError:
             pass
+        
+        from apps.outbox.events import register_handler
+        from . import tasks
+        
+        # Side effects of writes, dispatched through the outbox
+        register_handler('transaction.created', tasks.notify_transactions_created)
+        register_handler('transaction.deleted', tasks.notify_transactions_deleted)
+        register_handler('user.created', tasks.send_welcome_notifications)
+        register_handler('profile.budget_changed', tasks.check_budgets)
+        register_handler('notification.created', tasks.deliver_notifications)
+        
+        # Out-of-app delivery channels
+        from .delivery import register_channel
+        register_channel('email', tasks.send_email_notifications.delay)
+        register_channel('push', tasks.queue_push_notifications)
+
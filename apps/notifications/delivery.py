@@ -0,0 +1,168 @@
+"""
+Out-of-app delivery of notifications (email, push).
+
+In-app notifications are the `Notification` rows themselves. When one is
+created, the enabled email/push channels are either dispatched right away
+or, during the user's quiet hours, held as `ScheduledDelivery` rows that a
+periodic task releases in batches once the window ends.
+
+Channels plug in through `register_channel`; a handler receives a list of
+notification ids and is expected to hand them to a worker.
+"""
+import logging
+from collections import Counter, defaultdict
+from functools import partial
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from utils.metrics import NOTIFICATION_DELIVERIES, NOTIFICATIONS_CREATED
+from .models import Notification, NotificationPreference, ScheduledDelivery
+
+logger = logging.getLogger(__name__)
+
+DELIVERY_CHANNELS = ('email', 'push')
+
+# Urgent notifications are never held back by quiet hours
+QUIET_HOURS_BYPASS_PRIORITIES = ('urgent',)
+
+RELEASE_BATCH_SIZE = 1000
+
+_channel_handlers = {}
+
+def register_channel(channel, handler):
+    """Register the handler that delivers notification ids over `channel`"""
+    _channel_handlers[channel] = handler
+
+def dispatch(channel, notification_ids):
+    """Hand notification ids to the handler registered for `channel`"""
+    handler = _channel_handlers.get(channel)
+    if handler is None:
+        logger.debug('No handler registered for %s deliveries, dropping %d', channel, len(notification_ids))
+        return
+    handler(list(notification_ids))
+
+def queue_deliveries(notifications, prefs_by_user=None, now=None):
+    """
+    Dispatch the enabled email/push deliveries for new notifications, or
+    hold them until each user's quiet hours end. Held deliveries are
+    inserted with one query and immediate ones are handed to each channel
+    as a single batch once the transaction commits.
+    """
+    if prefs_by_user is None:
+        user_ids = {notification.user_id for notification in notifications}
+        prefs_by_user = {
+            prefs.user_id: prefs
+            for prefs in NotificationPreference.objects.filter(user_id__in=user_ids)
+        }
+    now = now or timezone.now()
+
+    held = []
+    immediate = defaultdict(list)
+    for notification in notifications:
+        prefs = prefs_by_user.get(notification.user_id)
+        if prefs is None:
+            continue
+
+        channels = [
+            channel for channel in DELIVERY_CHANNELS
+            if prefs.channel_enabled(channel, notification.type)
+        ]
+        if not channels:
+            continue
+
+        release_at = None
+        if notification.priority not in QUIET_HOURS_BYPASS_PRIORITIES:
+            release_at = prefs.quiet_hours_end_after(now)
+
+        for channel in channels:
+            if release_at:
+                held.append(ScheduledDelivery(
+                    notification=notification, channel=channel, release_at=release_at
+                ))
+            else:
+                immediate[channel].append(notification.pk)
+
+    if held:
+        ScheduledDelivery.objects.bulk_create(held, ignore_conflicts=True)
+        for channel, count in Counter(delivery.channel for delivery in held).items():
+            NOTIFICATION_DELIVERIES.labels(channel, 'held').inc(count)
+    for channel, notification_ids in immediate.items():
+        NOTIFICATION_DELIVERIES.labels(channel, 'immediate').inc(len(notification_ids))
+        transaction.on_commit(partial(dispatch, channel, notification_ids))
+
+def _without_duplicates(notifications):
+    """Drop notifications whose dedupe key is repeated or already stored"""
+    keys = {notification.dedupe_key for notification in notifications if notification.dedupe_key}
+    existing = set(
+        Notification.objects.filter(dedupe_key__in=keys).values_list('dedupe_key', flat=True)
+    ) if keys else set()
+    unique = []
+    for notification in notifications:
+        if notification.dedupe_key:
+            if notification.dedupe_key in existing:
+                continue
+            existing.add(notification.dedupe_key)
+        unique.append(notification)
+    return unique
+
+def create_notifications(notifications, prefs_by_user):
+    """
+    Insert notifications with a single query and queue their out-of-app
+    deliveries. `bulk_create` skips post_save, so the fan-out normally done
+    for new notifications happens here, reusing the preferences the caller
+    already loaded.
+
+    Notifications whose `dedupe_key` is already stored are skipped, so
+    handlers can safely see an outbox event again.
+    """
+    try:
+        with transaction.atomic():
+            created = Notification.objects.bulk_create(_without_duplicates(notifications))
+    except IntegrityError:
+        # A concurrent run of the same events committed first; its rows are visible now
+        created = Notification.objects.bulk_create(_without_duplicates(notifications))
+    for notification_type, count in Counter(notification.type for notification in created).items():
+        NOTIFICATIONS_CREATED.labels(notification_type).inc(count)
+    queue_deliveries(created, prefs_by_user)
+    return created
+
+def release_due_deliveries(now=None, batch_size=RELEASE_BATCH_SIZE):
+    """
+    Release every held delivery whose quiet hours have ended.
+
+    Works through the `release_at` index in batches; rows are locked with
+    SKIP LOCKED so concurrent workers split the backlog instead of
+    delivering the same notification twice.
+    """
+    now = now or timezone.now()
+    released = 0
+
+    while True:
+        with transaction.atomic():
+            batch = list(
+                ScheduledDelivery.objects
+                .select_for_update(skip_locked=True)
+                .filter(release_at__lte=now)
+                .order_by('release_at')
+                .values_list('id', 'channel', 'notification_id')[:batch_size]
+            )
+            if not batch:
+                break
+
+            ScheduledDelivery.objects.filter(id__in=[row[0] for row in batch]).delete()
+
+            by_channel = defaultdict(list)
+            for _, channel, notification_id in batch:
+                by_channel[channel].append(notification_id)
+            for channel, notification_ids in by_channel.items():
+                NOTIFICATION_DELIVERIES.labels(channel, 'released').inc(len(notification_ids))
+                transaction.on_commit(partial(dispatch, channel, notification_ids))
+
+        released += len(batch)
+        if len(batch) < batch_size:
+            break
+
+    return released
+
+# apps/notifications/delivery.py
@@ -0,0 +1,97 @@
+"""
+Email channel for notifications.
+
+Pending notifications are grouped per user into one digest message, and
+all digests of a worker batch are sent over a single SMTP connection.
+Each notification is stamped with `emailed_at` once its digest is handed
+to the backend, so a retried batch only resends what did not go out.
+"""
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.utils import timezone
+
+from .models import Notification
+
+EMAIL_BATCH_SIZE = getattr(settings, 'NOTIFICATION_EMAIL_BATCH_SIZE', 100)
+EMAIL_MAX_PER_SECOND = getattr(settings, 'NOTIFICATION_EMAIL_MAX_PER_SECOND', None)
+
+def build_digest(user, notifications):
+    """Build a single email summarising a user's pending notifications"""
+    if len(notifications) == 1:
+        subject = notifications[0].title
+    else:
+        subject = f"You have {len(notifications)} new notifications"
+
+    lines = [f"Hi {user.first_name or user.username},", ""]
+    for notification in notifications:
+        lines.append(f"- {notification.title}")
+        lines.append(f"  {notification.message}")
+        if notification.action_url:
+            lines.append(f"  {notification.action_url}")
+        lines.append("")
+    lines.append("You can change which emails you receive in your notification preferences.")
+
+    return EmailMessage(
+        subject=subject,
+        body="\n".join(lines),
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[user.email],
+    )
+
+def send_notification_emails(notification_ids, connection=None):
+    """
+    Send email digests for the given notifications.
+
+    Preferences are re-checked at send time because deliveries held during
+    quiet hours may be released long after they were queued. Returns the
+    number of digests sent.
+    """
+    notifications = (
+        Notification.objects
+        .filter(id__in=notification_ids, emailed_at__isnull=True)
+        .select_related('user', 'user__notification_preferences')
+        .order_by('user_id', 'created_at')
+    )
+
+    by_user = defaultdict(list)
+    for notification in notifications:
+        user = notification.user
+        prefs = getattr(user, 'notification_preferences', None)
+        if not user.email or prefs is None or not prefs.channel_enabled('email', notification.type):
+            continue
+        by_user[user].append(notification)
+
+    if not by_user:
+        return 0
+
+    digests = [
+        (build_digest(user, user_notifications), [n.id for n in user_notifications])
+        for user, user_notifications in by_user.items()
+    ]
+
+    sent = 0
+    connection = connection or get_connection()
+    with connection:
+        for start in range(0, len(digests), EMAIL_BATCH_SIZE):
+            chunk = digests[start:start + EMAIL_BATCH_SIZE]
+            started = time.monotonic()
+
+            connection.send_messages([message for message, _ in chunk])
+            Notification.objects.filter(
+                id__in=[nid for _, ids in chunk for nid in ids]
+            ).update(emailed_at=timezone.now())
+            sent += len(chunk)
+
+            if EMAIL_MAX_PER_SECOND:
+                # Pace the batch so a large release does not trip the SMTP provider's limits
+                min_duration = len(chunk) / EMAIL_MAX_PER_SECOND
+                elapsed = time.monotonic() - started
+                if elapsed < min_duration:
+                    time.sleep(min_duration - elapsed)
+
+    return sent
+
+# apps/notifications/emails.py
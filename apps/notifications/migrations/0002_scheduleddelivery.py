@@ -0,0 +1,30 @@
+# Generated by Django 5.0.1 on 2026-10-19 08:35
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScheduledDelivery',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('channel', models.CharField(choices=[('email', 'Email'), ('push', 'Push')], max_length=10)),
+                ('release_at', models.DateTimeField(db_index=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('notification', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='scheduled_deliveries', to='notifications.notification')),
+            ],
+            options={
+                'verbose_name': 'Scheduled Delivery',
+                'verbose_name_plural': 'Scheduled Deliveries',
+                'ordering': ['release_at'],
+                'unique_together': {('notification', 'channel')},
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.0.1 on 2026-10-19 09:24
+
+import apps.notifications.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0005_notification_dedupe_key'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notificationpreference',
+            name='time_zone',
+            field=models.CharField(default='UTC', help_text='IANA time zone the quiet hours are in (e.g., Europe/Berlin)', max_length=64, validators=[apps.notifications.models.validate_time_zone]),
+        ),
+    ]
@@ -1,3 +1,8 @@
+from datetime import datetime, time, timedelta
+from functools import lru_cache
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError, available_timezones
+
+from django.core.exceptions import ValidationError
 from django.db import models
 from django.contrib.auth.models import User
 from django.utils import timezone
@@ -35,6 +40,9 @@ class Notification(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     read_at = models.DateTimeField(blank=True, null=True)
+    emailed_at = models.DateTimeField(blank=True, null=True)  # Set once included in an email digest
+    # Identifies the event a notification was created for, so a redelivered event doesn't notify twice
+    dedupe_key = models.CharField(max_length=100, blank=True, null=True, editable=False)
     
     class Meta:
         verbose_name = 'Notification'
@@ -45,6 +53,13 @@ class Notification(models.Model):
             models.Index(fields=['user', 'is_read']),
             models.Index(fields=['user', 'type']),
         ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['dedupe_key'],
+                condition=models.Q(dedupe_key__isnull=False),
+                name='unique_notification_dedupe_key',
+            ),
+        ]
     
     def __str__(self):
         return f"{self.title} - {self.user.username}"
@@ -99,6 +114,14 @@ class Notification(models.Model):
         else:
             return "Just now"
 
+@lru_cache(maxsize=None)
+def _time_zones():
+    return frozenset(available_timezones())
+
+def validate_time_zone(value):
+    if value not in _time_zones():
+        raise ValidationError(f"'{value}' is not a known IANA time zone (e.g., Europe/Berlin).")
+
 class NotificationPreference(models.Model):
     """
     User notification preferences
@@ -136,6 +159,10 @@ class NotificationPreference(models.Model):
     quiet_hours_enabled = models.BooleanField(default=False)
     quiet_hours_start = models.TimeField(default='22:00')
     quiet_hours_end = models.TimeField(default='08:00')
+    time_zone = models.CharField(
+        max_length=64, default='UTC', validators=[validate_time_zone],
+        help_text='IANA time zone the quiet hours are in (e.g., Europe/Berlin)'
+    )
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -146,17 +173,146 @@ class NotificationPreference(models.Model):
     
     def __str__(self):
         return f"{self.user.username}'s Notification Preferences"
+    
+    def channel_enabled(self, channel, notification_type):
+        """Check if a delivery channel (email/push/in_app) is enabled for a notification type"""
+        return (
+            getattr(self, f'{channel}_enabled', False)
+            and getattr(self, f'{channel}_{notification_type}', False)
+        )
+    
+    def quiet_hours_end_after(self, moment):
+        """
+        Return when the quiet hours covering `moment` end, or None if
+        `moment` falls outside the user's quiet hours
+        """
+        if not self.quiet_hours_enabled:
+            return None
+        
+        start = _as_time(self.quiet_hours_start)
+        end = _as_time(self.quiet_hours_end)
+        if start == end:
+            return None
+        
+        # Quiet hours are wall-clock times where the user lives
+        try:
+            zone = ZoneInfo(self.time_zone)
+        except (ZoneInfoNotFoundError, ValueError):
+            zone = ZoneInfo('UTC')
+        local = moment.astimezone(zone)
+        current = local.time()
+        release = timezone.make_aware(
+            datetime.combine(local.date(), end), local.tzinfo
+        )
+        
+        if start < end:
+            # Same-day window, e.g. 13:00-15:00
+            if start <= current < end:
+                return release
+            return None
+        
+        # Overnight window, e.g. 22:00-08:00
+        if current >= start:
+            return release + timedelta(days=1)
+        if current < end:
+            return release
+        return None
 
-# Signal to create default notification preferences
-from django.db.models.signals import post_save
-from django.dispatch import receiver
+def _as_time(value):
+    """TimeField defaults are strings until the row is reloaded from the database"""
+    if isinstance(value, str):
+        return time.fromisoformat(value)
+    return value
 
-@receiver(post_save, sender=User)
-def create_notification_preferences(sender, instance, created, **kwargs):
+class ScheduledDelivery(models.Model):
     """
-    Automatically create NotificationPreference when a User is created
+    Email/push delivery held back until the user's quiet hours end.
+    Rows are released in `release_at` order by a periodic task, so each
+    tick only touches the deliveries that are actually due.
     """
-    if created:
-        NotificationPreference.objects.get_or_create(user=instance)
+    CHANNEL_CHOICES = [
+        ('email', 'Email'),
+        ('push', 'Push'),
+    ]
+    
+    notification = models.ForeignKey(Notification, on_delete=models.CASCADE, related_name='scheduled_deliveries')
+    channel = models.CharField(max_length=10, choices=CHANNEL_CHOICES)
+    release_at = models.DateTimeField(db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        verbose_name = 'Scheduled Delivery'
+        verbose_name_plural = 'Scheduled Deliveries'
+        ordering = ['release_at']
+        unique_together = ['notification', 'channel']
+    
+    def __str__(self):
+        return f"{self.channel} delivery of notification {self.notification_id} at {self.release_at}"
+
+class PushDevice(models.Model):
+    """
+    Mobile/web device registered to receive push notifications
+    """
+    PLATFORM_CHOICES = [
+        ('android', 'Android'),
+        ('ios', 'iOS'),
+        ('web', 'Web'),
+    ]
+    
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='push_devices')
+    token = models.CharField(max_length=255, unique=True)
+    platform = models.CharField(max_length=10, choices=PLATFORM_CHOICES)
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_seen_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = 'Push Device'
+        verbose_name_plural = 'Push Devices'
+        indexes = [
+            models.Index(fields=['user', 'is_active']),
+        ]
+    
+    def __str__(self):
+        return f"{self.user.username}'s {self.get_platform_display()} device"
+
+class PushOutbox(models.Model):
+    """
+    Pending push delivery of a notification, drained in batches by workers
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sending', 'Sending'),
+        ('sent', 'Sent'),
+        ('skipped', 'Skipped'),
+        ('failed', 'Failed'),
+    ]
+    
+    notification = models.ForeignKey(Notification, on_delete=models.CASCADE, related_name='push_deliveries')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(blank=True, null=True)
+    claimed_at = models.DateTimeField(blank=True, null=True)  # When a worker started sending it
+    
+    class Meta:
+        verbose_name = 'Push Outbox Entry'
+        verbose_name_plural = 'Push Outbox'
+        indexes = [
+            models.Index(
+                fields=['created_at'],
+                name='push_outbox_pending_idx',
+                condition=models.Q(status='pending'),
+            ),
+            models.Index(
+                fields=['claimed_at'],
+                name='push_outbox_sending_idx',
+                condition=models.Q(status='sending'),
+            ),
+        ]
+    
+    def __str__(self):
+        return f"Push delivery of notification {self.notification_id} ({self.status})"
 
 # apps/notifications/models.py
@@ -0,0 +1,212 @@
+"""
+Push channel for notifications.
+
+Push deliveries are appended to `PushOutbox` and drained by workers. Each
+drain claims a batch of pending entries in a short transaction (SKIP
+LOCKED, then marked 'sending'), fans them out to the user's active devices
+and sends the messages to the provider in chunks no larger than the
+transport's `max_batch_size` with no transaction open, then records the
+outcome in a second short transaction. Entries left 'sending' by a worker
+that died mid-batch are reclaimed after `PUSH_CLAIM_TIMEOUT` seconds.
+Tokens the provider reports as invalid are removed from the device
+registry.
+
+Provider I/O goes through the transport named by `settings.PUSH_TRANSPORT`,
+so `LocalPushTransport` can stand in for the real provider in tests.
+"""
+import logging
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import PushDevice, PushOutbox
+
+logger = logging.getLogger(__name__)
+
+PUSH_OUTBOX_BATCH_SIZE = getattr(settings, 'PUSH_OUTBOX_BATCH_SIZE', 500)
+PUSH_MAX_ATTEMPTS = getattr(settings, 'PUSH_MAX_ATTEMPTS', 5)
+PUSH_CLAIM_TIMEOUT = getattr(settings, 'PUSH_CLAIM_TIMEOUT', 300)
+
+# Per-message result reported by transports
+INVALID_TOKEN = 'invalid_token'
+
+class BasePushTransport:
+    """
+    Interface for push providers.
+
+    `send` receives a list of (token, payload) pairs, never more than
+    `max_batch_size`, and returns one result per pair: None on success,
+    INVALID_TOKEN when the provider rejected the token for good, or any
+    other string describing a transient error.
+    """
+    max_batch_size = 500
+
+    def send(self, messages):
+        raise NotImplementedError
+
+class LocalPushTransport(BasePushTransport):
+    """
+    Transport that records messages in memory instead of calling a provider.
+    Tokens listed in `invalid_tokens` are reported back as invalid.
+    """
+    def __init__(self):
+        self.outbox = []
+        self.invalid_tokens = set()
+
+    def send(self, messages):
+        results = []
+        for token, payload in messages:
+            if token in self.invalid_tokens:
+                results.append(INVALID_TOKEN)
+            else:
+                self.outbox.append({'token': token, 'payload': payload})
+                results.append(None)
+        return results
+
+_transport = None
+
+def get_transport():
+    """Return the configured push transport"""
+    global _transport
+    if _transport is None:
+        _transport = import_string(settings.PUSH_TRANSPORT)()
+    return _transport
+
+def build_payload(notification):
+    """Build the provider-agnostic payload for a notification"""
+    return {
+        'title': notification.title,
+        'body': notification.message,
+        'data': {
+            'notification_id': notification.id,
+            'type': notification.type,
+            'priority': notification.priority,
+            'action_url': notification.action_url or '',
+        },
+    }
+
+def enqueue_push(notification_ids):
+    """Append push deliveries for the given notifications to the outbox"""
+    PushOutbox.objects.bulk_create([
+        PushOutbox(notification_id=notification_id) for notification_id in notification_ids
+    ])
+
+def _claim(batch_size):
+    """Claim a batch of pending entries for this worker"""
+    with transaction.atomic():
+        entries = list(
+            PushOutbox.objects
+            .select_for_update(skip_locked=True, of=('self',))
+            .filter(status='pending')
+            .select_related('notification', 'notification__user__notification_preferences')
+            .order_by('created_at')[:batch_size]
+        )
+        if entries:
+            PushOutbox.objects.filter(pk__in=[entry.pk for entry in entries]).update(
+                status='sending', claimed_at=timezone.now()
+            )
+    return entries
+
+def drain_outbox(batch_size=PUSH_OUTBOX_BATCH_SIZE, transport=None):
+    """
+    Send every pending push delivery. Returns the number of outbox entries
+    processed.
+    """
+    transport = transport or get_transport()
+    processed = 0
+
+    PushOutbox.objects.filter(
+        status='sending', claimed_at__lt=timezone.now() - timedelta(seconds=PUSH_CLAIM_TIMEOUT)
+    ).update(status='pending', claimed_at=None)
+
+    while True:
+        entries = _claim(batch_size)
+        if not entries:
+            break
+
+        # Provider I/O runs with no transaction open and no rows locked
+        had_errors = _deliver(entries, transport)
+        with transaction.atomic():
+            for entry in entries:
+                entry.claimed_at = None
+            PushOutbox.objects.bulk_update(entries, ['status', 'attempts', 'last_error', 'sent_at', 'claimed_at'])
+
+        processed += len(entries)
+        if len(entries) < batch_size or had_errors:
+            # Leave transient failures for the next tick instead of hammering the provider
+            break
+
+    return processed
+
+def _deliver(entries, transport):
+    """
+    Send a claimed batch of outbox entries and record the outcome on each.
+    Returns True if any message failed with a transient error.
+    """
+    user_ids = {entry.notification.user_id for entry in entries}
+    tokens_by_user = defaultdict(list)
+    for user_id, token in PushDevice.objects.filter(
+        user_id__in=user_ids, is_active=True
+    ).values_list('user_id', 'token'):
+        tokens_by_user[user_id].append(token)
+
+    messages = []
+    message_entries = []
+    for entry in entries:
+        notification = entry.notification
+        prefs = getattr(notification.user, 'notification_preferences', None)
+        tokens = tokens_by_user.get(notification.user_id)
+        if not tokens or prefs is None or not prefs.channel_enabled('push', notification.type):
+            entry.status = 'skipped'
+            continue
+        payload = build_payload(notification)
+        for token in tokens:
+            messages.append((token, payload))
+            message_entries.append(entry)
+
+    delivered = set()
+    errors = {}
+    invalid_tokens = set()
+    for start in range(0, len(messages), transport.max_batch_size):
+        chunk = messages[start:start + transport.max_batch_size]
+        try:
+            results = transport.send(chunk)
+        except Exception as e:
+            logger.warning('Push transport failed for %d messages: %s', len(chunk), e)
+            results = [str(e) or e.__class__.__name__] * len(chunk)
+
+        for (token, _), entry, result in zip(chunk, message_entries[start:start + len(chunk)], results):
+            if result is None:
+                delivered.add(entry.pk)
+            elif result == INVALID_TOKEN:
+                invalid_tokens.add(token)
+            else:
+                errors[entry.pk] = result
+
+    now = timezone.now()
+    for entry in entries:
+        if entry.status == 'skipped':
+            continue
+        entry.attempts += 1
+        if entry.pk in delivered or entry.pk not in errors:
+            # Delivered to at least one device, or every token was invalid
+            entry.status = 'sent' if entry.pk in delivered else 'skipped'
+            entry.sent_at = now if entry.pk in delivered else None
+            entry.last_error = ''
+        elif entry.attempts >= PUSH_MAX_ATTEMPTS:
+            entry.status = 'failed'
+            entry.last_error = errors[entry.pk]
+        else:
+            entry.last_error = errors[entry.pk]
+
+    if invalid_tokens:
+        PushDevice.objects.filter(token__in=invalid_tokens).delete()
+        logger.info('Pruned %d invalid push tokens', len(invalid_tokens))
+
+    return any(entry.status == 'pending' for entry in entries)
+
+# apps/notifications/push.py
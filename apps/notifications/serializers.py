@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from .models import Notification, NotificationPreference
+from .models import Notification, NotificationPreference, PushDevice
 
 class NotificationSerializer(serializers.ModelSerializer):
     """
@@ -54,7 +54,7 @@ class NotificationPreferenceSerializer(serializers.ModelSerializer):
             'push_system', 'push_achievement', 'push_security',
             'in_app_enabled', 'in_app_transaction', 'in_app_budget', 
             'in_app_reminder', 'in_app_system', 'in_app_achievement', 'in_app_security',
-            'quiet_hours_enabled', 'quiet_hours_start', 'quiet_hours_end',
+            'quiet_hours_enabled', 'quiet_hours_start', 'quiet_hours_end', 'time_zone',
             'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
@@ -87,4 +87,27 @@ class BulkNotificationActionSerializer(serializers.Serializer):
         child=serializers.IntegerField(),
         min_length=1
     )
-    action = serializers.ChoiceField(choices=ACTION_CHOICES) 
\ No newline at end of file
+    action = serializers.ChoiceField(choices=ACTION_CHOICES)
+
+class PushDeviceSerializer(serializers.ModelSerializer):
+    """
+    Serializer for registering push devices
+    """
+    token = serializers.CharField(max_length=255)
+    
+    class Meta:
+        model = PushDevice
+        fields = ['id', 'token', 'platform', 'is_active', 'created_at', 'last_seen_at']
+        read_only_fields = ['id', 'is_active', 'created_at', 'last_seen_at']
+    
+    def create(self, validated_data):
+        # A token identifies the device, so re-registering moves it to the current user
+        device, created = PushDevice.objects.update_or_create(
+            token=validated_data['token'],
+            defaults={
+                'user': self.context['request'].user,
+                'platform': validated_data['platform'],
+                'is_active': True,
+            }
+        )
+        return device
@@ -0,0 +1,234 @@
+from datetime import timedelta
+from decimal import Decimal
+from smtplib import SMTPException
+
+from celery import shared_task
+from django.conf import settings
+from django.db.models import Sum
+from django.utils import timezone
+
+from .delivery import create_notifications, queue_deliveries, release_due_deliveries
+from .emails import send_notification_emails
+from .models import Notification, NotificationPreference
+from .push import drain_outbox, enqueue_push
+from apps.authentication.models import UserProfile
+from apps.transactions.models import Transaction
+
+def _preferences_for(user_ids, create_missing=False):
+    """Load notification preferences for a set of users in one query"""
+    prefs_by_user = {
+        prefs.user_id: prefs
+        for prefs in NotificationPreference.objects.filter(user_id__in=user_ids)
+    }
+    if create_missing:
+        missing = set(user_ids) - set(prefs_by_user)
+        if missing:
+            # If no preferences exist, create defaults and proceed
+            NotificationPreference.objects.bulk_create(
+                [NotificationPreference(user_id=user_id) for user_id in missing],
+                ignore_conflicts=True,
+            )
+            prefs_by_user.update({
+                prefs.user_id: prefs
+                for prefs in NotificationPreference.objects.filter(user_id__in=missing)
+            })
+    return prefs_by_user
+
+# Outbox event handlers. Each receives a list of event payloads.
+
+@shared_task
+def notify_transactions_created(events):
+    """
+    Create a notification for each new transaction
+    """
+    prefs_by_user = _preferences_for({event['user_id'] for event in events}, create_missing=True)
+    notifications = []
+    for event in events:
+        prefs = prefs_by_user.get(event['user_id'])
+        # Check if user has transaction notifications enabled
+        if prefs is None or not prefs.in_app_transaction:
+            continue
+        notifications.append(Notification(
+            user_id=event['user_id'],
+            title=f"New {event['type'].capitalize()} Added",
+            message=f"You've added a {event['type']} of {event['amount']} for {event['category']}: {event['title']}",
+            type='transaction',
+            priority='low',
+            dedupe_key=f"transaction.created:{event['transaction_id']}",
+            metadata={
+                'transaction_id': event['transaction_id'],
+                'transaction_type': event['type'],
+                'amount': event['amount'],
+                'category': event['category'],
+            }
+        ))
+    return len(create_notifications(notifications, prefs_by_user))
+
+@shared_task
+def notify_transactions_deleted(events):
+    """
+    Create a notification for each deleted transaction
+    """
+    prefs_by_user = _preferences_for({event['user_id'] for event in events})
+    notifications = []
+    for event in events:
+        prefs = prefs_by_user.get(event['user_id'])
+        if prefs is None or not prefs.in_app_transaction:
+            continue
+        notifications.append(Notification(
+            user_id=event['user_id'],
+            title="Transaction Deleted",
+            message=f"Transaction '{event['title']}' ({event['type']} of {event['amount']}) has been deleted.",
+            type='transaction',
+            priority='low',
+            dedupe_key=f"transaction.deleted:{event['event_id']}" if 'event_id' in event else None,
+            metadata={
+                'deleted_transaction': {
+                    'title': event['title'],
+                    'type': event['type'],
+                    'amount': event['amount'],
+                    'category': event['category'],
+                }
+            }
+        ))
+    return len(create_notifications(notifications, prefs_by_user))
+
+@shared_task
+def send_welcome_notifications(events):
+    """
+    Create a welcome notification for new users
+    """
+    prefs_by_user = _preferences_for({event['user_id'] for event in events})
+    notifications = [
+        Notification(
+            user_id=user_id,
+            title="Welcome to Expense Tracker!",
+            message="Welcome! Start tracking your expenses and income to better manage your finances. Add your first transaction to get started.",
+            type='system',
+            priority='medium',
+            dedupe_key=f'welcome:{user_id}',
+            metadata={
+                'welcome': True,
+                'onboarding': True
+            }
+        )
+        # Users deleted before the event was relayed have no preferences left
+        for user_id in prefs_by_user
+    ]
+    return len(create_notifications(notifications, prefs_by_user))
+
+# Budget thresholds, highest first: (percentage, title, priority, status)
+BUDGET_THRESHOLDS = [
+    (100, "Budget Exceeded!", 'high', 'exceeded'),
+    (90, "Budget Warning: 90% Used", 'medium', 'warning_90'),
+    (75, "Budget Alert: 75% Used", 'low', 'alert_75'),
+]
+
+def _budget_message(status, budget, expenses, percentage):
+    if status == 'exceeded':
+        return f"You've exceeded your monthly budget of {budget}. Current expenses: {expenses} ({percentage:.1f}%)"
+    used = 90 if status == 'warning_90' else 75
+    return f"You've used {used}% of your monthly budget. Budget: {budget}, Spent: {expenses}"
+
+@shared_task
+def check_budgets(events):
+    """
+    Check if users are approaching or exceeding their monthly budget.
+    Expenses for every user in the batch come from one grouped query.
+    """
+    prefs_by_user = _preferences_for({event['user_id'] for event in events})
+    # Check if users have budget notifications enabled
+    user_ids = [user_id for user_id, prefs in prefs_by_user.items() if prefs.in_app_budget]
+    budgets = dict(
+        UserProfile.objects.filter(user_id__in=user_ids, monthly_budget__gt=0)
+        .values_list('user_id', 'monthly_budget')
+    )
+    if not budgets:
+        return 0
+
+    now = timezone.now()
+    start_of_month = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    expenses = dict(
+        Transaction.objects.filter(
+            user_id__in=budgets,
+            type='expense',
+            date__gte=start_of_month.date()
+        ).values('user_id').annotate(total=Sum('amount')).values_list('user_id', 'total')
+    )
+
+    # Avoid sending duplicate notifications by checking recent ones
+    recently_notified = set(
+        Notification.objects.filter(
+            user_id__in=budgets,
+            type='budget',
+            created_at__gte=now - timedelta(days=1)
+        ).values_list('user_id', flat=True)
+    )
+
+    notifications = []
+    for user_id, budget in budgets.items():
+        if user_id in recently_notified:
+            continue
+        monthly_expenses = expenses.get(user_id) or Decimal('0')
+        percentage_used = (monthly_expenses / budget) * 100
+        for threshold, title, priority, status in BUDGET_THRESHOLDS:
+            if percentage_used >= threshold:
+                notifications.append(Notification(
+                    user_id=user_id,
+                    title=title,
+                    message=_budget_message(status, budget, monthly_expenses, percentage_used),
+                    type='budget',
+                    priority=priority,
+                    # At most one budget notification per user and day
+                    dedupe_key=f'budget:{user_id}:{now.date().isoformat()}',
+                    metadata={
+                        'budget': str(budget),
+                        'expenses': str(monthly_expenses),
+                        'percentage': float(percentage_used),
+                        'status': status
+                    }
+                ))
+                break
+    return len(create_notifications(notifications, prefs_by_user))
+
+@shared_task
+def deliver_notifications(events):
+    """
+    Queue email/push deliveries for notifications created one at a time
+    """
+    notifications = list(Notification.objects.filter(
+        id__in=[event['notification_id'] for event in events]
+    ))
+    queue_deliveries(notifications)
+    return len(notifications)
+
+# Delivery channels
+
+@shared_task
+def release_scheduled_deliveries():
+    """Release email/push deliveries held back during quiet hours"""
+    return release_due_deliveries()
+
+@shared_task(
+    autoretry_for=(SMTPException, OSError),
+    retry_backoff=True,
+    retry_backoff_max=600,
+    retry_jitter=True,
+    max_retries=5,
+    rate_limit=getattr(settings, 'NOTIFICATION_EMAIL_RATE_LIMIT', None),
+)
+def send_email_notifications(notification_ids):
+    """Send email digests for a batch of notifications"""
+    return send_notification_emails(notification_ids)
+
+@shared_task
+def drain_push_outbox():
+    """Send pending push deliveries in provider-sized batches"""
+    return drain_outbox()
+
+def queue_push_notifications(notification_ids):
+    """Append push deliveries to the outbox and wake a worker to drain it"""
+    enqueue_push(notification_ids)
+    drain_push_outbox.delay()
+
+# apps/notifications/tasks.py
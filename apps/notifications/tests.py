@@ -1,3 +1,258 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core import mail
+from django.db import connection
 from django.test import TestCase
+from django.utils import timezone
+
+from . import delivery
+from .delivery import queue_deliveries, release_due_deliveries
+from .emails import send_notification_emails
+from .models import Notification, NotificationPreference, PushDevice, PushOutbox, ScheduledDelivery
+from .push import LocalPushTransport, drain_outbox, enqueue_push
+
+class NotificationEmailTests(TestCase):
+    """
+    Email digests built by send_notification_emails
+    """
+
+    def setUp(self):
+        self.alice = User.objects.create_user('alice', 'alice@example.com', 'password')
+        self.bob = User.objects.create_user('bob', 'bob@example.com', 'password')
+
+    def notify(self, user, title, type='system'):
+        return Notification.objects.create(user=user, title=title, message=f'{title} message', type=type)
+
+    def test_one_digest_per_user(self):
+        ids = [
+            self.notify(self.alice, 'First').id,
+            self.notify(self.alice, 'Second').id,
+            self.notify(self.bob, 'Only').id,
+        ]
+
+        self.assertEqual(send_notification_emails(ids), 2)
+
+        self.assertEqual(len(mail.outbox), 2)
+        digests = {message.to[0]: message for message in mail.outbox}
+        self.assertEqual(digests['alice@example.com'].subject, 'You have 2 new notifications')
+        self.assertIn('First', digests['alice@example.com'].body)
+        self.assertIn('Second', digests['alice@example.com'].body)
+        self.assertEqual(digests['bob@example.com'].subject, 'Only')
+        self.assertFalse(Notification.objects.filter(pk__in=ids, emailed_at__isnull=True).exists())
+
+    def test_emailed_notifications_are_not_resent(self):
+        ids = [self.notify(self.alice, 'First').id]
+        send_notification_emails(ids)
+
+        ids.append(self.notify(self.alice, 'Second').id)
+        self.assertEqual(send_notification_emails(ids), 1)
+
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertEqual(mail.outbox[1].subject, 'Second')
+
+    def test_disabled_channel_is_skipped(self):
+        NotificationPreference.objects.filter(user=self.bob).update(email_budget=False)
+        ids = [
+            self.notify(self.alice, 'Budget', type='budget').id,
+            self.notify(self.bob, 'Budget', type='budget').id,
+        ]
+
+        self.assertEqual(send_notification_emails(ids), 1)
+
+        self.assertEqual([message.to for message in mail.outbox], [['alice@example.com']])
+        self.assertIsNone(Notification.objects.get(pk=ids[1]).emailed_at)
+
+class PushOutboxTests(TestCase):
+    """
+    Draining the push outbox through the local transport
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user('alice', 'alice@example.com', 'password')
+        self.transport = LocalPushTransport()
+
+    def queue(self, title='Hello', type='transaction'):
+        notification = Notification.objects.create(user=self.user, title=title, message='Message', type=type)
+        enqueue_push([notification.id])
+        return notification
+
+    def test_sends_to_every_active_device(self):
+        PushDevice.objects.create(user=self.user, token='phone', platform='ios')
+        PushDevice.objects.create(user=self.user, token='tablet', platform='android')
+        PushDevice.objects.create(user=self.user, token='old', platform='web', is_active=False)
+        notification = self.queue()
+
+        self.assertEqual(drain_outbox(transport=self.transport), 1)
+
+        self.assertEqual(sorted(message['token'] for message in self.transport.outbox), ['phone', 'tablet'])
+        self.assertEqual(self.transport.outbox[0]['payload']['data']['notification_id'], notification.id)
+        entry = PushOutbox.objects.get()
+        self.assertEqual(entry.status, 'sent')
+        self.assertIsNotNone(entry.sent_at)
+
+    def test_chunks_by_transport_batch_size(self):
+        for index in range(3):
+            PushDevice.objects.create(user=self.user, token=f'device-{index}', platform='ios')
+        self.queue()
+        self.queue()
+        self.transport.max_batch_size = 2
+        batches = []
+        send = self.transport.send
+        self.transport.send = lambda messages: batches.append(len(messages)) or send(messages)
+
+        drain_outbox(transport=self.transport)
+
+        self.assertEqual(batches, [2, 2, 2])
+        self.assertFalse(PushOutbox.objects.exclude(status='sent').exists())
+
+    def test_invalid_tokens_are_pruned(self):
+        PushDevice.objects.create(user=self.user, token='valid', platform='ios')
+        PushDevice.objects.create(user=self.user, token='expired', platform='android')
+        self.transport.invalid_tokens = {'expired'}
+        self.queue()
+
+        drain_outbox(transport=self.transport)
+
+        self.assertEqual([message['token'] for message in self.transport.outbox], ['valid'])
+        self.assertEqual(list(PushDevice.objects.values_list('token', flat=True)), ['valid'])
+        self.assertEqual(PushOutbox.objects.get().status, 'sent')
+
+    def test_only_invalid_tokens_skips_the_entry(self):
+        PushDevice.objects.create(user=self.user, token='expired', platform='ios')
+        self.transport.invalid_tokens = {'expired'}
+        self.queue()
+
+        drain_outbox(transport=self.transport)
+
+        self.assertFalse(PushDevice.objects.exists())
+        entry = PushOutbox.objects.get()
+        self.assertEqual(entry.status, 'skipped')
+        self.assertEqual(entry.attempts, 1)
+
+    def test_disabled_channel_is_skipped(self):
+        PushDevice.objects.create(user=self.user, token='phone', platform='ios')
+        self.queue(type='system')  # push_system is off by default
+
+        drain_outbox(transport=self.transport)
+
+        self.assertEqual(self.transport.outbox, [])
+        self.assertEqual(PushOutbox.objects.get().status, 'skipped')
+
+    def test_transports_do_not_share_state(self):
+        other = LocalPushTransport()
+        other.invalid_tokens.add('phone')
+        other.send([('tablet', {})])
+
+        self.assertEqual(self.transport.outbox, [])
+        self.assertEqual(self.transport.invalid_tokens, set())
+
+    def test_sends_outside_the_claim_transaction(self):
+        PushDevice.objects.create(user=self.user, token='phone', platform='ios')
+        self.queue()
+        depth = len(connection.atomic_blocks)
+        seen = []
+        send = self.transport.send
+
+        def record(messages):
+            seen.append((len(connection.atomic_blocks), PushOutbox.objects.get().status))
+            return send(messages)
+        self.transport.send = record
+
+        drain_outbox(transport=self.transport)
+
+        self.assertEqual(seen, [(depth, 'sending')])
+        entry = PushOutbox.objects.get()
+        self.assertEqual(entry.status, 'sent')
+        self.assertIsNone(entry.claimed_at)
+
+    def test_stale_claims_are_retried(self):
+        PushDevice.objects.create(user=self.user, token='phone', platform='ios')
+        self.queue(title='Stale')
+        self.queue(title='In flight')
+        stale, in_flight = PushOutbox.objects.order_by('created_at', 'id')
+        PushOutbox.objects.filter(pk=stale.pk).update(
+            status='sending', claimed_at=timezone.now() - timedelta(hours=1)
+        )
+        PushOutbox.objects.filter(pk=in_flight.pk).update(status='sending', claimed_at=timezone.now())
+
+        self.assertEqual(drain_outbox(transport=self.transport), 1)
+
+        self.assertEqual([message['payload']['title'] for message in self.transport.outbox], ['Stale'])
+        self.assertEqual(PushOutbox.objects.get(pk=in_flight.pk).status, 'sending')
+
+    def test_transient_errors_stay_pending(self):
+        PushDevice.objects.create(user=self.user, token='phone', platform='ios')
+        self.queue()
+
+        def fail(messages):
+            raise ConnectionError('provider unavailable')
+        self.transport.send = fail
+        with self.assertLogs('apps.notifications.push', 'WARNING'):
+            drain_outbox(transport=self.transport)
+
+        entry = PushOutbox.objects.get()
+        self.assertEqual(entry.status, 'pending')
+        self.assertEqual(entry.attempts, 1)
+        self.assertEqual(entry.last_error, 'provider unavailable')
+
+def utc(*args):
+    return datetime(*args, tzinfo=dt_timezone.utc)
+
+class QuietHoursTests(TestCase):
+    """
+    Deliveries held during the user's quiet hours and released afterwards
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user('alice', 'alice@example.com', 'password')
+        NotificationPreference.objects.filter(user=self.user).update(
+            quiet_hours_enabled=True, quiet_hours_start='22:00', quiet_hours_end='08:00',
+            time_zone='America/New_York',
+        )
+        self.prefs = NotificationPreference.objects.get(user=self.user)
+        self.handlers = {'email': mock.Mock(), 'push': mock.Mock()}
+        patcher = mock.patch.dict(delivery._channel_handlers, self.handlers)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_overnight_window_in_the_users_time_zone(self):
+        # 23:30 in New York, before midnight: released at 08:00 the next day
+        self.assertEqual(self.prefs.quiet_hours_end_after(utc(2024, 6, 14, 3, 30)), utc(2024, 6, 14, 12))
+        # 06:00 in New York, after midnight: released the same morning
+        self.assertEqual(self.prefs.quiet_hours_end_after(utc(2024, 6, 14, 10)), utc(2024, 6, 14, 12))
+        # 23:30 UTC is 19:30 in New York
+        self.assertIsNone(self.prefs.quiet_hours_end_after(utc(2024, 6, 14, 23, 30)))
+        self.assertIsNone(self.prefs.quiet_hours_end_after(utc(2024, 6, 14, 12)))
+
+    def test_window_across_a_dst_change(self):
+        # 22:00 EST on the night clocks go forward; 08:00 the next morning is EDT
+        self.assertEqual(self.prefs.quiet_hours_end_after(utc(2024, 3, 10, 3)), utc(2024, 3, 10, 12))
+
+    def test_held_delivery_is_released_once_due(self):
+        notification = Notification.objects.create(user=self.user, title='Lunch', message='Lunch', type='transaction')
+        urgent = Notification.objects.create(
+            user=self.user, title='Sign-in', message='Sign-in', type='security', priority='urgent',
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            queue_deliveries([notification, urgent], {self.user.pk: self.prefs}, now=utc(2024, 6, 14, 3, 30))
+
+        # Urgent notifications bypass quiet hours
+        self.handlers['email'].assert_called_once_with([urgent.pk])
+        self.assertEqual(
+            sorted(ScheduledDelivery.objects.values_list('channel', 'release_at')),
+            [('email', utc(2024, 6, 14, 12)), ('push', utc(2024, 6, 14, 12))],
+        )
+
+        self.assertEqual(release_due_deliveries(now=utc(2024, 6, 14, 11, 59)), 0)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(release_due_deliveries(now=utc(2024, 6, 14, 12)), 2)
+
+        self.handlers['email'].assert_called_with([notification.pk])
+        self.handlers['push'].assert_called_with([notification.pk])
+        self.assertFalse(ScheduledDelivery.objects.exists())
+        self.assertEqual(release_due_deliveries(now=utc(2024, 6, 15)), 0)
 
-# Create your tests here.
+# apps/notifications/tests.py
@@ -25,4 +25,8 @@ urlpatterns = [
     
     # Notification preferences
     path('preferences/', views.NotificationPreferenceView.as_view(), name='preferences'),
+    
+    # Push devices
+    path('devices/', views.PushDeviceListCreateView.as_view(), name='device_list_create'),
+    path('devices/<int:pk>/', views.PushDeviceDetailView.as_view(), name='device_detail'),
 ] 
\ No newline at end of file
@@ -3,19 +3,21 @@ from rest_framework import generics, status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from rest_framework.pagination import PageNumberPagination
 from django.db.models import Q, Count
 from datetime import datetime, timedelta
 from django.utils import timezone
 
-from .models import Notification, NotificationPreference
+from utils.pagination import EstimatedCountPagination
+from utils.throttling import throttle_scope
+from .models import Notification, NotificationPreference, PushDevice
 from .serializers import (
     NotificationSerializer, NotificationCreateSerializer, NotificationUpdateSerializer,
-    NotificationPreferenceSerializer, NotificationStatsSerializer, BulkNotificationActionSerializer
+    NotificationPreferenceSerializer, NotificationStatsSerializer, BulkNotificationActionSerializer,
+    PushDeviceSerializer
 )
 
 # Custom pagination class for notifications
-class NotificationPagination(PageNumberPagination):
+class NotificationPagination(EstimatedCountPagination):
     page_size = 20
     page_size_query_param = 'page_size'
     max_page_size = 100
@@ -140,6 +142,7 @@ class NotificationStatsView(generics.GenericAPIView):
     Get notification statistics for the user
     """
     permission_classes = [IsAuthenticated]
+    throttle_scope = 'expensive'
     serializer_class = NotificationStatsSerializer
     
     def get(self, request):
@@ -206,6 +209,7 @@ def mark_notification_read(request, pk):
             'message': f'Failed to mark notification as read: {str(e)}'
         }, status=status.HTTP_400_BAD_REQUEST)
 
+@throttle_scope('bulk')
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def mark_all_read(request):
@@ -227,6 +231,7 @@ def mark_all_read(request):
             'message': f'Failed to mark all notifications as read: {str(e)}'
         }, status=status.HTTP_400_BAD_REQUEST)
 
+@throttle_scope('bulk')
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def bulk_notification_action(request):
@@ -320,6 +325,36 @@ class NotificationPreferenceView(generics.RetrieveUpdateAPIView):
             'message': 'Notification preferences updated successfully'
         })
 
+# Push Device Views
+class PushDeviceListCreateView(generics.ListCreateAPIView):
+    """
+    List the user's push devices or register a new device token
+    """
+    serializer_class = PushDeviceSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = None
+    
+    def get_queryset(self):
+        return PushDevice.objects.filter(user=self.request.user, is_active=True)
+    
+    def create(self, request, *args, **kwargs):
+        """Override create to return success response format"""
+        response = super().create(request, *args, **kwargs)
+        return Response({
+            'success': True,
+            'data': response.data,
+            'message': 'Push device registered successfully'
+        }, status=status.HTTP_201_CREATED)
+
+class PushDeviceDetailView(generics.DestroyAPIView):
+    """
+    Unregister a push device
+    """
+    permission_classes = [IsAuthenticated]
+    
+    def get_queryset(self):
+        return PushDevice.objects.filter(user=self.request.user)
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def notification_types(request):
@@ -0,0 +1,2 @@
+
+# apps/outbox/__init__.py
\ No newline at end of file
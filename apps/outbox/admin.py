@@ -0,0 +1,11 @@
+from django.contrib import admin
+from .models import OutboxEvent
+
+@admin.register(OutboxEvent)
+class OutboxEventAdmin(admin.ModelAdmin):
+    list_display = ['id', 'topic', 'created_at', 'unhandled_at']
+    list_filter = ['topic', 'unhandled_at']
+    readonly_fields = ['topic', 'payload', 'created_at', 'unhandled_at']
+    ordering = ['id']
+
+# apps/outbox/admin.py
@@ -0,0 +1,109 @@
+"""
+Transactional outbox.
+
+Signal handlers call `publish` to append a compact event row instead of
+doing the side effect inline. The row is written in the same database
+transaction as the change that caused it, so an event exists if and only
+if the write committed.
+
+The relay polls the table with SELECT ... FOR UPDATE SKIP LOCKED, groups a
+batch of events by topic and hands each group to the Celery tasks
+registered for that topic in a single call. Rows are deleted in the same
+transaction that dispatched them. Delivery is at-least-once, so handlers
+must tolerate seeing an event twice; each payload carries its `event_id`
+to deduplicate on.
+
+Events of a topic nobody handles (a typo, or a producer deployed before
+its consumer) are kept, marked `unhandled_at` and logged, and are picked
+up again once a handler for the topic is registered.
+"""
+import logging
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import OutboxEvent
+
+logger = logging.getLogger(__name__)
+
+RELAY_BATCH_SIZE = getattr(settings, 'OUTBOX_RELAY_BATCH_SIZE', 500)
+
+_handlers = defaultdict(list)
+
+def register_handler(topic, task):
+    """
+    Register a Celery task to receive events of `topic`. The task is called
+    with a list of event payloads.
+    """
+    if task not in _handlers[topic]:
+        _handlers[topic].append(task)
+
+def publish(topic, payload):
+    """Record an event in the current transaction"""
+    event = OutboxEvent.objects.create(topic=topic, payload=payload)
+    _schedule_relay()
+    return event
+
+def publish_many(topic, payloads):
+    """Record several events of the same topic with a single insert"""
+    events = OutboxEvent.objects.bulk_create([
+        OutboxEvent(topic=topic, payload=payload) for payload in payloads
+    ])
+    if events:
+        _schedule_relay()
+    return events
+
+def _schedule_relay():
+    if getattr(settings, 'OUTBOX_RELAY_ON_COMMIT', False):
+        transaction.on_commit(relay)
+
+def relay(batch_size=RELAY_BATCH_SIZE):
+    """
+    Dispatch pending events in batches until the table is drained. Returns
+    the number of events dispatched.
+    """
+    dispatched = 0
+
+    while True:
+        with transaction.atomic():
+            batch = list(
+                OutboxEvent.objects
+                .select_for_update(skip_locked=True)
+                .filter(Q(unhandled_at__isnull=True) | Q(topic__in=list(_handlers)))
+                .order_by('id')
+                .values_list('id', 'topic', 'payload')[:batch_size]
+            )
+            if not batch:
+                break
+
+            by_topic = defaultdict(list)
+            for event_id, topic, payload in batch:
+                by_topic[topic].append((event_id, payload))
+
+            handled, unhandled = [], []
+            for topic, events in by_topic.items():
+                handlers = _handlers.get(topic)
+                ids = [event_id for event_id, _ in events]
+                if not handlers:
+                    logger.warning('No outbox handler for %s, keeping %d events: %s', topic, len(ids), ids)
+                    unhandled.extend(ids)
+                    continue
+                payloads = [{**payload, 'event_id': event_id} for event_id, payload in events]
+                for task in handlers:
+                    task.delay(payloads)
+                handled.extend(ids)
+
+            OutboxEvent.objects.filter(id__in=handled).delete()
+            if unhandled:
+                OutboxEvent.objects.filter(id__in=unhandled).update(unhandled_at=timezone.now())
+
+        dispatched += len(handled)
+        if len(batch) < batch_size:
+            break
+
+    return dispatched
+
+# apps/outbox/events.py
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.1 on 2026-10-19 09:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('outbox', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outboxevent',
+            name='unhandled_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,23 @@
+from django.db import models
+
+class OutboxEvent(models.Model):
+    """
+    Side effect of a write, recorded in the same database transaction as the
+    write itself and dispatched to workers later by the outbox relay
+    """
+    topic = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+    # Set when the relay found no handler for the topic; the event is kept
+    # and dispatched once a handler is registered
+    unhandled_at = models.DateTimeField(blank=True, null=True)
+    
+    class Meta:
+        verbose_name = 'Outbox Event'
+        verbose_name_plural = 'Outbox Events'
+        ordering = ['id']
+    
+    def __str__(self):
+        return f"{self.topic} #{self.id}"
+
+# apps/outbox/models.py
@@ -0,0 +1,10 @@
+from celery import shared_task
+
+from .events import relay
+
+@shared_task
+def relay_outbox():
+    """Dispatch pending outbox events to their handlers"""
+    return relay()
+
+# apps/outbox/tasks.py
@@ -0,0 +1,118 @@
+import datetime
+from collections import defaultdict
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from apps.categories.models import Category
+from apps.notifications.models import Notification
+from apps.transactions.models import Transaction
+from . import events
+from .events import publish, publish_many, register_handler, relay
+from .models import OutboxEvent
+
+class RelayTests(TestCase):
+    """
+    Dispatching outbox events to the handlers registered for their topic
+    """
+
+    def setUp(self):
+        patcher = mock.patch.object(events, '_handlers', defaultdict(list))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_each_topic_is_dispatched_in_one_call(self):
+        created, deleted = mock.Mock(), mock.Mock()
+        register_handler('transaction.created', created)
+        register_handler('transaction.deleted', deleted)
+        first, second = publish_many('transaction.created', [{'transaction_id': 1}, {'transaction_id': 2}])
+        third = publish('transaction.deleted', {'transaction_id': 3})
+
+        self.assertEqual(relay(), 3)
+
+        created.delay.assert_called_once_with([
+            {'transaction_id': 1, 'event_id': first.id},
+            {'transaction_id': 2, 'event_id': second.id},
+        ])
+        deleted.delay.assert_called_once_with([{'transaction_id': 3, 'event_id': third.id}])
+        self.assertFalse(OutboxEvent.objects.exists())
+
+    def test_batches_until_drained(self):
+        handler = mock.Mock()
+        register_handler('transaction.created', handler)
+        publish_many('transaction.created', [{'transaction_id': index} for index in range(5)])
+
+        self.assertEqual(relay(batch_size=2), 5)
+
+        self.assertEqual([len(call.args[0]) for call in handler.delay.call_args_list], [2, 2, 1])
+
+    def test_unhandled_topic_is_kept(self):
+        event = publish('transaction.renamed', {'transaction_id': 1})
+
+        with self.assertLogs('apps.outbox.events', 'WARNING'):
+            self.assertEqual(relay(), 0)
+
+        event.refresh_from_db()
+        self.assertIsNotNone(event.unhandled_at)
+        # Not logged again on the next run
+        with self.assertNoLogs('apps.outbox.events', 'WARNING'):
+            self.assertEqual(relay(), 0)
+
+        # Dispatched once a handler is registered
+        handler = mock.Mock()
+        register_handler('transaction.renamed', handler)
+        self.assertEqual(relay(), 1)
+        handler.delay.assert_called_once_with([{'transaction_id': 1, 'event_id': event.id}])
+        self.assertFalse(OutboxEvent.objects.exists())
+
+    def test_failed_dispatch_keeps_the_events(self):
+        created, deleted = mock.Mock(), mock.Mock()
+        deleted.delay.side_effect = ConnectionError('Broker unavailable')
+        register_handler('transaction.created', created)
+        register_handler('transaction.deleted', deleted)
+        publish_many('transaction.created', [{'transaction_id': 1}, {'transaction_id': 2}])
+        publish('transaction.deleted', {'transaction_id': 3})
+
+        with self.assertRaises(ConnectionError):
+            relay()
+
+        # The batch is rolled back, including the topic dispatched before the failure
+        created.delay.assert_called_once()
+        self.assertEqual(OutboxEvent.objects.filter(unhandled_at__isnull=True).count(), 3)
+
+        deleted.delay.side_effect = None
+        self.assertEqual(relay(), 3)
+
+class RedeliveryTests(TestCase):
+    """
+    Handlers seeing the same events twice, as after a relay whose delete
+    didn't commit
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user('alice', 'alice@example.com', 'password')
+        self.category = Category.objects.create(name='Test food', type='expense', user=self.user)
+
+    def relay_twice(self):
+        pending = list(OutboxEvent.objects.all())
+        relay()
+        OutboxEvent.objects.bulk_create(pending)
+        relay()
+
+    def test_notifications_are_created_once(self):
+        transaction = Transaction.objects.create(
+            user=self.user, category=self.category, title='Lunch', amount=Decimal('12.50'), type='expense',
+            date=datetime.date(2024, 3, 1),
+        )
+
+        self.relay_twice()
+
+        self.assertFalse(OutboxEvent.objects.exists())
+        self.assertEqual(
+            Notification.objects.filter(dedupe_key=f'transaction.created:{transaction.id}').count(), 1
+        )
+        self.assertEqual(Notification.objects.filter(dedupe_key=f'welcome:{self.user.pk}').count(), 1)
+
+# apps/outbox/tests.py
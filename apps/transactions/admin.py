@@ -1,5 +1,6 @@
 from django.contrib import admin
-from .models import Transaction
+from utils.pagination import EstimatedCountPaginator
+from .models import Transaction, RecurringTransaction
 
 @admin.register(Transaction)
 class TransactionAdmin(admin.ModelAdmin):
@@ -9,6 +10,12 @@ class TransactionAdmin(admin.ModelAdmin):
     ordering = ['-date', '-created_at']
     readonly_fields = ['created_at', 'updated_at']
     date_hierarchy = 'date'
+    list_select_related = ['user', 'category']
+    raw_id_fields = ['user', 'category']
+    
+    # Avoid exact COUNT(*) scans on the changelist
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     
     fieldsets = (
         (None, {
@@ -23,8 +30,14 @@ class TransactionAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         }),
     )
-    
-    def get_queryset(self, request):
-        return super().get_queryset(request).select_related('user', 'category')
+
+@admin.register(RecurringTransaction)
+class RecurringTransactionAdmin(admin.ModelAdmin):
+    list_display = ['title', 'amount', 'type', 'frequency', 'interval', 'user', 'next_run_date', 'is_active']
+    list_filter = ['type', 'frequency', 'is_active']
+    search_fields = ['title', 'description', 'user__username', 'category__name']
+    readonly_fields = ['last_run_date', 'created_at', 'updated_at']
+    list_select_related = ['user', 'category']
+    raw_id_fields = ['user', 'category']
 
 # apps/transactions/admin.py
\ No newline at end of file
@@ -5,5 +5,11 @@ class TransactionsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.transactions'
     verbose_name = 'Transactions'
+    
+    def ready(self):
+        """
+        Import signal handlers when the app is ready
+        """
+        import apps.transactions.signals
 
-# apps/transactions/apps.py
\ No newline at end of file
+# apps/transactions/apps.py
@@ -0,0 +1,18 @@
+"""
+Outbox payloads describing transaction writes.
+"""
+
+def created_payload(transaction):
+    """Payload of a 'transaction.created' event"""
+    return {
+        'transaction_id': transaction.id,
+        'user_id': transaction.user_id,
+        'title': transaction.title,
+        'type': transaction.type,
+        'amount': str(transaction.amount),
+        'currency': transaction.currency,
+        'category_id': transaction.category_id,
+        'category': transaction.category.name,
+    }
+
+# apps/transactions/events.py
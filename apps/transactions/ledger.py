@@ -0,0 +1,225 @@
+"""
+Maintenance of the per-user, per-currency `LedgerSummary`.
+
+Every transaction write applies a delta to the owner's summary for the
+transaction's currency with a single F()-expression UPDATE, so concurrent
+writes never lose increments. First/last transaction dates only need a
+lookup over the user's rows when the removed transaction was on one of
+those dates, and that lookup runs inside the same UPDATE.
+
+A missing summary row is created from the user's transactions with
+get_or_create in a savepoint. When two first writes race, the loser
+waits on the winner's INSERT, sees its row and applies a plain delta, so
+neither fails on the unique (user, currency) constraint.
+
+Writes that bypass signals (queryset.update(), bulk_create) must call
+`apply_transactions` themselves; `verify_ledger_summaries` repairs drift.
+"""
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import models, transaction
+from django.db.models import Case, Count, F, Max, Min, OuterRef, Q, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce, Greatest, Least
+from django.utils import timezone
+
+from apps.currencies.conversion import converted_sums, user_currency
+from .models import LedgerSummary, Transaction
+
+TOTAL_FIELDS = {'income': 'total_income', 'expense': 'total_expenses'}
+COUNT_FIELDS = {'income': 'income_count', 'expense': 'expense_count'}
+
+def _user_transactions_date(aggregate):
+    """Subquery returning Min/Max of the user's transaction dates in the summary's currency"""
+    return Subquery(
+        Transaction.objects.filter(user_id=OuterRef('user_id'), currency=OuterRef('currency'))
+        .order_by()
+        .values('user_id')
+        .annotate(value=aggregate('date'))
+        .values('value')[:1]
+    )
+
+def _apply(user_id, currency, transaction_type, amount, count, date, last_date=None):
+    """
+    Apply one delta to a user's summary. Added transactions span `date` to
+    `last_date`; a removed one sits on `date`. Returns False if the user has
+    no summary row for the currency yet.
+    """
+    total_field = TOTAL_FIELDS[transaction_type]
+    count_field = COUNT_FIELDS[transaction_type]
+    date_value = Value(date, output_field=models.DateField())
+    last_value = Value(last_date or date, output_field=models.DateField())
+
+    updates = {
+        total_field: F(total_field) + amount,
+        count_field: F(count_field) + count,
+        'updated_at': timezone.now(),
+    }
+    if count > 0:
+        updates['first_transaction_date'] = Least(Coalesce('first_transaction_date', date_value), date_value)
+        updates['last_transaction_date'] = Greatest(Coalesce('last_transaction_date', last_value), last_value)
+    else:
+        # Removing a row only moves the bounds if it sat on one of them
+        updates['first_transaction_date'] = Case(
+            When(first_transaction_date=date_value, then=_user_transactions_date(Min)),
+            default=F('first_transaction_date'),
+        )
+        updates['last_transaction_date'] = Case(
+            When(last_transaction_date=date_value, then=_user_transactions_date(Max)),
+            default=F('last_transaction_date'),
+        )
+
+    return LedgerSummary.objects.filter(user_id=user_id, currency=currency).update(**updates) > 0
+
+def _create_summary(user_id, currency):
+    """
+    Create a missing summary from the user's transactions in `currency`,
+    which already include the current write. Returns False if a
+    concurrent writer created it first; its row doesn't include this
+    write yet.
+    """
+    totals = compute_totals(Transaction.objects.filter(user_id=user_id, currency=currency).order_by())
+    _, created = LedgerSummary.objects.get_or_create(user_id=user_id, currency=currency, defaults=totals)
+    return created
+
+def apply_delta(user_id, currency, transaction_type, amount, count, date, rebuild_missing=True):
+    """
+    Add (count=1) or remove (count=-1) a transaction's contribution to the
+    user's summary. A missing summary is created from the user's
+    transactions, which already reflect the current write.
+    """
+    amount = Decimal(amount) * count
+    if _apply(user_id, currency, transaction_type, amount, count, date) or not rebuild_missing:
+        return
+    if not _create_summary(user_id, currency):
+        _apply(user_id, currency, transaction_type, amount, count, date)
+
+def record_change(instance, created=False, deleted=False):
+    """Update the ledger for a saved or deleted transaction instance"""
+    with transaction.atomic():
+        if not created:
+            old_user_id = instance.get_loaded_value('user_id')
+            if old_user_id is None:
+                # Instance was never loaded from the database; recompute
+                rebuild(instance.user_id)
+                return
+            if not deleted and not instance.get_changed_fields():
+                return
+            apply_delta(
+                old_user_id,
+                instance.get_loaded_value('currency'),
+                instance.get_loaded_value('type'),
+                instance.get_loaded_value('amount'),
+                -1,
+                instance.get_loaded_value('date'),
+                # The summary may already be gone when the user is being deleted
+                rebuild_missing=not deleted,
+            )
+        if not deleted:
+            apply_delta(instance.user_id, instance.currency, instance.type, instance.amount, 1, instance.date)
+
+def apply_transactions(transactions):
+    """
+    Add newly inserted transactions to their owners' summaries with one
+    UPDATE per (user, currency, type), for writers that use bulk_create
+    """
+    grouped = defaultdict(lambda: [Decimal('0'), 0, None, None])
+    for obj in transactions:
+        entry = grouped[(obj.user_id, obj.currency, obj.type)]
+        entry[0] += Decimal(obj.amount)
+        entry[1] += 1
+        entry[2] = obj.date if entry[2] is None else min(entry[2], obj.date)
+        entry[3] = obj.date if entry[3] is None else max(entry[3], obj.date)
+
+    created = set()
+    with transaction.atomic():
+        for (user_id, currency, transaction_type), (amount, count, first, last) in grouped.items():
+            # A newly created summary already counted every type in its currency
+            if (user_id, currency) in created:
+                continue
+            if _apply(user_id, currency, transaction_type, amount, count, first, last):
+                continue
+            if _create_summary(user_id, currency):
+                created.add((user_id, currency))
+            else:
+                _apply(user_id, currency, transaction_type, amount, count, first, last)
+
+def ledger_aggregates():
+    """Conditional aggregates producing every summary field"""
+    return {
+        'total_income': Coalesce(Sum('amount', filter=Q(type='income')), Decimal('0'), output_field=models.DecimalField()),
+        'total_expenses': Coalesce(Sum('amount', filter=Q(type='expense')), Decimal('0'), output_field=models.DecimalField()),
+        'income_count': Count('id', filter=Q(type='income')),
+        'expense_count': Count('id', filter=Q(type='expense')),
+        'first_transaction_date': Min('date'),
+        'last_transaction_date': Max('date'),
+    }
+
+def compute_totals(queryset):
+    """Aggregate ledger fields over a transaction queryset in one query"""
+    return queryset.aggregate(**ledger_aggregates())
+
+def rebuild(user_id):
+    """Recompute a user's summaries from their transactions, one per currency"""
+    rows = (
+        Transaction.objects.filter(user_id=user_id)
+        .order_by()
+        .values('currency')
+        .annotate(**ledger_aggregates())
+    )
+    summaries = [LedgerSummary(user_id=user_id, **totals) for totals in rows]
+    # An upsert, so concurrent rebuilds (e.g. two first dashboard loads) don't collide
+    LedgerSummary.objects.bulk_create(
+        summaries,
+        update_conflicts=True,
+        unique_fields=['user', 'currency'],
+        update_fields=[*ledger_aggregates(), 'updated_at'],
+    )
+    LedgerSummary.objects.filter(user_id=user_id).exclude(currency__in=[s.currency for s in summaries]).delete()
+    return list(LedgerSummary.objects.filter(user_id=user_id))
+
+def get_summaries(user):
+    """Return the user's ledger summaries, building them on first access"""
+    summaries = list(LedgerSummary.objects.filter(user=user))
+    if not summaries and Transaction.objects.filter(user=user).exists():
+        summaries = rebuild(user.pk)
+    return summaries
+
+def converted_totals(user, queryset=None):
+    """
+    Income/expense totals and counts in the user's currency, over
+    `queryset` or all time. All-time totals come straight from the ledger
+    unless the user holds transactions in other currencies.
+    """
+    target = user_currency(user)
+    if queryset is None:
+        summaries = get_summaries(user)
+        counts = {
+            'income_count': sum(summary.income_count for summary in summaries),
+            'expense_count': sum(summary.expense_count for summary in summaries),
+        }
+        if all(summary.currency == target for summary in summaries):
+            return {
+                'currency': target,
+                'total_income': sum((summary.total_income for summary in summaries), Decimal('0')),
+                'total_expenses': sum((summary.total_expenses for summary in summaries), Decimal('0')),
+                'unconverted_currencies': [],
+                **counts,
+            }
+        queryset = Transaction.objects.filter(user=user)
+    else:
+        counts = queryset.order_by().aggregate(
+            income_count=Count('id', filter=Q(type='income')),
+            expense_count=Count('id', filter=Q(type='expense')),
+        )
+
+    sums, missing = converted_sums(queryset, target, ['type'])
+    return {
+        'currency': target,
+        'total_income': sums.get(('income',), Decimal('0')),
+        'total_expenses': sums.get(('expense',), Decimal('0')),
+        'unconverted_currencies': sorted(missing),
+        **counts,
+    }
+
+# apps/transactions/ledger.py
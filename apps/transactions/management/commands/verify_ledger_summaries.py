@@ -0,0 +1,108 @@
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+
+from apps.transactions.ledger import ledger_aggregates, rebuild
+from apps.transactions.models import LedgerSummary, Transaction
+
+LEDGER_FIELDS = (
+    'total_income', 'total_expenses', 'income_count', 'expense_count',
+    'first_transaction_date', 'last_transaction_date',
+)
+
+EMPTY_TOTALS = {
+    'total_income': Decimal('0'),
+    'total_expenses': Decimal('0'),
+    'income_count': 0,
+    'expense_count': 0,
+    'first_transaction_date': None,
+    'last_transaction_date': None,
+}
+
+
+class Command(BaseCommand):
+    help = 'Compare ledger summaries against a full recompute from transactions'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--fix',
+            action='store_true',
+            help='Rebuild summaries that are missing or out of date',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=1000,
+            help='Number of users checked per query (default: 1000)',
+        )
+
+    def handle(self, *args, **options):
+        fix = options['fix']
+        chunk_size = options['chunk_size']
+        self.stdout.write('Verifying ledger summaries...')
+
+        checked = 0
+        mismatched = 0
+        last_id = 0
+
+        while True:
+            user_ids = list(
+                User.objects.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)[:chunk_size]
+            )
+            if not user_ids:
+                break
+            last_id = user_ids[-1]
+
+            # One grouped recompute and one summary lookup per chunk
+            expected = {
+                (row.pop('user_id'), row.pop('currency')): row
+                for row in (
+                    Transaction.objects.filter(user_id__in=user_ids)
+                    .order_by()
+                    .values('user_id', 'currency')
+                    .annotate(**ledger_aggregates())
+                )
+            }
+            stored = {
+                (summary['user_id'], summary['currency']): summary
+                for summary in LedgerSummary.objects.filter(user_id__in=user_ids).values('user_id', 'currency', *LEDGER_FIELDS)
+            }
+
+            users_with_summaries = {user_id for user_id, _ in stored}
+            stale_users = set()
+            for key in sorted(set(expected) | set(stored)):
+                user_id, currency = key
+                totals = expected.get(key, EMPTY_TOTALS)
+                summary = stored.get(key)
+                if summary is not None and all(summary[field] == totals[field] for field in LEDGER_FIELDS):
+                    continue
+                if summary is None and user_id not in users_with_summaries:
+                    # No summaries at all yet; built on first access
+                    continue
+
+                mismatched += 1
+                stale_users.add(user_id)
+                if summary is None:
+                    self.stdout.write(self.style.WARNING(f'User {user_id} {currency}: missing summary'))
+                else:
+                    diffs = ', '.join(
+                        f'{field} {summary[field]} != {totals[field]}'
+                        for field in LEDGER_FIELDS if summary[field] != totals[field]
+                    )
+                    self.stdout.write(self.style.WARNING(f'User {user_id} {currency}: {diffs}'))
+
+            if fix:
+                for user_id in stale_users:
+                    rebuild(user_id)
+
+            checked += len(user_ids)
+
+        action = 'rebuilt' if fix else 'out of date'
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Ledger verification completed! Checked: {checked}, {action}: {mismatched}'
+            )
+        )
+
+# apps/transactions/management/commands/verify_ledger_summaries.py
@@ -0,0 +1,57 @@
+# Generated by Django 5.0.1 on 2026-10-19 08:52
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+from django.db.models.functions import Upper
+
+
+def copy_profile_currency(apps, schema_editor):
+    """Existing amounts were entered in their owner's profile currency"""
+    UserProfile = apps.get_model('authentication', 'UserProfile')
+    profile_currency = Upper(Subquery(
+        UserProfile.objects.filter(user_id=OuterRef('user_id')).values('currency')[:1]
+    ))
+    for model_name in ('Transaction', 'RecurringTransaction', 'LedgerSummary'):
+        model = apps.get_model('transactions', model_name)
+        model.objects.filter(
+            user__profile__isnull=False
+        ).update(currency=profile_currency)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transactions', '0003_recurringtransaction_transaction_recurring_rule_and_more'),
+        ('authentication', '0002_alter_userprofile_currency'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ledgersummary',
+            name='currency',
+            field=models.CharField(default='USD', max_length=3),
+        ),
+        migrations.AddField(
+            model_name='recurringtransaction',
+            name='currency',
+            field=models.CharField(default='USD', help_text='Currency code of the amount', max_length=3),
+        ),
+        migrations.AddField(
+            model_name='transaction',
+            name='currency',
+            field=models.CharField(default='USD', help_text='Currency code of the amount', max_length=3),
+        ),
+        migrations.RunPython(copy_profile_currency, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='ledgersummary',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ledger_summaries', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterUniqueTogether(
+            name='ledgersummary',
+            unique_together={('user', 'currency')},
+        ),
+    ]
@@ -0,0 +1,34 @@
+from dateutil.relativedelta import relativedelta
+from django.db import migrations
+
+
+def reschedule_yearly_rules(apps, schema_editor):
+    """
+    Yearly rules whose day_of_month fell before the start day were first
+    scheduled a month after the start month; move those that haven't run
+    yet to the start month of the following year
+    """
+    RecurringTransaction = apps.get_model('transactions', 'RecurringTransaction')
+    rules = RecurringTransaction.objects.filter(
+        frequency='yearly', day_of_month__isnull=False, last_run_date__isnull=True, is_active=True,
+    )
+    for rule in rules:
+        date = rule.start_date + relativedelta(day=rule.day_of_month)
+        if date >= rule.start_date:
+            continue
+        rule.next_run_date = date + relativedelta(years=1, day=rule.day_of_month)
+        if rule.end_date and rule.next_run_date > rule.end_date:
+            rule.next_run_date = None
+            rule.is_active = False
+        rule.save(update_fields=['next_run_date', 'is_active'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transactions', '0004_ledgersummary_currency_recurringtransaction_currency_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(reschedule_yearly_rules, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,9 @@
 from django.db import models
 from django.contrib.auth.models import User
 from apps.categories.models import Category
+from utils.models import TrackedFieldsMixin
 
-class Transaction(models.Model):
+class Transaction(TrackedFieldsMixin, models.Model):
     """
     Transaction model for income and expenses
     """
@@ -14,19 +15,33 @@ class Transaction(models.Model):
     title = models.CharField(max_length=200)
     description = models.TextField(blank=True)
     amount = models.DecimalField(max_digits=12, decimal_places=2)
+    currency = models.CharField(max_length=3, default='USD', help_text='Currency code of the amount')
     type = models.CharField(max_length=7, choices=TYPE_CHOICES)
     category = models.ForeignKey(Category, on_delete=models.CASCADE, related_name='transactions')
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='transactions')
     date = models.DateField()
     receipt = models.ImageField(upload_to='receipts/', blank=True, null=True)
     metadata = models.JSONField(blank=True, null=True)  # For additional data
+    recurring_rule = models.ForeignKey(
+        'RecurringTransaction', on_delete=models.SET_NULL, null=True, blank=True, related_name='transactions'
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    # Fields the ledger summary is derived from
+    tracked_fields = ('user_id', 'currency', 'type', 'amount', 'date')
+    
     class Meta:
         verbose_name = 'Transaction'
         verbose_name_plural = 'Transactions'
         ordering = ['-date', '-created_at']
+        indexes = [
+            models.Index(fields=['user', 'date']),
+        ]
+        constraints = [
+            # A rule generates at most one transaction per occurrence date
+            models.UniqueConstraint(fields=['recurring_rule', 'date'], name='unique_recurring_occurrence'),
+        ]
     
     def __str__(self):
         return f"{self.title} - {self.amount} ({self.type})"
@@ -39,4 +54,83 @@ class Transaction(models.Model):
     def is_income(self):
         return self.type == 'income'
 
+class RecurringTransaction(models.Model):
+    """
+    Rule that generates a transaction every `interval` days, weeks, months
+    or years from `start_date` until `end_date`
+    """
+    FREQUENCY_CHOICES = [
+        ('daily', 'Daily'),
+        ('weekly', 'Weekly'),
+        ('monthly', 'Monthly'),
+        ('yearly', 'Yearly'),
+    ]
+    
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='recurring_transactions')
+    category = models.ForeignKey(Category, on_delete=models.CASCADE, related_name='recurring_transactions')
+    title = models.CharField(max_length=200)
+    description = models.TextField(blank=True)
+    amount = models.DecimalField(max_digits=12, decimal_places=2)
+    currency = models.CharField(max_length=3, default='USD', help_text='Currency code of the amount')
+    type = models.CharField(max_length=7, choices=Transaction.TYPE_CHOICES)
+    frequency = models.CharField(max_length=10, choices=FREQUENCY_CHOICES, default='monthly')
+    interval = models.PositiveIntegerField(default=1)
+    # Monthly/yearly rules land on this day, or the last day of shorter months
+    day_of_month = models.PositiveSmallIntegerField(null=True, blank=True)
+    start_date = models.DateField()
+    end_date = models.DateField(null=True, blank=True)
+    next_run_date = models.DateField(null=True, blank=True)
+    last_run_date = models.DateField(null=True, blank=True)
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = 'Recurring Transaction'
+        verbose_name_plural = 'Recurring Transactions'
+        ordering = ['next_run_date', 'id']
+        indexes = [
+            # Each generation tick only scans rules that are due
+            models.Index(
+                fields=['next_run_date'],
+                name='recurring_due_idx',
+                condition=models.Q(is_active=True),
+            ),
+        ]
+    
+    def __str__(self):
+        return f"{self.title} - {self.amount} every {self.interval} {self.frequency}"
+
+class LedgerSummary(models.Model):
+    """
+    Denormalized all-time totals of a user's transactions in one currency,
+    kept in step with every create/update/delete so the all-time dashboard
+    is a single indexed lookup
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='ledger_summaries')
+    currency = models.CharField(max_length=3, default='USD')
+    total_income = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    total_expenses = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    income_count = models.IntegerField(default=0)
+    expense_count = models.IntegerField(default=0)
+    first_transaction_date = models.DateField(null=True, blank=True)
+    last_transaction_date = models.DateField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = 'Ledger Summary'
+        verbose_name_plural = 'Ledger Summaries'
+        unique_together = ['user', 'currency']
+    
+    def __str__(self):
+        return f"{self.user.username}'s {self.currency} Ledger Summary"
+    
+    @property
+    def balance(self):
+        return self.total_income - self.total_expenses
+    
+    @property
+    def transaction_count(self):
+        return self.income_count + self.expense_count
+
 # apps/transactions/models.py
\ No newline at end of file
@@ -0,0 +1,147 @@
+"""
+Generation of transactions from `RecurringTransaction` rules.
+
+Every active rule stores the date of its next occurrence. The periodic
+task selects only rules whose `next_run_date` has passed (through a
+partial index), locks them with SKIP LOCKED so concurrent workers split
+the work, and inserts all of a batch's occurrences with one bulk_create.
+Occurrences missed while workers were down are generated on the next
+tick; the unique (rule, date) constraint plus a pre-insert lookup make
+re-running a tick harmless.
+"""
+import datetime
+
+from dateutil.relativedelta import relativedelta
+from django.db import transaction
+from django.utils import timezone
+
+from apps.categories.stats import invalidate_category_stats
+from apps.outbox.events import publish_many
+from .events import created_payload
+from .ledger import apply_transactions
+from .models import RecurringTransaction, Transaction
+
+GENERATION_BATCH_SIZE = 500
+
+# Occurrences generated per rule per pass, so one long-idle daily rule
+# can't make a batch unbounded; the remainder follows in the next pass
+MAX_OCCURRENCES_PER_PASS = 366
+
+def next_occurrence(rule, date):
+    """The occurrence after `date`"""
+    if rule.frequency == 'daily':
+        return date + datetime.timedelta(days=rule.interval)
+    if rule.frequency == 'weekly':
+        return date + datetime.timedelta(weeks=rule.interval)
+    # relativedelta clamps the day to the end of shorter months
+    day = rule.day_of_month or rule.start_date.day
+    if rule.frequency == 'yearly':
+        return date + relativedelta(years=rule.interval, month=rule.start_date.month, day=day)
+    return date + relativedelta(months=rule.interval, day=day)
+
+def first_occurrence(rule, on_or_after=None):
+    """The first occurrence on or after `on_or_after` (default: the start date)"""
+    date = rule.start_date
+    if rule.day_of_month and rule.frequency in ('monthly', 'yearly'):
+        date = date + relativedelta(day=rule.day_of_month)
+        if date < rule.start_date:
+            # Yearly rules stay in the start month, as next_occurrence does
+            step = relativedelta(years=1) if rule.frequency == 'yearly' else relativedelta(months=1)
+            date = date + step + relativedelta(day=rule.day_of_month)
+    while on_or_after and date < on_or_after:
+        date = next_occurrence(rule, date)
+    return date
+
+def schedule(rule):
+    """
+    Set `next_run_date` after a rule is created or its schedule changes.
+    Dates already generated are not generated again.
+    """
+    after = rule.last_run_date + datetime.timedelta(days=1) if rule.last_run_date else None
+    rule.next_run_date = first_occurrence(rule, after)
+    if rule.end_date and rule.next_run_date > rule.end_date:
+        rule.next_run_date = None
+
+def _due_occurrences(rule, today):
+    """Dates due for a rule, advancing its next_run_date past them"""
+    dates = []
+    while (
+        rule.next_run_date is not None
+        and rule.next_run_date <= today
+        and len(dates) < MAX_OCCURRENCES_PER_PASS
+    ):
+        dates.append(rule.next_run_date)
+        rule.last_run_date = rule.next_run_date
+        rule.next_run_date = next_occurrence(rule, rule.next_run_date)
+        if rule.end_date and rule.next_run_date > rule.end_date:
+            rule.next_run_date = None
+    if rule.next_run_date is None:
+        rule.is_active = False
+    return dates
+
+def generate_due_transactions(today=None, batch_size=GENERATION_BATCH_SIZE):
+    """
+    Create the transactions of every rule due on or before `today`.
+    Returns the number of transactions created.
+    """
+    today = today or timezone.localdate()
+    created_count = 0
+
+    while True:
+        with transaction.atomic():
+            rules = list(
+                RecurringTransaction.objects
+                .select_for_update(skip_locked=True, of=('self',))
+                .select_related('category')
+                .filter(is_active=True, next_run_date__lte=today)
+                .order_by('next_run_date', 'id')[:batch_size]
+            )
+            if not rules:
+                break
+
+            occurrences = [(rule, date) for rule in rules for date in _due_occurrences(rule, today)]
+
+            # Skip occurrences a previous, partially applied run already inserted
+            existing = set(
+                Transaction.objects.filter(
+                    recurring_rule__in=rules,
+                    date__gte=min(date for _, date in occurrences),
+                ).values_list('recurring_rule_id', 'date')
+            ) if occurrences else set()
+
+            created = Transaction.objects.bulk_create([
+                Transaction(
+                    user_id=rule.user_id,
+                    category=rule.category,
+                    recurring_rule=rule,
+                    title=rule.title,
+                    description=rule.description,
+                    amount=rule.amount,
+                    currency=rule.currency,
+                    type=rule.type,
+                    date=date,
+                )
+                for rule, date in occurrences
+                if (rule.pk, date) not in existing
+            ])
+
+            # bulk_create skips signals; apply their effects for the whole batch
+            apply_transactions(created)
+            for user_id in {obj.user_id for obj in created}:
+                invalidate_category_stats(user_id)
+            publish_many('transaction.created', [created_payload(obj) for obj in created])
+
+            now = timezone.now()
+            for rule in rules:
+                rule.updated_at = now
+            RecurringTransaction.objects.bulk_update(
+                rules, ['next_run_date', 'last_run_date', 'is_active', 'updated_at']
+            )
+
+        created_count += len(created)
+        if len(rules) < batch_size:
+            break
+
+    return created_count
+
+# apps/transactions/recurring.py
@@ -1,5 +1,8 @@
 from rest_framework import serializers
-from .models import Transaction
+from .models import Transaction, LedgerSummary, RecurringTransaction
+from .recurring import schedule
+from apps.currencies.conversion import user_currency
+from apps.currencies.serializers import validate_currency_code
 from apps.categories.models import Category
 from apps.categories.serializers import CategorySerializer
 
@@ -12,10 +15,10 @@ class TransactionSerializer(serializers.ModelSerializer):
     class Meta:
         model = Transaction
         fields = [
-            'id', 'title', 'description', 'amount', 'type', 'category',
-            'date', 'receipt', 'metadata', 'created_at', 'updated_at'
+            'id', 'title', 'description', 'amount', 'currency', 'type', 'category',
+            'date', 'receipt', 'metadata', 'recurring_rule', 'created_at', 'updated_at'
         ]
-        read_only_fields = ['id', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'recurring_rule', 'created_at', 'updated_at']
     
     def get_category(self, obj):
         """
@@ -31,7 +34,10 @@ class TransactionCreateSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Transaction
-        fields = ['title', 'description', 'amount', 'type', 'category', 'date', 'receipt', 'metadata']
+        fields = ['title', 'description', 'amount', 'currency', 'type', 'category', 'date', 'receipt', 'metadata']
+    
+    def validate_currency(self, value):
+        return validate_currency_code(value)
     
     def validate_category(self, value):
         """
@@ -61,6 +67,7 @@ class TransactionCreateSerializer(serializers.ModelSerializer):
     
     def create(self, validated_data):
         validated_data['user'] = self.context['request'].user
+        validated_data.setdefault('currency', user_currency(validated_data['user']))
         return super().create(validated_data)
 
 class TransactionUpdateSerializer(serializers.ModelSerializer):
@@ -71,7 +78,10 @@ class TransactionUpdateSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Transaction
-        fields = ['title', 'description', 'amount', 'type', 'category', 'date', 'receipt', 'metadata']
+        fields = ['title', 'description', 'amount', 'currency', 'type', 'category', 'date', 'receipt', 'metadata']
+    
+    def validate_currency(self, value):
+        return validate_currency_code(value)
     
     def validate_category(self, value):
         """
@@ -109,12 +119,15 @@ class TransactionDetailSerializer(serializers.ModelSerializer):
     class Meta:
         model = Transaction
         fields = [
-            'id', 'title', 'description', 'amount', 'type', 'category', 
+            'id', 'title', 'description', 'amount', 'currency', 'type', 'category', 
             'category_details', 'date', 'receipt', 'metadata', 
             'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
     
+    def validate_currency(self, value):
+        return validate_currency_code(value)
+    
     def validate_category(self, value):
         """
         Validate that the category exists and belongs to the user
@@ -141,4 +154,107 @@ class TransactionDetailSerializer(serializers.ModelSerializer):
         
         return attrs
 
-# apps/transactions/serializers.py 
\ No newline at end of file
+class RecurringTransactionSerializer(serializers.ModelSerializer):
+    """
+    Serializer for recurring transaction rules
+    """
+    category = serializers.CharField()
+    
+    # Changing any of these moves the next occurrence
+    SCHEDULE_FIELDS = ('frequency', 'interval', 'day_of_month', 'start_date', 'end_date', 'is_active')
+    
+    class Meta:
+        model = RecurringTransaction
+        fields = [
+            'id', 'title', 'description', 'amount', 'currency', 'type', 'category',
+            'frequency', 'interval', 'day_of_month', 'start_date', 'end_date',
+            'next_run_date', 'last_run_date', 'is_active', 'created_at', 'updated_at'
+        ]
+        read_only_fields = ['id', 'next_run_date', 'last_run_date', 'created_at', 'updated_at']
+    
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        data['category'] = instance.category.name
+        return data
+    
+    def validate_currency(self, value):
+        return validate_currency_code(value)
+    
+    def validate_category(self, value):
+        """
+        Validate and get the category object
+        """
+        user = self.context['request'].user
+        try:
+            category = Category.objects.get(name=value, user=user, is_active=True)
+            return category
+        except Category.DoesNotExist:
+            raise serializers.ValidationError(f"Category '{value}' not found or inactive.")
+    
+    def validate_interval(self, value):
+        if value < 1:
+            raise serializers.ValidationError("Interval must be at least 1.")
+        return value
+    
+    def validate_day_of_month(self, value):
+        if value is not None and not 1 <= value <= 31:
+            raise serializers.ValidationError("Day of month must be between 1 and 31.")
+        return value
+    
+    def validate(self, attrs):
+        """
+        Validate rule data
+        """
+        def current(field):
+            return attrs.get(field, getattr(self.instance, field, None))
+        
+        category = current('category')
+        transaction_type = current('type')
+        
+        # Ensure transaction type matches category type
+        if category and category.type != transaction_type:
+            raise serializers.ValidationError(
+                f"Transaction type '{transaction_type}' does not match category type '{category.type}'."
+            )
+        
+        start_date, end_date = current('start_date'), current('end_date')
+        if end_date and start_date and end_date < start_date:
+            raise serializers.ValidationError("End date must be on or after the start date.")
+        
+        return attrs
+    
+    def create(self, validated_data):
+        validated_data['user'] = self.context['request'].user
+        validated_data.setdefault('currency', user_currency(validated_data['user']))
+        rule = RecurringTransaction(**validated_data)
+        schedule(rule)
+        rule.is_active = rule.is_active and rule.next_run_date is not None
+        rule.save()
+        return rule
+    
+    def update(self, instance, validated_data):
+        rescheduled = any(field in validated_data for field in self.SCHEDULE_FIELDS)
+        for field, value in validated_data.items():
+            setattr(instance, field, value)
+        if rescheduled:
+            schedule(instance)
+            instance.is_active = instance.is_active and instance.next_run_date is not None
+        instance.save()
+        return instance
+
+class LedgerSummarySerializer(serializers.ModelSerializer):
+    """
+    Serializer for a user's all-time ledger summary
+    """
+    balance = serializers.DecimalField(max_digits=16, decimal_places=2, read_only=True)
+    transaction_count = serializers.IntegerField(read_only=True)
+    
+    class Meta:
+        model = LedgerSummary
+        fields = [
+            'currency', 'total_income', 'total_expenses', 'balance', 'income_count', 'expense_count',
+            'transaction_count', 'first_transaction_date', 'last_transaction_date', 'updated_at'
+        ]
+        read_only_fields = fields
+
+# apps/transactions/serializers.py 
@@ -0,0 +1,21 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .ledger import record_change
+from .models import Transaction
+
+@receiver(post_save, sender=Transaction)
+def update_ledger_on_save(sender, instance, created, **kwargs):
+    """
+    Keep the owner's ledger summary in step with created/updated transactions
+    """
+    record_change(instance, created=created)
+
+@receiver(post_delete, sender=Transaction)
+def update_ledger_on_delete(sender, instance, **kwargs):
+    """
+    Remove a deleted transaction from the owner's ledger summary
+    """
+    record_change(instance, deleted=True)
+
+# apps/transactions/signals.py
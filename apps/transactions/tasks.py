@@ -0,0 +1,10 @@
+from celery import shared_task
+
+from .recurring import generate_due_transactions
+
+@shared_task
+def generate_recurring_transactions():
+    """Create the transactions of every recurring rule that is due"""
+    return generate_due_transactions()
+
+# apps/transactions/tasks.py
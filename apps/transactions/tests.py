@@ -1,5 +1,295 @@
+import datetime
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+import redis
+from django.contrib.auth.models import User
+from django.core.management import call_command
 from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.categories.models import Category
+from utils.throttling import HierarchicalRateThrottle
+from . import views
+from .models import LedgerSummary, RecurringTransaction, Transaction
+from .recurring import generate_due_transactions, schedule
+
+class LedgerSummaryTests(TestCase):
+    """
+    Ledger deltas applied by the Transaction signals
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user('alice', 'alice@example.com', 'password')
+        self.salary = Category.objects.create(name='Test salary', type='income', user=self.user)
+        self.food = Category.objects.create(name='Test food', type='expense', user=self.user)
+
+    def add(self, amount, type='expense', date=datetime.date(2024, 3, 10), currency='USD'):
+        category = self.salary if type == 'income' else self.food
+        return Transaction.objects.create(
+            user=self.user, category=category, title='Test', amount=Decimal(amount),
+            currency=currency, type=type, date=date,
+        )
+
+    def summary(self, currency='USD'):
+        return LedgerSummary.objects.get(user=self.user, currency=currency)
+
+    def test_create(self):
+        self.add('1000.00', type='income', date=datetime.date(2024, 3, 1))
+        self.add('25.50', date=datetime.date(2024, 3, 5))
+        self.add('4.50', date=datetime.date(2024, 2, 20))
+
+        summary = self.summary()
+        self.assertEqual(summary.total_income, Decimal('1000.00'))
+        self.assertEqual(summary.total_expenses, Decimal('30.00'))
+        self.assertEqual((summary.income_count, summary.expense_count), (1, 2))
+        self.assertEqual(summary.first_transaction_date, datetime.date(2024, 2, 20))
+        self.assertEqual(summary.last_transaction_date, datetime.date(2024, 3, 5))
+
+    def test_update(self):
+        self.add('10.00', date=datetime.date(2024, 3, 1))
+        obj = self.add('20.00', date=datetime.date(2024, 3, 5))
+
+        obj = Transaction.objects.get(pk=obj.pk)
+        obj.amount = Decimal('35.00')
+        obj.date = datetime.date(2024, 4, 1)
+        obj.save()
+
+        summary = self.summary()
+        self.assertEqual(summary.total_expenses, Decimal('45.00'))
+        self.assertEqual(summary.expense_count, 2)
+        self.assertEqual(summary.last_transaction_date, datetime.date(2024, 4, 1))
+
+        obj.type = 'income'
+        obj.category = self.salary
+        obj.save()
+
+        summary = self.summary()
+        self.assertEqual(summary.total_income, Decimal('35.00'))
+        self.assertEqual(summary.total_expenses, Decimal('10.00'))
+        self.assertEqual((summary.income_count, summary.expense_count), (1, 1))
+
+    def test_currency_change_moves_between_summaries(self):
+        self.add('10.00')
+        obj = self.add('20.00')
+
+        obj = Transaction.objects.get(pk=obj.pk)
+        obj.currency = 'EUR'
+        obj.save()
+
+        self.assertEqual(self.summary('USD').total_expenses, Decimal('10.00'))
+        self.assertEqual(self.summary('EUR').total_expenses, Decimal('20.00'))
+        self.assertEqual(self.summary('EUR').expense_count, 1)
+
+    def test_delete(self):
+        self.add('10.00', date=datetime.date(2024, 3, 1))
+        last = self.add('20.00', date=datetime.date(2024, 3, 5))
+
+        Transaction.objects.get(pk=last.pk).delete()
+
+        summary = self.summary()
+        self.assertEqual(summary.total_expenses, Decimal('10.00'))
+        self.assertEqual(summary.expense_count, 1)
+        # The last date falls back to the remaining transaction
+        self.assertEqual(summary.last_transaction_date, datetime.date(2024, 3, 1))
+
+    def test_delete_all(self):
+        obj = self.add('10.00')
+
+        Transaction.objects.get(pk=obj.pk).delete()
+
+        summary = self.summary()
+        self.assertEqual(summary.total_expenses, Decimal('0.00'))
+        self.assertEqual(summary.expense_count, 0)
+        self.assertIsNone(summary.first_transaction_date)
+        self.assertIsNone(summary.last_transaction_date)
+
+    def verify(self, *args):
+        out = StringIO()
+        call_command('verify_ledger_summaries', *args, stdout=out)
+        return out.getvalue()
+
+    def test_verify_reports_nothing_when_in_step(self):
+        self.add('10.00')
+        self.add('500.00', type='income')
+
+        self.assertIn('out of date: 0', self.verify())
+
+    def test_verify_finds_and_fixes_drift(self):
+        self.add('10.00')
+        # Writes through update() bypass the signals
+        Transaction.objects.filter(user=self.user).update(amount=Decimal('12.00'))
+
+        output = self.verify()
+        self.assertIn(f'User {self.user.pk} USD: total_expenses 10.00 != 12', output)
+        self.assertIn('out of date: 1', output)
+        self.assertEqual(self.summary().total_expenses, Decimal('10.00'))
+
+        self.assertIn('rebuilt: 1', self.verify('--fix'))
+        self.assertEqual(self.summary().total_expenses, Decimal('12.00'))
+        self.assertIn('out of date: 0', self.verify())
+
+class RecurringGenerationTests(TestCase):
+    """
+    Transactions generated from recurring rules
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user('alice', 'alice@example.com', 'password')
+        self.category = Category.objects.create(name='Test rent', type='expense', user=self.user)
+
+    def rule(self, **kwargs):
+        fields = {'frequency': 'monthly', 'start_date': datetime.date(2024, 1, 31), **kwargs}
+        rule = RecurringTransaction(
+            user=self.user, category=self.category, title='Rent', amount=Decimal('800.00'),
+            type='expense', **fields
+        )
+        schedule(rule)
+        rule.save()
+        return rule
+
+    def dates(self, rule):
+        return list(Transaction.objects.filter(recurring_rule=rule).order_by('date').values_list('date', flat=True))
+
+    def test_generates_missed_occurrences(self):
+        rule = self.rule()
+
+        self.assertEqual(generate_due_transactions(today=datetime.date(2024, 3, 31)), 3)
+
+        # Shorter months land on their last day
+        self.assertEqual(self.dates(rule), [
+            datetime.date(2024, 1, 31), datetime.date(2024, 2, 29), datetime.date(2024, 3, 31),
+        ])
+        rule.refresh_from_db()
+        self.assertEqual(rule.last_run_date, datetime.date(2024, 3, 31))
+        self.assertEqual(rule.next_run_date, datetime.date(2024, 4, 30))
+
+    def test_yearly_rule_stays_in_its_month(self):
+        # The day of month has already passed in the start month
+        rule = self.rule(frequency='yearly', day_of_month=5, start_date=datetime.date(2024, 3, 20))
+
+        self.assertEqual(rule.next_run_date, datetime.date(2025, 3, 5))
+        generate_due_transactions(today=datetime.date(2027, 1, 1))
+
+        self.assertEqual(self.dates(rule), [datetime.date(2025, 3, 5), datetime.date(2026, 3, 5)])
+        rule.refresh_from_db()
+        self.assertEqual(rule.next_run_date, datetime.date(2027, 3, 5))
+
+    def test_yearly_rule_clamps_leap_day(self):
+        rule = self.rule(frequency='yearly', start_date=datetime.date(2024, 2, 29))
+
+        generate_due_transactions(today=datetime.date(2026, 3, 1))
+
+        self.assertEqual(self.dates(rule), [
+            datetime.date(2024, 2, 29), datetime.date(2025, 2, 28), datetime.date(2026, 2, 28),
+        ])
+
+    def test_running_twice_creates_nothing_new(self):
+        rule = self.rule()
+        today = datetime.date(2024, 3, 31)
+        generate_due_transactions(today=today)
+
+        self.assertEqual(generate_due_transactions(today=today), 0)
+
+        self.assertEqual(len(self.dates(rule)), 3)
+        summary = LedgerSummary.objects.get(user=self.user, currency='USD')
+        self.assertEqual(summary.total_expenses, Decimal('2400.00'))
+        self.assertEqual(summary.expense_count, 3)
+
+    def test_rerun_after_partial_run_skips_inserted_occurrences(self):
+        rule = self.rule()
+        generate_due_transactions(today=datetime.date(2024, 3, 31))
+        # As if the rule update of the previous run was lost
+        RecurringTransaction.objects.filter(pk=rule.pk).update(
+            next_run_date=datetime.date(2024, 2, 29), last_run_date=datetime.date(2024, 1, 31)
+        )
+
+        self.assertEqual(generate_due_transactions(today=datetime.date(2024, 4, 30)), 1)
+
+        self.assertEqual(self.dates(rule)[-2:], [datetime.date(2024, 3, 31), datetime.date(2024, 4, 30)])
+        self.assertEqual(len(self.dates(rule)), 4)
+        self.assertEqual(LedgerSummary.objects.get(user=self.user, currency='USD').expense_count, 4)
+
+    def test_end_date_deactivates_rule(self):
+        rule = self.rule(end_date=datetime.date(2024, 2, 15))
+
+        self.assertEqual(generate_due_transactions(today=datetime.date(2024, 6, 1)), 1)
+
+        rule.refresh_from_db()
+        self.assertFalse(rule.is_active)
+        self.assertIsNone(rule.next_run_date)
+        self.assertEqual(generate_due_transactions(today=datetime.date(2024, 7, 1)), 0)
+
+class FakeSlidingWindowScript:
+    """
+    The throttle's Lua sliding window, evaluated in memory
+    """
+
+    def __init__(self):
+        self.logs = {}
+
+    def __call__(self, keys, args):
+        now, member = args[:2]
+        budgets = [(key, args[2 + 2 * i], args[3 + 2 * i]) for i, key in enumerate(keys)]
+        wait = 0
+        for key, limit, window in budgets:
+            log = self.logs[key] = [at for at in self.logs.get(key, []) if at > now - window]
+            if len(log) >= limit:
+                wait = max(wait, log[0] + window - now)
+        if wait:
+            return wait
+        for key, _, _ in budgets:
+            self.logs[key].append(now)
+        return 0
+
+class ThrottleTests(TestCase):
+    """
+    Endpoint-class budgets from throttle_scope
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user('alice', 'alice@example.com', 'password')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        patcher = mock.patch('utils.throttling._sliding_window_script', return_value=FakeSlidingWindowScript())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # Throttling is disabled in the test settings
+        for view in (views.transaction_stats_view.cls, views.TransactionSummaryView, views.RecurringTransactionListCreateView):
+            patcher = mock.patch.object(view, 'throttle_classes', [HierarchicalRateThrottle])
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_function_view_scope(self):
+        self.assertEqual(views.transaction_stats_view.cls.throttle_scope, 'expensive')
+        self.assertEqual(views.bulk_delete_transactions.cls.throttle_scope, 'bulk')
+
+    def test_expensive_endpoints_share_a_budget(self):
+        for _ in range(10):
+            self.assertEqual(self.client.get('/api/transactions/stats/').status_code, 200)
+            self.assertEqual(self.client.get('/api/transactions/summary/').status_code, 200)
+
+        response = self.client.get('/api/transactions/stats/')
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(int(response['Retry-After']), 60)
+        self.assertEqual(self.client.get('/api/transactions/summary/').status_code, 429)
+        # Endpoints without a scope only count against the user budget
+        self.assertEqual(self.client.get('/api/transactions/recurring/').status_code, 200)
+
+    def test_budgets_are_per_user(self):
+        for _ in range(20):
+            self.client.get('/api/transactions/stats/')
+
+        other = APIClient()
+        other.force_authenticate(User.objects.create_user('bob', 'bob@example.com', 'password'))
+        self.assertEqual(other.get('/api/transactions/stats/').status_code, 200)
 
-# Create your tests here.
+    def test_redis_errors_let_requests_through(self):
+        with mock.patch('utils.throttling._sliding_window_script') as script:
+            script.return_value.side_effect = redis.ConnectionError('Connection refused')
+            with self.assertLogs('utils.throttling', 'WARNING'):
+                for _ in range(21):
+                    self.assertEqual(self.client.get('/api/transactions/stats/').status_code, 200)
 
-# apps/transactions/tests.py
\ No newline at end of file
+# apps/transactions/tests.py
@@ -14,6 +14,10 @@ urlpatterns = [
     path('<int:pk>/update/', views.TransactionDetailView.as_view(), name='update'),
     path('<int:pk>/delete/', views.TransactionDetailView.as_view(), name='delete'),
     
+    # Recurring transaction rules
+    path('recurring/', views.RecurringTransactionListCreateView.as_view(), name='recurring_list_create'),
+    path('recurring/<int:pk>/', views.RecurringTransactionDetailView.as_view(), name='recurring_detail'),
+    
     # Transaction analytics and filtering
     path('summary/', views.TransactionSummaryView.as_view(), name='summary'),
     path('stats/', views.transaction_stats_view, name='stats'),
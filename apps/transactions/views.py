@@ -3,15 +3,21 @@ from rest_framework import generics, status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from rest_framework.pagination import PageNumberPagination
-from django.db.models import Q, Sum, Count
+from django.db.models import Q, Count
 from datetime import datetime
 
-from .models import Transaction
-from .serializers import TransactionSerializer, TransactionCreateSerializer, TransactionUpdateSerializer
+from utils.pagination import EstimatedCountPagination
+from utils.throttling import throttle_scope
+from apps.currencies.conversion import converted_sums
+from .ledger import converted_totals
+from .models import Transaction, RecurringTransaction
+from .serializers import (
+    TransactionSerializer, TransactionCreateSerializer, TransactionUpdateSerializer,
+    RecurringTransactionSerializer
+)
 
 # Custom pagination class for transactions
-class TransactionPagination(PageNumberPagination):
+class TransactionPagination(EstimatedCountPagination):
     page_size = 20
     page_size_query_param = 'page_size'
     max_page_size = 100
@@ -90,11 +96,41 @@ class TransactionDetailView(generics.RetrieveUpdateDestroyAPIView):
             return TransactionUpdateSerializer
         return TransactionSerializer
 
+class RecurringTransactionListCreateView(generics.ListCreateAPIView):
+    """
+    List recurring transaction rules or create a new one
+    """
+    serializer_class = RecurringTransactionSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = TransactionPagination
+    
+    def get_queryset(self):
+        queryset = RecurringTransaction.objects.filter(user=self.request.user)
+        
+        # Filter by active state
+        is_active = self.request.query_params.get('is_active', None)
+        if is_active is not None:
+            queryset = queryset.filter(is_active=is_active.lower() == 'true')
+        
+        return queryset.select_related('category')
+
+class RecurringTransactionDetailView(generics.RetrieveUpdateDestroyAPIView):
+    """
+    Retrieve, update or delete a recurring transaction rule.
+    Transactions already generated by the rule are kept.
+    """
+    serializer_class = RecurringTransactionSerializer
+    permission_classes = [IsAuthenticated]
+    
+    def get_queryset(self):
+        return RecurringTransaction.objects.filter(user=self.request.user).select_related('category')
+
 class TransactionSummaryView(generics.GenericAPIView):
     """
     Get transaction summary (totals, balance, etc.)
     """
     permission_classes = [IsAuthenticated]
+    throttle_scope = 'expensive'
     
     def get(self, request):
         """
@@ -110,21 +146,17 @@ class TransactionSummaryView(generics.GenericAPIView):
         if end_date:
             user_transactions = user_transactions.filter(date__lte=end_date)
         
-        # Calculate totals
-        income_total = user_transactions.filter(type='income').aggregate(
-            total=Sum('amount')
-        )['total'] or 0
-        
-        expense_total = user_transactions.filter(type='expense').aggregate(
-            total=Sum('amount')
-        )['total'] or 0
+        # Calculate totals in the user's currency; the all-time view reads the ledger summaries
+        totals = converted_totals(request.user, user_transactions if start_date or end_date else None)
         
+        income_total = totals['total_income']
+        expense_total = totals['total_expenses']
         balance = income_total - expense_total
         
         # Get transaction counts
-        total_transactions = user_transactions.count()
-        income_count = user_transactions.filter(type='income').count()
-        expense_count = user_transactions.filter(type='expense').count()
+        income_count = totals['income_count']
+        expense_count = totals['expense_count']
+        total_transactions = income_count + expense_count
         
         # Recent transactions
         recent_transactions = user_transactions.order_by('-date', '-created_at')[:5]
@@ -132,15 +164,15 @@ class TransactionSummaryView(generics.GenericAPIView):
         
         # Category breakdown
         category_breakdown = []
-        categories = user_transactions.values('category__name', 'category__type').annotate(
-            total=Sum('amount')
-        ).order_by('-total')
+        categories, missing = converted_sums(
+            user_transactions, totals['currency'], ['category__name', 'category__type']
+        )
         
-        for cat in categories:
+        for (name, category_type), total in sorted(categories.items(), key=lambda item: -item[1]):
             category_breakdown.append({
-                'category': cat['category__name'],
-                'type': cat['category__type'],
-                'total': float(cat['total'])
+                'category': name,
+                'type': category_type,
+                'total': float(total)
             })
         
         return Response({
@@ -151,6 +183,8 @@ class TransactionSummaryView(generics.GenericAPIView):
                 'total_transactions': total_transactions,
                 'income_transactions': income_count,
                 'expense_transactions': expense_count,
+                'currency': totals['currency'],
+                'unconverted_currencies': totals['unconverted_currencies'],
             },
             'recent_transactions': recent_serializer.data,
             'category_breakdown': category_breakdown,
@@ -210,6 +244,7 @@ class TransactionByCategoryView(generics.ListAPIView):
 
 # Additional views for better API functionality
 
+@throttle_scope('expensive')
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def transaction_stats_view(request):
@@ -217,36 +252,48 @@ def transaction_stats_view(request):
     Get transaction statistics for charts and analytics
     """
     user_transactions = Transaction.objects.filter(user=request.user)
+    totals = converted_totals(request.user)
+    currency = totals['currency']
     
     # Monthly breakdown for the last 12 months
-    from django.db.models import TruncMonth
+    from django.db.models.functions import TruncMonth
     from datetime import datetime, timedelta
     
     twelve_months_ago = datetime.now().date().replace(day=1) - timedelta(days=365)
     
-    monthly_data = user_transactions.filter(
-        date__gte=twelve_months_ago
-    ).annotate(
-        month=TruncMonth('date')
-    ).values('month', 'type').annotate(
-        total=Sum('amount')
-    ).order_by('month', 'type')
+    monthly_totals, missing = converted_sums(
+        user_transactions.filter(date__gte=twelve_months_ago).annotate(month=TruncMonth('date')),
+        currency, ['month', 'type']
+    )
+    monthly_data = [
+        {'month': month, 'type': transaction_type, 'total': total}
+        for (month, transaction_type), total in sorted(monthly_totals.items())
+    ]
     
     # Category breakdown
-    category_data = user_transactions.values(
-        'category__name', 'type'
-    ).annotate(
-        total=Sum('amount'),
-        count=Count('id')
-    ).order_by('-total')
+    category_totals, category_missing = converted_sums(user_transactions, currency, ['category__name', 'type'])
+    category_counts = {
+        (row['category__name'], row['type']): row['count']
+        for row in user_transactions.order_by().values('category__name', 'type').annotate(count=Count('id'))
+    }
+    category_data = sorted(
+        (
+            {'category__name': name, 'type': transaction_type, 'total': total, 'count': category_counts.get((name, transaction_type), 0)}
+            for (name, transaction_type), total in category_totals.items()
+        ),
+        key=lambda row: -row['total']
+    )
     
     return Response({
-        'monthly_breakdown': list(monthly_data),
-        'category_breakdown': list(category_data),
-        'total_income': float(user_transactions.filter(type='income').aggregate(Sum('amount'))['amount__sum'] or 0),
-        'total_expenses': float(user_transactions.filter(type='expense').aggregate(Sum('amount'))['amount__sum'] or 0),
+        'monthly_breakdown': monthly_data,
+        'category_breakdown': category_data,
+        'total_income': float(totals['total_income']),
+        'total_expenses': float(totals['total_expenses']),
+        'currency': currency,
+        'unconverted_currencies': sorted(set(totals['unconverted_currencies']) | missing | category_missing),
     })
 
+@throttle_scope('bulk')
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def bulk_delete_transactions(request):
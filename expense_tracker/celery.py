@@ -1,6 +1,8 @@
 import os
 from celery import Celery
 
+from utils.metrics import connect_celery_signals
+
 # Set the default Django settings module for the 'celery' program.
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'expense_tracker.settings')
 
@@ -13,6 +15,9 @@ app.config_from_object('django.conf:settings', namespace='CELERY')
 # Load task modules from all registered Django apps.
 app.autodiscover_tasks()
 
+# Record task durations for the Prometheus endpoint
+connect_celery_signals()
+
 @app.task(bind=True)
 def debug_task(self):
     print(f'Request: {self.request!r}')
@@ -37,11 +37,14 @@ LOCAL_APPS = [
     'apps.currencies.apps.CurrenciesConfig',
     'apps.analytics.apps.AnalyticsConfig',
     'apps.notifications.apps.NotificationsConfig',
+    'apps.outbox.apps.OutboxConfig',
 ]
 
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 
 MIDDLEWARE = [
+    'utils.instrumentation.PerformanceMiddleware',  # First, so its timing covers the other middleware
+    'utils.metrics.PrometheusMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -81,6 +84,9 @@ DATABASES = {
         'PASSWORD': os.getenv('DB_PASSWORD', 'password'),
         'HOST': os.getenv('DB_HOST', 'localhost'),
         'PORT': os.getenv('DB_PORT', '5432'),
+        'OPTIONS': {
+            'connect_timeout': int(os.getenv('DB_CONNECT_TIMEOUT', 5)),  # Seconds; libpq waits forever by default
+        },
     }
 }
 
@@ -98,11 +104,21 @@ REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
 # Cache Configuration
 CACHES = {
     'default': {
-        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'BACKEND': 'utils.instrumentation.InstrumentedRedisCache',
         'LOCATION': REDIS_URL,
-    }
+    },
 }
 
+# Token blacklist; keys must not be evicted, so it needs its own Redis instance without an
+# LRU policy. Without one, blacklist checks go to the database.
+TOKEN_CACHE_URL = os.getenv('TOKEN_CACHE_URL', '')
+if TOKEN_CACHE_URL:
+    CACHES['tokens'] = {
+        'BACKEND': 'utils.instrumentation.InstrumentedRedisCache',
+        'LOCATION': TOKEN_CACHE_URL,
+        'KEY_PREFIX': 'tokens',
+    }
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -119,6 +135,18 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Username or case-insensitive email login with a single password check
+AUTHENTICATION_BACKENDS = [
+    'apps.authentication.backends.UsernameOrEmailBackend',
+]
+
+# Failed logins allowed per window before further attempts are refused
+LOGIN_THROTTLE_WINDOW = 15 * 60  # Seconds
+LOGIN_MAX_FAILURES_PER_ACCOUNT = 5
+LOGIN_MAX_FAILURES_PER_IP = 20
+
+PROFILE_CACHE_TIMEOUT = 60 * 60  # Seconds a user's serialized profile stays cached
+
 # Internationalization
 LANGUAGE_CODE = 'en-us'
 TIME_ZONE = 'UTC'
@@ -142,7 +170,7 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # REST Framework Configuration
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.authentication.authentication.TokenUserAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
@@ -152,8 +180,20 @@ REST_FRAMEWORK = {
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
+    'DEFAULT_THROTTLE_CLASSES': [
+        'utils.throttling.HierarchicalRateThrottle',
+    ],
+    'DEFAULT_THROTTLE_RATES': {
+        'user': '120/min',
+        'anon': '30/min',
+        'ip': '600/min',  # All users behind one address
+        'expensive': '20/min',  # Views with throttle_scope = 'expensive' (summaries, stats, analytics)
+        'bulk': '10/min',  # Views with throttle_scope = 'bulk'
+    },
 }
 
+THROTTLE_REDIS_URL = os.getenv('THROTTLE_REDIS_URL', REDIS_URL)
+
 # JWT Configuration
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=int(os.getenv('JWT_ACCESS_TOKEN_LIFETIME', 60))),
@@ -179,6 +219,7 @@ SIMPLE_JWT = {
     'SLIDING_TOKEN_REFRESH_EXP_CLAIM': 'refresh_exp',
     'SLIDING_TOKEN_LIFETIME': timedelta(minutes=5),
     'SLIDING_TOKEN_REFRESH_LIFETIME': timedelta(days=1),
+    'TOKEN_REFRESH_SERIALIZER': 'apps.authentication.serializers.CachedTokenRefreshSerializer',
 }
 
 # CORS Configuration
@@ -198,6 +239,58 @@ CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
+CELERY_BEAT_SCHEDULE = {
+    'relay-outbox': {
+        'task': 'apps.outbox.tasks.relay_outbox',
+        'schedule': 2.0,
+    },
+    'release-scheduled-deliveries': {
+        'task': 'apps.notifications.tasks.release_scheduled_deliveries',
+        'schedule': 60.0,
+    },
+    'drain-push-outbox': {
+        'task': 'apps.notifications.tasks.drain_push_outbox',
+        'schedule': 30.0,
+    },
+    'generate-recurring-transactions': {
+        'task': 'apps.transactions.tasks.generate_recurring_transactions',
+        'schedule': 3600.0,
+    },
+    'flush-expired-tokens': {
+        'task': 'apps.authentication.tasks.flush_expired_tokens',
+        'schedule': 24 * 3600.0,
+    },
+}
+
+# Transactional outbox
+OUTBOX_RELAY_BATCH_SIZE = 500
+OUTBOX_RELAY_ON_COMMIT = False  # The beat-driven relay picks events up instead
+
+# Email notifications
+DEFAULT_FROM_EMAIL = os.getenv('DEFAULT_FROM_EMAIL', 'Expense Tracker <noreply@expense-tracker.local>')
+NOTIFICATION_EMAIL_BATCH_SIZE = 100  # Digests sent per SMTP connection round
+NOTIFICATION_EMAIL_MAX_PER_SECOND = 10  # Pacing within a worker batch
+NOTIFICATION_EMAIL_RATE_LIMIT = '60/m'  # Celery task rate limit per worker
+
+# Push notifications
+# Dotted path to a BasePushTransport subclass; point this at the provider's transport in production
+PUSH_TRANSPORT = os.getenv('PUSH_TRANSPORT', 'apps.notifications.push.LocalPushTransport')
+PUSH_OUTBOX_BATCH_SIZE = 500
+PUSH_MAX_ATTEMPTS = 5
+PUSH_CLAIM_TIMEOUT = 300  # Seconds before a batch left sending by a dead worker is retried
+
+# Currency conversion
+FX_BASE_CURRENCY = 'USD'  # Pairs without a stored rate are crossed through this currency
+FX_RATES_CHECK_INTERVAL = 60  # Seconds between checks for changed rates
+FX_RATES_FILE = os.getenv('FX_RATES_FILE')  # CSV/JSON of base,quote,date,rate used instead of the database
+
+# Analytics
+ANALYTICS_MAX_BUCKETS = 366  # Upper bound on periods returned by time series endpoints
+ANOMALY_THRESHOLD = 3.5  # Modified z-score above which an expense is flagged
+ANOMALY_WARMUP_SAMPLES = 8  # Expenses per category before scoring starts
+
+# Categories
+CATEGORY_STATS_CACHE_TIMEOUT = 60 * 60  # Seconds per-user category usage stats stay cached
 
 # Logging Configuration
 LOGGING = {
@@ -212,6 +305,10 @@ LOGGING = {
             'format': '{levelname} {message}',
             'style': '{',
         },
+        'message': {
+            'format': '{message}',
+            'style': '{',
+        },
     },
     'handlers': {
         'file': {
@@ -225,6 +322,13 @@ LOGGING = {
             'class': 'logging.StreamHandler',
             'formatter': 'simple',
         },
+        # One JSON object per line from PerformanceMiddleware
+        'performance': {
+            'level': 'INFO',
+            'class': 'logging.FileHandler',
+            'filename': BASE_DIR / 'logs' / 'performance.log',
+            'formatter': 'message',
+        },
     },
     'root': {
         'handlers': ['console'],
@@ -241,7 +345,30 @@ LOGGING = {
             'level': 'DEBUG',
             'propagate': False,
         },
+        'performance': {
+            'handlers': ['performance'],
+            'level': 'INFO',
+            'propagate': False,
+        },
     },
 }
 
+# Share of requests measured by PerformanceMiddleware (0 disables it, 1 measures every request)
+PERFORMANCE_SAMPLE_RATE = float(os.getenv('PERFORMANCE_SAMPLE_RATE', 0))
+
+# Bearer token required by /metrics; without one, only METRICS_ALLOWED_IPS may scrape outside DEBUG
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+METRICS_ALLOWED_IPS = os.getenv('METRICS_ALLOWED_IPS', '127.0.0.1,::1').split(',')
+CELERY_METRICS_QUEUES = ['celery']  # Broker queues whose depth /metrics reports
+# Multiprocess directories /metrics merges (comma-separated; defaults to this process's own)
+PROMETHEUS_METRICS_DIRS = [
+    directory for directory in os.getenv(
+        'PROMETHEUS_METRICS_DIRS', os.getenv('PROMETHEUS_MULTIPROC_DIR', '')
+    ).split(',') if directory
+]
+
+# Readiness probe: per-dependency timeout, and how long a result is reused
+HEALTH_CHECK_TIMEOUT = float(os.getenv('HEALTH_CHECK_TIMEOUT', 1.0))
+HEALTH_CHECK_CACHE_SECONDS = int(os.getenv('HEALTH_CHECK_CACHE_SECONDS', 5))
+
 # expense_tracker/settings/base.py
\ No newline at end of file
@@ -38,6 +38,7 @@ EMAIL_USE_TLS = os.getenv('EMAIL_USE_TLS', 'True').lower() == 'true'
 
 # Logging for production
 LOGGING['handlers']['file']['filename'] = '/var/log/django/expense_tracker.log'
+LOGGING['handlers']['performance']['filename'] = '/var/log/django/performance.log'
 
 
 # expense_tracker/settings/production.py
\ No newline at end of file
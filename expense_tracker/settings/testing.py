@@ -26,11 +26,26 @@ PASSWORD_HASHERS = [
 # Email backend for testing
 EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
 
+# Run Celery tasks inline during tests
+CELERY_TASK_ALWAYS_EAGER = True
+CELERY_TASK_EAGER_PROPAGATES = True
+NOTIFICATION_EMAIL_MAX_PER_SECOND = None
+OUTBOX_RELAY_ON_COMMIT = True
+
+# Load FX rates from a local file instead of the database, when one is given
+FX_RATES_FILE = os.getenv('FX_RATES_FILE')
+
+# Throttling needs Redis
+REST_FRAMEWORK = {**REST_FRAMEWORK, 'DEFAULT_THROTTLE_CLASSES': []}
+
 # Disable caching for tests
 CACHES = {
     'default': {
         'BACKEND': 'django.core.cache.backends.dummy.DummyCache',
-    }
+    },
+    'tokens': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
 }
 
 # Disable logging during tests
@@ -26,12 +26,16 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
-from .views import api_root, health_check
+from .views import api_root, health_check, performance_metrics, prometheus_metrics, readiness_check
 
 urlpatterns = [
     # Root API endpoint
     path('', api_root, name='api_root'),
     path('health/', health_check, name='health_check'),
+    path('health/live/', health_check, name='health_live'),
+    path('health/ready/', readiness_check, name='health_ready'),
+    path('api/admin/performance/', performance_metrics, name='performance_metrics'),
+    path('metrics', prometheus_metrics, name='prometheus_metrics'),
     
     # Admin and API endpoints
     path('admin/', admin.site.urls),
@@ -1,8 +1,16 @@
-from django.http import JsonResponse
+import os
+
+from django.conf import settings
+from django.http import HttpResponse, JsonResponse
 from django.shortcuts import render
+from django.utils.crypto import constant_time_compare
+from prometheus_client import CONTENT_TYPE_LATEST
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import AllowAny, IsAdminUser
 from rest_framework.response import Response
+from utils.health import readiness
+from utils.instrumentation import metrics_snapshot
+from utils.metrics import render_metrics
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
@@ -26,11 +34,51 @@ def api_root(request):
 
 def health_check(request):
     """
-    Simple health check endpoint
+    Liveness: the process is up and serving requests. Doesn't touch any
+    dependency, so an outage elsewhere doesn't get the pod restarted.
     """
     return JsonResponse({
         'status': 'healthy',
         'message': 'Expense Tracker Backend is running'
     })
 
+def readiness_check(request):
+    """
+    Readiness: database, cache and broker are reachable. Answers 503 when
+    any of them isn't, so the load balancer stops routing here.
+    """
+    ready, checks, age = readiness()
+    return JsonResponse({
+        'status': 'ready' if ready else 'unavailable',
+        'checks': checks,
+        'checked_seconds_ago': age,
+    }, status=200 if ready else 503)
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def performance_metrics(request):
+    """
+    Per-view request timings, query counts and cache hit rates sampled by
+    PerformanceMiddleware in this worker process
+    """
+    return Response({
+        'sample_rate': settings.PERFORMANCE_SAMPLE_RATE,
+        'pid': os.getpid(),
+        'views': metrics_snapshot(),
+    })
+
+def prometheus_metrics(request):
+    """
+    Prometheus scrape endpoint. Scrapers send METRICS_TOKEN as a bearer
+    token; without a token configured only METRICS_ALLOWED_IPS (or any
+    client under DEBUG) may scrape
+    """
+    token = settings.METRICS_TOKEN
+    if token:
+        if not constant_time_compare(request.headers.get('Authorization', ''), f'Bearer {token}'):
+            return HttpResponse(status=401)
+    elif not settings.DEBUG and request.META.get('REMOTE_ADDR') not in settings.METRICS_ALLOWED_IPS:
+        return HttpResponse(status=403)
+    return HttpResponse(render_metrics(), content_type=CONTENT_TYPE_LATEST)
+
 # expense_tracker/views.py
\ No newline at end of file
@@ -0,0 +1,44 @@
+"""
+Gunicorn configuration, loaded automatically from the working directory.
+
+With PROMETHEUS_MULTIPROC_DIR set, every worker writes its metric samples
+to that directory and /metrics merges them. Give this server a directory
+of its own (Celery workers get another, see utils/metrics.py). On start,
+files left by processes that are no longer running are removed; files of
+live processes are never touched. Exited workers are marked dead so
+their gauges drop out.
+"""
+import glob
+import os
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:8000')
+workers = int(os.getenv('GUNICORN_WORKERS', 4))
+wsgi_app = 'expense_tracker.wsgi:application'
+
+def _running(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+def on_starting(server):
+    directory = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+    if not directory:
+        return
+    os.makedirs(directory, exist_ok=True)
+    # Sample files are named <type>_<pid>.db or gauge_<mode>_<pid>.db
+    for path in glob.glob(os.path.join(directory, '*.db')):
+        pid = os.path.basename(path)[:-len('.db')].rsplit('_', 1)[-1]
+        if pid.isdigit() and not _running(int(pid)):
+            os.remove(path)
+
+def child_exit(server, worker):
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
+
+# gunicorn.conf.py
@@ -0,0 +1,54 @@
+"""
+Query helpers shared across apps for working with large tables.
+"""
+import json
+
+from django.db import connections, transaction
+
+UPDATE_CHUNK_SIZE = 5000
+
+def estimated_count(queryset):
+    """
+    Return the query planner's row estimate for `queryset`, or None when
+    the database backend cannot provide one. Only PostgreSQL is supported;
+    the estimate comes from EXPLAIN and does not scan the table.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+
+    sql, params = queryset.order_by().query.get_compiler(using=queryset.db).as_sql()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+def chunked_update(queryset, chunk_size=UPDATE_CHUNK_SIZE, **values):
+    """
+    Run `queryset.update(**values)` in primary-key ordered chunks so a very
+    large selection is applied as a series of short UPDATEs instead of one
+    long-running statement. Returns the number of rows updated.
+    """
+    model = queryset.model
+    queryset = queryset.order_by('pk')
+    updated = 0
+    last_pk = None
+
+    while True:
+        chunk = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        pks = list(chunk.values_list('pk', flat=True)[:chunk_size])
+        if not pks:
+            break
+
+        with transaction.atomic(using=queryset.db):
+            updated += model._default_manager.using(queryset.db).filter(pk__in=pks).update(**values)
+
+        last_pk = pks[-1]
+        if len(pks) < chunk_size:
+            break
+
+    return updated
+
+# utils/db.py
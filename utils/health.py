@@ -0,0 +1,101 @@
+"""
+Readiness checks of the services the API depends on.
+
+`readiness()` checks the database, every Redis cache and the Celery
+broker, each with a short timeout, and keeps the result in process
+memory for `HEALTH_CHECK_CACHE_SECONDS`, so frequent probes from the
+load balancer cost the dependencies at most one round of checks per
+interval and worker. Concurrent probes wait for the round in progress
+instead of starting their own.
+
+The result is deliberately not stored in the Django cache: Redis is one
+of the things being checked.
+"""
+import math
+import threading
+import time
+
+import redis
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.redis import RedisCache
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+_result = None
+_checked_at = 0.0
+_lock = threading.Lock()
+
+def _timeout():
+    return getattr(settings, 'HEALTH_CHECK_TIMEOUT', 1.0)
+
+def _ping_redis(url):
+    client = redis.Redis.from_url(url, socket_connect_timeout=_timeout(), socket_timeout=_timeout())
+    try:
+        client.ping()
+    finally:
+        client.close()
+
+def check_database():
+    # A connection of its own, so the probe's connect timeout applies
+    # rather than the application's DB_CONNECT_TIMEOUT
+    probe = connections.create_connection(DEFAULT_DB_ALIAS)
+    if probe.vendor == 'postgresql':
+        # libpq counts whole seconds and treats anything below 2 as 2
+        probe.settings_dict = {
+            **probe.settings_dict,
+            'OPTIONS': {**probe.settings_dict['OPTIONS'], 'connect_timeout': max(2, math.ceil(_timeout()))},
+        }
+    try:
+        with probe.cursor() as cursor:
+            if probe.vendor == 'postgresql':
+                cursor.execute('SET statement_timeout = %s', [int(_timeout() * 1000)])
+            cursor.execute('SELECT 1')
+    finally:
+        probe.close()
+
+def check_cache():
+    # In-process backends (tests, local development) have nothing to reach
+    for alias in settings.CACHES:
+        backend = caches[alias]
+        if isinstance(backend, RedisCache):
+            for url in backend._servers:
+                _ping_redis(url)
+
+def check_broker():
+    if getattr(settings, 'CELERY_TASK_ALWAYS_EAGER', False):
+        return
+    _ping_redis(settings.CELERY_BROKER_URL)
+
+CHECKS = {
+    'database': check_database,
+    'cache': check_cache,
+    'broker': check_broker,
+}
+
+def run_checks():
+    """Run every check; returns (all passed, {name: result})"""
+    results = {}
+    for name, check in CHECKS.items():
+        started = time.perf_counter()
+        try:
+            check()
+        except (DatabaseError, redis.RedisError) as exc:
+            results[name] = {'status': 'unavailable', 'error': exc.__class__.__name__}
+        else:
+            results[name] = {'status': 'ok'}
+        results[name]['latency_ms'] = round((time.perf_counter() - started) * 1000, 2)
+    return all(result['status'] == 'ok' for result in results.values()), results
+
+def readiness():
+    """Cached (ready, checks, age in seconds) of the latest round of checks"""
+    global _result, _checked_at
+
+    ttl = getattr(settings, 'HEALTH_CHECK_CACHE_SECONDS', 5)
+    with _lock:
+        now = time.monotonic()
+        if _result is None or now - _checked_at >= ttl:
+            _result = run_checks()
+            _checked_at = time.monotonic()
+        return (*_result, round(time.monotonic() - _checked_at, 2))
+
+# utils/health.py
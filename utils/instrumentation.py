@@ -0,0 +1,223 @@
+"""
+Request performance instrumentation.
+
+`PerformanceMiddleware` samples a share of requests
+(`PERFORMANCE_SAMPLE_RATE`, 0 disables it) and records for each: wall
+time, database query count and time, cache hits and misses, and the
+response size. Samples are logged as one JSON line on the `performance`
+logger and added to in-process per-view histograms, which
+`metrics_snapshot()` exposes to the admin metrics endpoint. Histograms
+are per worker process and reset on restart.
+
+Unsampled requests pay for one comparison. Cache hits are counted by
+`InstrumentedRedisCache`, which also feeds the Prometheus cache counters
+(see `utils.metrics`).
+"""
+import bisect
+import json
+import logging
+import random
+import threading
+import time
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache.backends.redis import RedisCache
+from django.db import connections
+
+from .metrics import CACHE_REQUESTS
+
+logger = logging.getLogger('performance')
+
+# Upper bounds (ms) of the request duration histogram buckets; the last bucket is unbounded
+DURATION_BUCKETS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+_current = ContextVar('request_metrics', default=None)
+_MISSING = object()
+
+class RequestMetrics:
+    """
+    Counters of one sampled request
+    """
+    __slots__ = ('queries', 'db_time', 'cache_hits', 'cache_misses')
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        # Installed as a database execute wrapper
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db_time += time.perf_counter() - started
+
+class InstrumentedRedisCache(RedisCache):
+    """
+    Redis cache backend that counts hits and misses, for Prometheus and
+    for sampled requests
+    """
+    def __init__(self, server, params):
+        super().__init__(server, params)
+        # Caches are told apart by key prefix; the alias isn't passed to backends
+        label = self.key_prefix or 'default'
+        self._hits = CACHE_REQUESTS.labels(label, 'hit')
+        self._misses = CACHE_REQUESTS.labels(label, 'miss')
+
+    def get(self, key, default=None, version=None):
+        value = super().get(key, _MISSING, version)
+        metrics = _current.get()
+        if value is _MISSING:
+            self._misses.inc()
+            if metrics is not None:
+                metrics.cache_misses += 1
+            return default
+        self._hits.inc()
+        if metrics is not None:
+            metrics.cache_hits += 1
+        return value
+
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        values = super().get_many(keys, version)
+        hits, misses = len(values), len(keys) - len(values)
+        self._hits.inc(hits)
+        self._misses.inc(misses)
+        metrics = _current.get()
+        if metrics is not None:
+            metrics.cache_hits += hits
+            metrics.cache_misses += misses
+        return values
+
+class ViewStats:
+    """
+    Aggregated samples of one view
+    """
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.duration_buckets = [0] * (len(DURATION_BUCKETS) + 1)
+        self.duration_total = 0.0
+        self.duration_max = 0.0
+        self.queries_total = 0
+        self.queries_max = 0
+        self.db_time_total = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.response_bytes_total = 0
+
+    def add(self, sample):
+        self.count += 1
+        self.errors += sample['status'] >= 500
+        self.duration_buckets[bisect.bisect_left(DURATION_BUCKETS, sample['duration_ms'])] += 1
+        self.duration_total += sample['duration_ms']
+        self.duration_max = max(self.duration_max, sample['duration_ms'])
+        self.queries_total += sample['queries']
+        self.queries_max = max(self.queries_max, sample['queries'])
+        self.db_time_total += sample['db_ms']
+        self.cache_hits += sample['cache_hits']
+        self.cache_misses += sample['cache_misses']
+        self.response_bytes_total += sample['response_bytes']
+
+    def percentile(self, fraction):
+        """Upper bound of the bucket holding the given fraction of samples"""
+        target = fraction * self.count
+        seen = 0
+        for bound, count in zip(DURATION_BUCKETS, self.duration_buckets):
+            seen += count
+            if seen >= target:
+                return min(bound, round(self.duration_max, 2))
+        return self.duration_max
+
+    def as_dict(self):
+        count = self.count or 1
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'duration_ms': {
+                'avg': round(self.duration_total / count, 2),
+                'p50': self.percentile(0.5),
+                'p95': self.percentile(0.95),
+                'p99': self.percentile(0.99),
+                'max': round(self.duration_max, 2),
+                'buckets': {
+                    **{f'le_{bound}': count for bound, count in zip(DURATION_BUCKETS, self.duration_buckets)},
+                    'inf': self.duration_buckets[-1],
+                },
+            },
+            'queries': {
+                'avg': round(self.queries_total / count, 2),
+                'max': self.queries_max,
+                'db_ms_avg': round(self.db_time_total / count, 2),
+            },
+            'cache': {'hits': self.cache_hits, 'misses': self.cache_misses},
+            'response_bytes_avg': round(self.response_bytes_total / count),
+        }
+
+_stats = {}
+_stats_lock = threading.Lock()
+
+def record(sample):
+    """Add a sample to its view's histogram"""
+    with _stats_lock:
+        stats = _stats.get(sample['view'])
+        if stats is None:
+            stats = _stats[sample['view']] = ViewStats()
+        stats.add(sample)
+
+def metrics_snapshot():
+    """Per-view aggregates of this process, slowest average first"""
+    with _stats_lock:
+        views = {view: stats.as_dict() for view, stats in _stats.items()}
+    return dict(sorted(views.items(), key=lambda item: item[1]['duration_ms']['avg'], reverse=True))
+
+def reset_metrics():
+    with _stats_lock:
+        _stats.clear()
+
+class PerformanceMiddleware:
+    """
+    Measure a sample of requests; see the module docstring
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, 'PERFORMANCE_SAMPLE_RATE', 0.0)
+
+    def __call__(self, request):
+        if not self.sample_rate or random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(metrics))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        duration = time.perf_counter() - started
+
+        match = getattr(request, 'resolver_match', None)
+        sample = {
+            'view': match.view_name if match else 'unresolved',
+            'method': request.method,
+            'status': response.status_code,
+            'duration_ms': round(duration * 1000, 2),
+            'queries': metrics.queries,
+            'db_ms': round(metrics.db_time * 1000, 2),
+            'cache_hits': metrics.cache_hits,
+            'cache_misses': metrics.cache_misses,
+            'response_bytes': 0 if response.streaming else len(response.content),
+        }
+        record(sample)
+        logger.info(json.dumps(sample))
+        return response
+
+# utils/instrumentation.py
@@ -0,0 +1,167 @@
+"""
+Prometheus metrics.
+
+Counters and histograms are updated in-process by the web and Celery
+processes. When `PROMETHEUS_MULTIPROC_DIR` is set in a service's
+environment, each of its processes writes samples to that directory.
+Give gunicorn and the Celery workers a directory each (gunicorn.conf.py
+cleans up its own on start) and list both in `PROMETHEUS_METRICS_DIRS`:
+`/metrics` merges every directory listed there. Without a multiprocess directory the process's own registry is
+served.
+
+Database connections and Celery queue depth are read when `/metrics` is
+scraped, not kept as process state.
+"""
+import glob
+import os
+import time
+
+import redis
+from django.conf import settings
+from django.db import DatabaseError, connection
+from prometheus_client import (
+    CollectorRegistry, Counter, Histogram, REGISTRY, generate_latest, multiprocess
+)
+from prometheus_client.core import GaugeMetricFamily
+
+REQUEST_LATENCY = Histogram(
+    'http_request_duration_seconds',
+    'API request latency by URL name',
+    ['view', 'method', 'status'],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+CACHE_REQUESTS = Counter(
+    'cache_requests_total',
+    'Cache lookups by cache alias and result (hit/miss)',
+    ['cache', 'result'],
+)
+TASK_DURATION = Histogram(
+    'celery_task_duration_seconds',
+    'Celery task run time by task name and final state',
+    ['task', 'state'],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 300),
+)
+NOTIFICATIONS_CREATED = Counter(
+    'notifications_created_total',
+    'Notifications created by the fan-out handlers, by type',
+    ['type'],
+)
+NOTIFICATION_DELIVERIES = Counter(
+    'notification_deliveries_total',
+    'Out-of-app deliveries by channel and mode (immediate, held for quiet hours, released)',
+    ['channel', 'mode'],
+)
+
+class DatabaseCollector:
+    """
+    Server-side connection counts by state, read at scrape time
+    """
+    def collect(self):
+        gauge = GaugeMetricFamily(
+            'db_connections', 'Connections to the application database by state', labels=['state']
+        )
+        if connection.vendor == 'postgresql':
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        "SELECT COALESCE(state, 'unknown'), COUNT(*) FROM pg_stat_activity "
+                        "WHERE datname = current_database() GROUP BY 1"
+                    )
+                    for state, count in cursor.fetchall():
+                        gauge.add_metric([state], count)
+            except DatabaseError:
+                pass
+        yield gauge
+
+class CeleryQueueCollector:
+    """
+    Pending messages per Celery queue on the Redis broker, read at scrape time
+    """
+    def collect(self):
+        gauge = GaugeMetricFamily(
+            'celery_queue_length', 'Messages waiting in each Celery queue', labels=['queue']
+        )
+        queues = getattr(settings, 'CELERY_METRICS_QUEUES', ['celery'])
+        client = redis.Redis.from_url(settings.CELERY_BROKER_URL, socket_connect_timeout=1, socket_timeout=1)
+        try:
+            pipeline = client.pipeline(transaction=False)
+            for queue in queues:
+                pipeline.llen(queue)
+            for queue, length in zip(queues, pipeline.execute()):
+                gauge.add_metric([queue], length)
+        except redis.RedisError:
+            pass
+        finally:
+            client.close()
+        yield gauge
+
+class DirectoriesCollector:
+    """
+    Samples of every process writing to the given multiprocess directories
+    """
+    def __init__(self, directories):
+        self.directories = directories
+
+    def collect(self):
+        files = []
+        for directory in self.directories:
+            files.extend(glob.glob(os.path.join(directory, '*.db')))
+        return multiprocess.MultiProcessCollector.merge(files, accumulate=True)
+
+class ProcessCollector:
+    """
+    This process's own metrics, for servers without a multiprocess directory
+    """
+    def collect(self):
+        return REGISTRY.collect()
+
+def render_metrics():
+    """Latest metrics in the Prometheus text format"""
+    registry = CollectorRegistry()
+    if settings.PROMETHEUS_METRICS_DIRS:
+        registry.register(DirectoriesCollector(settings.PROMETHEUS_METRICS_DIRS))
+    else:
+        registry.register(ProcessCollector())
+    registry.register(DatabaseCollector())
+    registry.register(CeleryQueueCollector())
+    return generate_latest(registry)
+
+class PrometheusMiddleware:
+    """
+    Observe the latency of every request, labelled with its URL name
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        response = self.get_response(request)
+        match = getattr(request, 'resolver_match', None)
+        REQUEST_LATENCY.labels(
+            match.view_name if match else 'unresolved', request.method, response.status_code
+        ).observe(time.perf_counter() - started)
+        return response
+
+_task_started = {}
+
+def _task_prerun(task_id=None, **kwargs):
+    _task_started[task_id] = time.perf_counter()
+
+def _task_postrun(task_id=None, task=None, state=None, **kwargs):
+    started = _task_started.pop(task_id, None)
+    if started is not None:
+        TASK_DURATION.labels(task.name, state or 'UNKNOWN').observe(time.perf_counter() - started)
+
+def _worker_process_shutdown(pid=None, **kwargs):
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        multiprocess.mark_process_dead(pid or os.getpid())
+
+def connect_celery_signals():
+    """Time Celery tasks in the worker processes"""
+    from celery.signals import task_postrun, task_prerun, worker_process_shutdown
+
+    task_prerun.connect(_task_prerun, weak=False)
+    task_postrun.connect(_task_postrun, weak=False)
+    worker_process_shutdown.connect(_worker_process_shutdown, weak=False)
+
+# utils/metrics.py
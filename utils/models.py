@@ -0,0 +1,41 @@
+"""
+Model mixins shared across apps.
+"""
+
+class TrackedFieldsMixin:
+    """
+    Remember the database values of `tracked_fields` (attribute names, e.g.
+    'user_id') when an instance is loaded or saved, so signal handlers and
+    save() can see what changed without another query.
+    """
+    tracked_fields = ()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = {
+            name: value for name, value in zip(field_names, values)
+            if name in cls.tracked_fields
+        }
+        return instance
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # post_save handlers have already seen the previous values
+        self._loaded_values = {name: getattr(self, name) for name in self.tracked_fields}
+
+    def get_loaded_value(self, name, default=None):
+        """Return the value `name` had when last loaded or saved"""
+        return getattr(self, '_loaded_values', {}).get(name, default)
+
+    def get_changed_fields(self):
+        """Return the tracked fields whose values differ from the database"""
+        loaded = getattr(self, '_loaded_values', None)
+        if loaded is None:
+            return list(self.tracked_fields)
+        return [
+            name for name in self.tracked_fields
+            if name not in loaded or getattr(self, name) != loaded[name]
+        ]
+
+# utils/models.py
@@ -0,0 +1,107 @@
+"""
+Pagination that avoids exact COUNT(*) scans on very large result sets.
+"""
+from collections import OrderedDict
+
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.utils.functional import cached_property
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+
+from .db import estimated_count
+
+class EstimatedPage(Page):
+    """
+    Page whose `has_next` comes from fetching one extra row rather than
+    from the (estimated) total count
+    """
+    def __init__(self, object_list, number, paginator, has_more):
+        super().__init__(object_list, number, paginator)
+        self.has_more = has_more
+
+    def has_next(self):
+        return self.has_more
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that reports the planner's row estimate instead of running
+    COUNT(*) once the result set is larger than `estimate_threshold`.
+    Smaller result sets, and databases without planner estimates, get an
+    exact count.
+    """
+    estimate_threshold = 10000
+    count_is_estimated = False
+
+    @cached_property
+    def count(self):
+        """Return the total number of objects, estimated for large result sets."""
+        if hasattr(self.object_list, 'query'):
+            estimate = estimated_count(self.object_list)
+            if estimate is not None and estimate >= self.estimate_threshold:
+                self.count_is_estimated = True
+                return estimate
+        return Paginator.count.func(self)
+
+    def validate_number(self, number):
+        """
+        Validate the given 1-based page number. With an estimated count the
+        real last page may lie beyond `num_pages`, so no upper bound applies.
+        """
+        self.count  # Sets count_is_estimated
+        if not self.count_is_estimated:
+            return super().validate_number(number)
+        try:
+            if isinstance(number, float) and not number.is_integer():
+                raise ValueError
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(self.error_messages['invalid_page'])
+        if number < 1:
+            raise EmptyPage(self.error_messages['min_page'])
+        return number
+
+    def page(self, number):
+        """Return a Page object for the given 1-based page number."""
+        number = self.validate_number(number)
+        if not self.count_is_estimated:
+            return super().page(number)
+
+        bottom = (number - 1) * self.per_page
+        # Fetch one extra row so has_next() does not depend on the estimate
+        object_list = list(self.object_list[bottom:bottom + self.per_page + 1])
+        return EstimatedPage(
+            object_list[:self.per_page], number, self,
+            has_more=len(object_list) > self.per_page,
+        )
+
+class EstimatedCountPagination(PageNumberPagination):
+    """
+    Page number pagination that returns an estimated `count` for large
+    result sets, flagged by `count_is_estimated`. Clients that need the
+    exact total can pass `exact_count=true`.
+    """
+    exact_count_query_param = 'exact_count'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        exact = request.query_params.get(self.exact_count_query_param, '').lower() == 'true'
+        self.django_paginator_class = Paginator if exact else EstimatedCountPaginator
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('count', self.page.paginator.count),
+            ('count_is_estimated', getattr(self.page.paginator, 'count_is_estimated', False)),
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data)
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema['properties']['count_is_estimated'] = {
+            'type': 'boolean',
+            'example': False,
+        }
+        return response_schema
+
+# utils/pagination.py
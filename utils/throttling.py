@@ -0,0 +1,138 @@
+"""
+Request throttling backed by Redis.
+
+`HierarchicalRateThrottle` checks every budget that applies to a request
+with one atomic Lua call, so a decision costs one round trip:
+
+* per user (the `user` rate), or per client IP for anonymous requests
+  (the `anon` rate)
+* per client IP whatever the user (`ip`), so one address can't spread its
+  load over many accounts
+* per user and endpoint class for views that set `throttle_scope`, giving
+  expensive and bulk endpoints budgets of their own
+
+Each budget is a sliding-window log: a sorted set of request timestamps
+trimmed to the window. A request is admitted only when every budget has
+room, and is then counted against all of them. When Redis can't be
+reached requests are let through rather than failing the API.
+"""
+import logging
+import time
+import uuid
+
+import redis
+from django.conf import settings
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+logger = logging.getLogger(__name__)
+
+# KEYS: one sorted set per budget. ARGV[1]: now (ms), ARGV[2]: unique member,
+# then for the i-th key ARGV[1 + 2i]: limit, ARGV[2 + 2i]: window (ms).
+# Returns 0 when admitted, else the milliseconds until a slot frees up.
+SLIDING_WINDOW_SCRIPT = """
+local now = tonumber(ARGV[1])
+local wait = 0
+for i, key in ipairs(KEYS) do
+    local limit = tonumber(ARGV[1 + 2 * i])
+    local window = tonumber(ARGV[2 + 2 * i])
+    redis.call('ZREMRANGEBYSCORE', key, '-inf', now - window)
+    if redis.call('ZCARD', key) >= limit then
+        local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+        wait = math.max(wait, tonumber(oldest[2]) + window - now)
+    end
+end
+if wait > 0 then
+    return wait
+end
+for i, key in ipairs(KEYS) do
+    redis.call('ZADD', key, now, ARGV[2])
+    redis.call('PEXPIRE', key, tonumber(ARGV[2 + 2 * i]))
+end
+return 0
+"""
+
+DURATIONS = {'s': 1, 'm': 60, 'h': 60 * 60, 'd': 24 * 60 * 60}
+
+_script = None
+
+def _sliding_window_script():
+    global _script
+    if _script is None:
+        client = redis.Redis.from_url(
+            getattr(settings, 'THROTTLE_REDIS_URL', settings.REDIS_URL),
+            socket_connect_timeout=0.1,
+            socket_timeout=0.1,
+        )
+        # Runs with EVALSHA, loading the script again if Redis lost it
+        _script = client.register_script(SLIDING_WINDOW_SCRIPT)
+    return _script
+
+def parse_rate(rate):
+    """'<requests>/<period>' (s, m, h or d, e.g. '20/min') as (requests, seconds)"""
+    requests, period = rate.split('/')
+    return int(requests), DURATIONS[period[0]]
+
+def throttle_scope(scope):
+    """
+    Set the endpoint throttle scope of a function view; apply above @api_view
+    """
+    def decorator(view):
+        view.cls.throttle_scope = scope
+        return view
+    return decorator
+
+class HierarchicalRateThrottle(BaseThrottle):
+    """
+    Per-user, per-IP and per-endpoint-class sliding-window budgets,
+    checked together in Redis. Rates come from DEFAULT_THROTTLE_RATES.
+    """
+    key_format = 'throttle:{scope}:{ident}'
+
+    def __init__(self):
+        self.rates = api_settings.DEFAULT_THROTTLE_RATES
+        self.retry_after = None
+
+    def get_budgets(self, request, view):
+        """(key, limit, window seconds) for every budget the request counts against"""
+        ip = self.get_ident(request)
+        if request.user and request.user.is_authenticated:
+            scopes = [('user', request.user.pk)]
+            ident = f'user:{request.user.pk}'
+        else:
+            scopes = [('anon', ip)]
+            ident = f'ip:{ip}'
+        scopes.append(('ip', ip))
+        scope = getattr(view, 'throttle_scope', None)
+        if scope:
+            scopes.append((scope, ident))
+
+        return [
+            (self.key_format.format(scope=scope, ident=ident), *parse_rate(self.rates[scope]))
+            for scope, ident in scopes
+            if self.rates.get(scope)
+        ]
+
+    def allow_request(self, request, view):
+        budgets = self.get_budgets(request, view)
+        if not budgets:
+            return True
+
+        args = [int(time.time() * 1000), uuid.uuid4().hex]
+        for _, limit, window in budgets:
+            args.extend([limit, window * 1000])
+        try:
+            wait_ms = _sliding_window_script()(keys=[key for key, _, _ in budgets], args=args)
+        except redis.RedisError:
+            logger.warning('Throttle check failed; allowing the request', exc_info=True)
+            return True
+
+        if wait_ms:
+            self.retry_after = wait_ms / 1000
+            return False
+        return True
+
+    def wait(self):
+        return self.retry_after
+
+# utils/throttling.py